@@ -0,0 +1,57 @@
+# benchmark_indicators.py - wall-clock of NostalgiaForInfinityX6.populate_indicators per pair vs. num_cores_indicators_calc
+# Needs the bot data downloaded first, e.g.:
+#   freqtrade download-data -c bot/user_data/config.json -t 5m 15m 1h 4h 1d --timerange 20250101-
+import statistics
+import time
+
+from freqtrade.configuration import Configuration
+from freqtrade.data.dataprovider import DataProvider
+from freqtrade.enums import RunMode
+from freqtrade.resolvers import StrategyResolver
+
+# --- CONFIGURE THE BENCHMARK HERE ---
+CONFIG_FILE = "./bot/user_data/config.json"
+USER_DATA_DIR = "./bot/user_data"
+STRATEGY = "NostalgiaForInfinityX6"
+PAIRS = ["ETH/USDT:USDT", "XRP/USDT:USDT", "SOL/USDT:USDT"]
+TIMERANGE = "20250101-"
+CORE_COUNTS = [0, 2, 4, 8]
+ROUNDS = 3
+
+
+def load_strategy(num_cores):
+    """Loads the strategy in backtest mode with the given num_cores_indicators_calc."""
+    args = {
+        "config": [CONFIG_FILE],
+        "user_data_dir": USER_DATA_DIR,
+        "strategy": STRATEGY,
+        "timerange": TIMERANGE,
+    }
+    config = Configuration(args, RunMode.BACKTEST).get_config()
+    config.setdefault("nfi_parameters", {})["num_cores_indicators_calc"] = num_cores
+    strategy = StrategyResolver.load_strategy(config)
+    strategy.dp = DataProvider(config, None)
+    return strategy
+
+
+def time_pair(strategy, pair):
+    """Returns the seconds needed by populate_indicators for one pair (BTC informatives not shared)."""
+    df = strategy.dp.get_pair_dataframe(pair, strategy.timeframe)
+    strategy.btc_info_cache.clear()
+    tik = time.perf_counter()
+    strategy.populate_indicators(df, {"pair": pair})
+    return time.perf_counter() - tik
+
+
+def main():
+    print(f"{'cores':>6} {'median s/pair':>14} {'min s/pair':>11}")
+    for num_cores in CORE_COUNTS:
+        strategy = load_strategy(num_cores)
+        # Warm up the data provider and the thread pool
+        time_pair(strategy, PAIRS[0])
+        timings = [time_pair(strategy, pair) for _ in range(ROUNDS) for pair in PAIRS]
+        print(f"{num_cores:>6} {statistics.median(timings):>14.3f} {min(timings):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,44 @@
+import time
+
+# Startup profile: when the import of the module (and of its dependencies) started
+import_started = time.perf_counter()
+
+import ast
+import atexit
+import bisect
+import builtins
 import copy
+import ctypes
+import ctypes.util
+import hashlib
+import importlib
+import inspect
 import logging
+import math
+import operator
+import os
 import pathlib
 import rapidjson
+import re
+import select
+import sqlite3
 import numpy as np
+import talib
 import talib.abstract as ta
 import pandas as pd
-import pandas_ta as pta
+from pyarrow import feather
 from freqtrade.strategy.interface import IStrategy
-from freqtrade.strategy import merge_informative_pair
+from freqtrade.exchange import timeframe_to_minutes, timeframe_to_prev_date
 from pandas import DataFrame, Series
 from functools import reduce
+from collections import deque
 from freqtrade.persistence import Trade
-from datetime import datetime, timedelta
-import time
+from datetime import datetime, timedelta, timezone
+import textwrap
+import threading
+import types
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import warnings
 
@@ -20,6 +46,29 @@ log = logging.getLogger(__name__)
 # log.setLevel(logging.DEBUG)
 warnings.simplefilter(action="ignore", category=pd.errors.PerformanceWarning)
 
+
+class LazyModule:
+  """
+  A module only imported on the first access to one of its attributes. Freqtrade imports every file of the
+  strategies directory, so loading another strategy doesn't pay for the dependencies only the indicators here use.
+  The import is locked, the first accesses can come from the indicator threads at once.
+  """
+
+  def __init__(self, name: str):
+    self._name = name
+    self._module = None
+    self._lock = threading.Lock()
+
+  def __getattr__(self, attribute):
+    if self._module is None:
+      with self._lock:
+        if self._module is None:
+          self._module = importlib.import_module(self._name)
+    return getattr(self._module, attribute)
+
+
+pta = LazyModule("pandas_ta")
+
 #############################################################################################################
 ##                 NostalgiaForInfinityX6 by iterativ                                                      ##
 ##            https://github.com/iterativv/NostalgiaForInfinity                                            ##
@@ -109,9 +158,50 @@ class NostalgiaForInfinityX6(IStrategy):
   # Number of candles the strategy requires before producing valid signals
   startup_candle_count: int = 800
 
-  # Number of cores to use for pandas_ta indicators calculations
+  # Number of threads used to build the informative timeframes of a pair in parallel (0 or 1 = serial)
+  # benchmark_indicators.py measures the gain on a given machine
   num_cores_indicators_calc = 0
 
+  # Append-only base timeframe indicators in live/dry-run (only the new candles are computed)
+  incremental_indicators_enable = True
+
+  # Evaluate the entry conditions through the compiled NumPy engine (same signals as the pandas code)
+  entry_conditions_engine_enable = True
+
+  # Backtesting: precompute the candle-only exit chains per pair (same signals as the per trade code)
+  exit_signals_precompute_enable = True
+
+  # Only compute the indicators read by the enabled entry conditions and the exit/trade code (opt-in: the skipped
+  # columns are missing from the analyzed dataframe, for FreqUI, subclasses and any other reader)
+  lazy_indicators_enable = False
+
+  # Memory-lean analyzed dataframes: drop the columns not read by the entry/exit code, the non-price indicators
+  # no threshold is compared with as float32
+  memory_lean_mode_enable = False
+
+  # Global protections as packed bitmasks of their clauses (same protection columns, debug log of the blocking ones)
+  protections_bitmask_enable = True
+
+  # Backtesting: keep the computed indicators of every pair on disk (user_data/nfix6-indicators-cache), reused by the
+  # next runs on the same candles for as long as the indicator code doesn't change
+  indicators_disk_cache_enable = False
+
+  # Live & dry-run: informative candles shared by the bots of the host (directory, relative to user_data), empty
+  # to disable. Exactly one of the bots sharing it is the writer, the others only fetch what the store lacks.
+  shared_candles_store_path = ""
+  shared_candles_store_writer = False
+
+  # Live & dry-run: keep the profit targets in an SQLite database (file, relative to user_data) instead of the JSON
+  # file, written per pair, which the bots of the host can share (one namespace per bot). Empty to disable.
+  state_store_path = ""
+
+  # Live & dry-run: once seeded from the exchange, keep the informative timeframes up to date from the base timeframe
+  # candles (only for the timeframes where these match the exchange candles), fewer candle downloads every loop
+  local_informative_candles_enable = False
+
+  # Log where the start of the bot went: module import, __init__, first populate_indicators
+  startup_profile_enable = False
+
   # Long Normal mode tags
   long_normal_mode_tags = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "13"]
   # Long Pump mode tags
@@ -655,6 +745,24 @@ class NostalgiaForInfinityX6(IStrategy):
 
   hold_trades_cache = None
   target_profit_cache = None
+  btc_info_cache = None
+  info_cache = None
+  incremental_indicators_cache = None
+  indicators_executor = None
+  entry_conditions_engine = None
+  exit_signals_table = None
+  trade_mode_table = None
+  order_aggregates_cache = None
+  grind_state_cache = None
+  candle_context_cache = None
+  column_usage = None
+  lazy_indicators_columns = None
+  protections_bitmask = None
+  indicators_disk_cache = None
+  shared_candles_store = None
+  local_informative_candles = None
+  startup_profile = None
+  open_trades_snapshot = None
   #############################################################
   #
   #
@@ -685,9 +793,22 @@ class NostalgiaForInfinityX6(IStrategy):
   ###############################################################################################
 
   def __init__(self, config: dict) -> None:
+    init_started = time.perf_counter()
     # A list of parameters that can be changed through the config.
     NFI_SAFE_PARAMETERS = [
       "num_cores_indicators_calc",
+      "incremental_indicators_enable",
+      "entry_conditions_engine_enable",
+      "exit_signals_precompute_enable",
+      "lazy_indicators_enable",
+      "memory_lean_mode_enable",
+      "protections_bitmask_enable",
+      "indicators_disk_cache_enable",
+      "shared_candles_store_path",
+      "shared_candles_store_writer",
+      "state_store_path",
+      "local_informative_candles_enable",
+      "startup_profile_enable",
       "custom_fee_open_rate",
       "custom_fee_close_rate",
       "futures_mode_leverage",
@@ -765,19 +886,52 @@ class NostalgiaForInfinityX6(IStrategy):
       bot_name = ""
       if "bot_name" in self.config:
         bot_name = self.config["bot_name"] + "-"
-      self.target_profit_cache = Cache(
-        self.config["user_data_dir"]
-        / (
-          "nfix6-profit_max-"
-          + bot_name
-          + self.config["exchange"]["name"]
-          + "-"
-          + self.config["stake_currency"]
-          + ("-(backtest)" if (self.config["runmode"].value == "backtest") else "")
-          + ("-(hyperopt)" if (self.config["runmode"].value == "hyperopt") else "")
-          + ".json"
+      target_profit_path = self.config["user_data_dir"] / (
+        "nfix6-profit_max-"
+        + bot_name
+        + self.config["exchange"]["name"]
+        + "-"
+        + self.config["stake_currency"]
+        + ("-(backtest)" if (self.config["runmode"].value == "backtest") else "")
+        + ("-(hyperopt)" if (self.config["runmode"].value == "hyperopt") else "")
+        + ".json"
+      )
+      if self.state_store_path and self.config["runmode"].value in ("live", "dry_run"):
+        # Namespaced by the JSON file name, which the profit targets are taken over from on the first start
+        self.target_profit_cache = SqliteCache(
+          self.config["user_data_dir"] / self.state_store_path,
+          target_profit_path.stem,
+          deferred=True,
+          import_path=target_profit_path,
         )
-      )
+      else:
+        self.target_profit_cache = WriteBehindCache(target_profit_path, deferred=True)
+      # The changes of the last loop, on a normal shutdown (ft_bot_cleanup takes it over on a reload of the config)
+      atexit.register(self.target_profit_cache.flush)
+
+    # BTC informatives are the same for every pair, build them once per candle
+    if self.btc_info_cache is None:
+      self.btc_info_cache = InformativeCache()
+
+    # Informative timeframe indicators only change when a new informative candle closes
+    if self.info_cache is None:
+      self.info_cache = InformativeCache()
+
+    # Per pair incremental state of the base timeframe indicators
+    if self.incremental_indicators_cache is None:
+      self.incremental_indicators_cache = {}
+
+    # Per trade running sums of the filled orders (calc_total_profit)
+    if self.order_aggregates_cache is None:
+      self.order_aggregates_cache = {}
+
+    # Per trade grinding v2 state of the filled orders (long/short_grind_adjust_trade_position_v2)
+    if self.grind_state_cache is None:
+      self.grind_state_cache = {}
+
+    # Last candles of the analyzed dataframes, shared by the trade hooks of one bot loop
+    if self.candle_context_cache is None:
+      self.candle_context_cache = {}
 
     # OKX, Kraken provides a lower number of candle data per API call
     if self.config["exchange"]["name"] in ["okx", "okex"]:
@@ -795,12 +949,62 @@ class NostalgiaForInfinityX6(IStrategy):
       self.is_futures_mode = True
       self.can_short = True
 
+    # Backtesting evaluates the exit chains for every open trade on every candle, precompute them per pair
+    if self.exit_signals_precompute_enable and self.config["runmode"].value in ("backtest", "hyperopt"):
+      self.exit_signals_table = ExitSignalsTable(type(self), ("long", "short") if self.can_short else ("long",))
+      for name in self.exit_signals_table.programs:
+        setattr(self, name, ExitSignalsLookup(self, name))
+
+    if self.indicators_disk_cache_enable and self.config["runmode"].value in ("backtest", "hyperopt"):
+      self.indicators_disk_cache = IndicatorsDiskCache(self.config["user_data_dir"] / "nfix6-indicators-cache")
+
+    if self.shared_candles_store_path and self.config["runmode"].value in ("live", "dry_run"):
+      self.shared_candles_store = SharedCandlesStore(
+        self.config["user_data_dir"] / self.shared_candles_store_path, self.shared_candles_store_writer
+      )
+
+    if self.local_informative_candles_enable and self.config["runmode"].value in ("live", "dry_run"):
+      self.local_informative_candles = LocalInformativeCandles(self.timeframe)
+
     # If the cached data hasn't changed, it's a no-op
     self.target_profit_cache.save()
 
     # Parameter settings. Backward compatibility with the old configuration style.
     self.update_signals_from_config(self.config)
 
+    # enter_tag -> trade modes, built after the mode tags could be changed by the config
+    self.trade_mode_table = TradeModeTable(self)
+
+    # Completed by the first populate_indicators
+    self.startup_profile = {"import": import_seconds, "__init__": time.perf_counter() - init_started}
+
+  def __getstate__(self):
+    # Hyperopt pickles the strategy for its workers: the thread pool, the compiled entry conditions and protections
+    # (rebuilt on first use) and the recompiled indicator methods (the workers don't compute indicators) stay here
+    state = self.__dict__.copy()
+    state["indicators_executor"] = None
+    state["entry_conditions_engine"] = None
+    state["protections_bitmask"] = None
+    for name, value in self.__dict__.items():
+      if isinstance(value, types.MethodType) and value.__func__.__code__.co_filename.startswith("<lazy "):
+        del state[name]
+    if self.lazy_indicators_columns is not None:
+      state["lazy_indicators_columns"] = None
+    return state
+
+  def ft_bot_cleanup(self) -> None:
+    super().ft_bot_cleanup()
+    # A reload of the config builds a new instance on the same files, the pending changes go before it loads them
+    if self.target_profit_cache is not None:
+      self.target_profit_cache.close()
+      atexit.unregister(self.target_profit_cache.flush)
+    # The holds file watcher would keep running for this instance
+    if self.hold_trades_cache is not None:
+      self.hold_trades_cache.close()
+    if self.indicators_executor is not None:
+      self.indicators_executor.shutdown(wait=True, cancel_futures=True)
+      self.indicators_executor = None
+
   # Plot configuration for FreqUI
   # ---------------------------------------------------------------------------------------------
   @property
@@ -1519,30 +1723,23 @@ class NostalgiaForInfinityX6(IStrategy):
     fee_open_rate = trade.fee_open if self.custom_fee_open_rate is None else self.custom_fee_open_rate
     fee_close_rate = trade.fee_close if self.custom_fee_close_rate is None else self.custom_fee_close_rate
 
-    total_amount = 0.0
-    total_stake = 0.0
-    total_profit = 0.0
+    # Running sums of the filled orders, only the orders filled since the last call are added
+    aggregates_key = (trade.pair, trade.open_date_utc, trade.is_short, fee_open_rate, fee_close_rate)
+    aggregates = self.order_aggregates_cache.get(trade.id) if trade.id is not None else None
+    if aggregates is None or aggregates.key != aggregates_key:
+      aggregates = TradeOrderAggregates(aggregates_key)
+      if trade.id is not None:
+        # The ones of the closed trades go with every new trade
+        open_trades = self.get_open_trades_snapshot().by_key
+        for trade_id in [trade_id for trade_id in self.order_aggregates_cache if trade_id not in open_trades]:
+          del self.order_aggregates_cache[trade_id]
+        self.order_aggregates_cache[trade.id] = aggregates
+    aggregates.update(filled_entries, filled_exits)
+
+    total_amount = aggregates.total_amount
+    total_stake = aggregates.total_stake
+    total_profit = aggregates.total_profit
     current_stake = 0.0
-    for entry_order in filled_entries:
-      if trade.is_short:
-        entry_stake = entry_order.safe_filled * entry_order.safe_price * (1 - fee_open_rate)
-        total_amount += entry_order.safe_filled
-        total_stake += entry_stake
-        total_profit += entry_stake
-      else:
-        entry_stake = entry_order.safe_filled * entry_order.safe_price * (1 + fee_open_rate)
-        total_amount += entry_order.safe_filled
-        total_stake += entry_stake
-        total_profit -= entry_stake
-    for exit_order in filled_exits:
-      if trade.is_short:
-        exit_stake = exit_order.safe_filled * exit_order.safe_price * (1 + fee_close_rate)
-        total_amount -= exit_order.safe_filled
-        total_profit -= exit_stake
-      else:
-        exit_stake = exit_order.safe_filled * exit_order.safe_price * (1 - fee_close_rate)
-        total_amount -= exit_order.safe_filled
-        total_profit += exit_stake
     if trade.is_short:
       current_stake = total_amount * exit_rate * (1 + fee_close_rate)
       total_profit -= current_stake
@@ -1556,23 +1753,72 @@ class NostalgiaForInfinityX6(IStrategy):
     init_profit_ratio = total_profit / filled_entries[0].cost
     return total_profit, total_profit_ratio, current_profit_ratio, init_profit_ratio
 
+  # Grind State
+  # ---------------------------------------------------------------------------------------------
+  def get_grind_state(self, trade: "Trade", filled_orders: "Orders", entry_side: str) -> "GrindState":
+    """
+    The grinding v2 state of a trade, parsed again only when an order filled since the last call.
+
+    :param trade: trade object.
+    :param filled_orders: The filled orders of the trade.
+    :param entry_side: The order side of the grind entries, "buy" for the long trades, "sell" for the short ones.
+    :return GrindState: The grind state.
+    """
+    has_order_tags = hasattr(filled_orders[0], "ft_order_tag")
+    grind_state_key = (
+      trade.pair,
+      trade.open_date_utc,
+      entry_side,
+      has_order_tags,
+      len(filled_orders),
+      TradeOrderAggregates.order_key(filled_orders[-1]),
+    )
+    grind_state = self.grind_state_cache.get(trade.id) if trade.id is not None else None
+    if grind_state is None or grind_state.key != grind_state_key:
+      grind_state = GrindState(grind_state_key, filled_orders, entry_side, has_order_tags)
+      if trade.id is not None:
+        # The states hold the orders, the ones of the closed trades go on every fill
+        open_trades = self.get_open_trades_snapshot().by_key
+        for trade_id in [trade_id for trade_id in self.grind_state_cache if trade_id not in open_trades]:
+          del self.grind_state_cache[trade_id]
+        self.grind_state_cache[trade.id] = grind_state
+    return grind_state
+
+  # Candle Context
+  # ---------------------------------------------------------------------------------------------
+  def get_candle_context(self, pair: str) -> tuple:
+    """
+    The last candles of the analyzed dataframe of a pair, built once per (pair, last candle date) and shared by
+    custom_exit, adjust_trade_position (and the grind functions) and confirm_trade_entry of all the trades on it.
+
+    :param pair: The pair.
+    :return tuple: The number of candles, and the snapshots of the last 6 candles (newest first).
+    """
+    df, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
+    num_candles = len(df)
+    key = (pair, df["date"].iat[-1] if num_candles > 0 else None)
+    context = self.candle_context_cache.get(key)
+    if context is None:
+      context = self.candle_context_cache[key] = (
+        num_candles,
+        CandleSnapshot.from_dataframe(df, (-1, -2, -3, -4, -5, -6)),
+      )
+    return context
+
   # Custom Exit
   # ---------------------------------------------------------------------------------------------
   def custom_exit(
     self, pair: str, trade: "Trade", current_time: "datetime", current_rate: float, current_profit: float, **kwargs
   ):
-    df, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-    last_candle = df.iloc[-1].squeeze()
-    previous_candle_1 = df.iloc[-2].squeeze()
-    previous_candle_2 = df.iloc[-3].squeeze()
-    previous_candle_3 = df.iloc[-4].squeeze()
-    previous_candle_4 = df.iloc[-5].squeeze()
-    previous_candle_5 = df.iloc[-6].squeeze()
+    # Array-backed rows, the exit functions do thousands of label lookups on them
+    _, candles = self.get_candle_context(pair)
+    last_candle, previous_candle_1, previous_candle_2, previous_candle_3, previous_candle_4, previous_candle_5 = candles
 
     enter_tag = "empty"
     if hasattr(trade, "enter_tag") and trade.enter_tag is not None:
       enter_tag = trade.enter_tag
     enter_tags = enter_tag.split()
+    trade_modes = self.trade_mode_table.classify(enter_tag)
 
     filled_entries = trade.select_filled_orders(trade.entry_side)
     filled_exits = trade.select_filled_orders(trade.exit_side)
@@ -1589,7 +1835,7 @@ class NostalgiaForInfinityX6(IStrategy):
     max_loss = 0.0
 
     # Long Normal mode
-    if any(c in self.long_normal_mode_tags for c in enter_tags):
+    if trade_modes.any_of("long_normal"):
       sell, signal_name = self.long_exit_normal(
         pair,
         current_rate,
@@ -1615,7 +1861,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Long Pump mode
-    if any(c in self.long_pump_mode_tags for c in enter_tags):
+    if trade_modes.any_of("long_pump"):
       sell, signal_name = self.long_exit_pump(
         pair,
         current_rate,
@@ -1641,7 +1887,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Long Quick mode
-    if any(c in self.long_quick_mode_tags for c in enter_tags):
+    if trade_modes.any_of("long_quick"):
       sell, signal_name = self.long_exit_quick(
         pair,
         current_rate,
@@ -1667,9 +1913,9 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Long Rebuy mode
-    if all(c in self.long_rebuy_mode_tags for c in enter_tags) or (
-      any(c in self.long_rebuy_mode_tags for c in enter_tags)
-      and all(c in (self.long_rebuy_mode_tags + self.long_grind_mode_tags) for c in enter_tags)
+    if trade_modes.all_of("long_rebuy") or (
+      trade_modes.any_of("long_rebuy")
+      and trade_modes.all_of("long_rebuy", "long_grind")
     ):
       sell, signal_name = self.long_exit_rebuy(
         pair,
@@ -1696,7 +1942,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Long high profit mode
-    if any(c in self.long_mode_tags for c in enter_tags):
+    if trade_modes.any_of("long"):
       sell, signal_name = self.long_exit_high_profit(
         pair,
         current_rate,
@@ -1722,15 +1968,9 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Long rapid mode
-    if all(c in self.long_rapid_mode_tags for c in enter_tags) or (
-      any(c in self.long_rapid_mode_tags for c in enter_tags)
-      and all(
-        c
-        in (
-          self.long_rapid_mode_tags + self.long_rebuy_mode_tags + self.long_grind_mode_tags + self.long_scalp_mode_tags
-        )
-        for c in enter_tags
-      )
+    if trade_modes.all_of("long_rapid") or (
+      trade_modes.any_of("long_rapid")
+      and trade_modes.all_of("long_rapid", "long_rebuy", "long_grind", "long_scalp")
     ):
       sell, signal_name = self.long_exit_rapid(
         pair,
@@ -1757,7 +1997,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Long grind mode
-    if all(c in self.long_grind_mode_tags for c in enter_tags):
+    if trade_modes.all_of("long_grind"):
       sell, signal_name = self.long_exit_grind(
         pair,
         current_rate,
@@ -1783,7 +2023,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Long Top Coins mode
-    if any(c in self.long_top_coins_mode_tags for c in enter_tags):
+    if trade_modes.any_of("long_top_coins"):
       sell, signal_name = self.long_exit_top_coins(
         pair,
         current_rate,
@@ -1809,11 +2049,9 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Long scalp mode
-    if all(c in self.long_scalp_mode_tags for c in enter_tags) or (
-      any(c in self.long_scalp_mode_tags for c in enter_tags)
-      and all(
-        c in (self.long_scalp_mode_tags + self.long_rebuy_mode_tags + self.long_grind_mode_tags) for c in enter_tags
-      )
+    if trade_modes.all_of("long_scalp") or (
+      trade_modes.any_of("long_scalp")
+      and trade_modes.all_of("long_scalp", "long_rebuy", "long_grind")
     ):
       sell, signal_name = self.long_exit_scalp(
         pair,
@@ -1840,7 +2078,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Short normal mode
-    if any(c in self.short_normal_mode_tags for c in enter_tags):
+    if trade_modes.any_of("short_normal"):
       sell, signal_name = self.short_exit_normal(
         pair,
         current_rate,
@@ -1866,7 +2104,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Short Pump mode
-    if any(c in self.short_pump_mode_tags for c in enter_tags):
+    if trade_modes.any_of("short_pump"):
       sell, signal_name = self.short_exit_pump(
         pair,
         current_rate,
@@ -1892,7 +2130,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Short Quick mode
-    if any(c in self.short_quick_mode_tags for c in enter_tags):
+    if trade_modes.any_of("short_quick"):
       sell, signal_name = self.short_exit_quick(
         pair,
         current_rate,
@@ -1918,7 +2156,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Short Rebuy mode
-    if all(c in self.short_rebuy_mode_tags for c in enter_tags):
+    if trade_modes.all_of("short_rebuy"):
       sell, signal_name = self.short_exit_rebuy(
         pair,
         current_rate,
@@ -1944,7 +2182,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Short high profit mode
-    if any(c in self.short_mode_tags for c in enter_tags):
+    if trade_modes.any_of("short"):
       sell, signal_name = self.short_exit_high_profit(
         pair,
         current_rate,
@@ -1970,7 +2208,7 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Short rapid mode
-    if any(c in self.short_rapid_mode_tags for c in enter_tags):
+    if trade_modes.any_of("short_rapid"):
       sell, signal_name = self.short_exit_rapid(
         pair,
         current_rate,
@@ -1996,11 +2234,9 @@ class NostalgiaForInfinityX6(IStrategy):
         return f"{signal_name} ( {enter_tag})"
 
     # Short scalp mode
-    if all(c in self.short_scalp_mode_tags for c in enter_tags) or (
-      any(c in self.short_scalp_mode_tags for c in enter_tags)
-      and all(
-        c in (self.short_scalp_mode_tags + self.short_rebuy_mode_tags + self.short_grind_mode_tags) for c in enter_tags
-      )
+    if trade_modes.all_of("short_scalp") or (
+      trade_modes.any_of("short_scalp")
+      and trade_modes.all_of("short_scalp", "short_rebuy", "short_grind")
     ):
       sell, signal_name = self.short_exit_scalp(
         pair,
@@ -2028,20 +2264,16 @@ class NostalgiaForInfinityX6(IStrategy):
 
     # Trades not opened by X5
     if not trade.is_short and (
-      not any(
-        c
-        in (
-          self.long_normal_mode_tags
-          + self.long_pump_mode_tags
-          + self.long_quick_mode_tags
-          + self.long_rebuy_mode_tags
-          + self.long_mode_tags
-          + self.long_rapid_mode_tags
-          + self.long_grind_mode_tags
-          + self.long_top_coins_mode_tags
-          + self.long_scalp_mode_tags
-        )
-        for c in enter_tags
+      not trade_modes.any_of(
+        "long_normal",
+        "long_pump",
+        "long_quick",
+        "long_rebuy",
+        "long",
+        "long_rapid",
+        "long_grind",
+        "long_top_coins",
+        "long_scalp",
       )
     ):
       # use normal mode for such trades
@@ -2071,19 +2303,15 @@ class NostalgiaForInfinityX6(IStrategy):
 
     # Trades not opened by X5
     if trade.is_short and (
-      not any(
-        c
-        in (
-          self.short_normal_mode_tags
-          + self.short_pump_mode_tags
-          + self.short_quick_mode_tags
-          + self.short_rebuy_mode_tags
-          + self.short_mode_tags
-          + self.short_rapid_mode_tags
-          + self.short_grind_mode_tags
-          + self.short_scalp_mode_tags
-        )
-        for c in enter_tags
+      not trade_modes.any_of(
+        "short_normal",
+        "short_pump",
+        "short_quick",
+        "short_rebuy",
+        "short",
+        "short_rapid",
+        "short_grind",
+        "short_scalp",
       )
     ):
       # use normal mode for such trades
@@ -2128,12 +2356,12 @@ class NostalgiaForInfinityX6(IStrategy):
     side: str,
     **kwargs,
   ) -> float:
-    enter_tags = entry_tag.split()
+    trade_modes = self.trade_mode_table.classify(entry_tag)
     if side == "long":
       # Rebuy mode
-      if all(c in self.long_rebuy_mode_tags for c in enter_tags) or (
-        any(c in self.long_rebuy_mode_tags for c in enter_tags)
-        and all(c in (self.long_rebuy_mode_tags + self.long_grind_mode_tags) for c in enter_tags)
+      if trade_modes.all_of("long_rebuy") or (
+        trade_modes.any_of("long_rebuy")
+        and trade_modes.all_of("long_rebuy", "long_grind")
       ):
         stake_multiplier = self.rebuy_mode_stake_multiplier
         stake = proposed_stake * stake_multiplier
@@ -2142,11 +2370,9 @@ class NostalgiaForInfinityX6(IStrategy):
         else:
           return min_stake
       # Rapid mode
-      if all(c in self.long_rapid_mode_tags for c in enter_tags) or (
-        any(c in self.long_rapid_mode_tags for c in enter_tags)
-        and all(
-          c in (self.long_rapid_mode_tags + self.long_rebuy_mode_tags + self.long_grind_mode_tags) for c in enter_tags
-        )
+      if trade_modes.all_of("long_rapid") or (
+        trade_modes.any_of("long_rapid")
+        and trade_modes.all_of("long_rapid", "long_rebuy", "long_grind")
       ):
         stake_multiplier = (
           self.rapid_mode_stake_multiplier_futures[0]
@@ -2158,7 +2384,7 @@ class NostalgiaForInfinityX6(IStrategy):
         else:
           return min_stake
       # Grind mode
-      elif all(c in self.long_grind_mode_tags for c in enter_tags):
+      elif trade_modes.all_of("long_grind"):
         for _, item in enumerate(
           self.grind_mode_stake_multiplier_futures if self.is_futures_mode else self.grind_mode_stake_multiplier_spot
         ):
@@ -2177,9 +2403,9 @@ class NostalgiaForInfinityX6(IStrategy):
           return min_stake
     else:
       # Rebuy mode
-      if all(c in self.short_rebuy_mode_tags for c in enter_tags) or (
-        any(c in self.short_rebuy_mode_tags for c in enter_tags)
-        and all(c in (self.short_rebuy_mode_tags + self.short_grind_mode_tags) for c in enter_tags)
+      if trade_modes.all_of("short_rebuy") or (
+        trade_modes.any_of("short_rebuy")
+        and trade_modes.all_of("short_rebuy", "short_grind")
       ):
         stake_multiplier = self.rebuy_mode_stake_multiplier
         # Low stakes, on Binance mostly
@@ -2187,7 +2413,7 @@ class NostalgiaForInfinityX6(IStrategy):
           stake_multiplier = self.rebuy_mode_stake_multiplier_alt
         return proposed_stake * stake_multiplier
       # Grind mode
-      elif all(c in self.short_grind_mode_tags for c in enter_tags):
+      elif trade_modes.all_of("short_grind"):
         for _, item in enumerate(
           self.grind_mode_stake_multiplier_futures if self.is_futures_mode else self.grind_mode_stake_multiplier_spot
         ):
@@ -2230,18 +2456,19 @@ class NostalgiaForInfinityX6(IStrategy):
     if hasattr(trade, "enter_tag") and trade.enter_tag is not None:
       enter_tag = trade.enter_tag
     enter_tags = enter_tag.split()
+    trade_modes = self.trade_mode_table.classify(enter_tag)
 
     is_backtest = self.is_backtest_mode()
-    is_long_grind_mode = all(c in self.long_grind_mode_tags for c in enter_tags)
-    is_short_grind_mode = all(c in self.short_grind_mode_tags for c in enter_tags)
+    is_long_grind_mode = trade_modes.all_of("long_grind")
+    is_short_grind_mode = trade_modes.all_of("short_grind")
     is_v2_date = trade.open_date_utc.replace(tzinfo=None) >= datetime(2025, 2, 13) or is_backtest
 
     # Rebuy mode
     if not trade.is_short and (
-      all(c in self.long_rebuy_mode_tags for c in enter_tags)
+      trade_modes.all_of("long_rebuy")
       or (
-        any(c in self.long_rebuy_mode_tags for c in enter_tags)
-        and all(c in (self.long_rebuy_mode_tags + self.long_grind_mode_tags) for c in enter_tags)
+        trade_modes.any_of("long_rebuy")
+        and trade_modes.all_of("long_rebuy", "long_grind")
       )
     ):
       return self.long_rebuy_adjust_trade_position(
@@ -2274,32 +2501,24 @@ class NostalgiaForInfinityX6(IStrategy):
           current_entry_profit,
           current_exit_profit,
         )
-      elif any(
-        c
-        in (
-          self.long_normal_mode_tags
-          + self.long_pump_mode_tags
-          + self.long_quick_mode_tags
-          + self.long_mode_tags
-          + self.long_rapid_mode_tags
-          + self.long_top_coins_mode_tags
-          + self.long_scalp_mode_tags
-        )
-        for c in enter_tags
-      ) or not any(
-        c
-        in (
-          self.long_normal_mode_tags
-          + self.long_pump_mode_tags
-          + self.long_quick_mode_tags
-          + self.long_rebuy_mode_tags
-          + self.long_mode_tags
-          + self.long_rapid_mode_tags
-          + self.long_grind_mode_tags
-          + self.long_top_coins_mode_tags
-          + self.long_scalp_mode_tags
-        )
-        for c in enter_tags
+      elif trade_modes.any_of(
+        "long_normal",
+        "long_pump",
+        "long_quick",
+        "long",
+        "long_rapid",
+        "long_top_coins",
+        "long_scalp",
+      ) or not trade_modes.any_of(
+        "long_normal",
+        "long_pump",
+        "long_quick",
+        "long_rebuy",
+        "long",
+        "long_rapid",
+        "long_grind",
+        "long_top_coins",
+        "long_scalp",
       ):
         return self.long_grind_adjust_trade_position_v2(
           trade,
@@ -2331,32 +2550,24 @@ class NostalgiaForInfinityX6(IStrategy):
           current_exit_profit,
         )
       else:
-        if any(
-          c
-          in (
-            self.short_normal_mode_tags
-            + self.short_pump_mode_tags
-            + self.short_quick_mode_tags
-            + self.short_mode_tags
-            + self.short_rapid_mode_tags
-            + self.short_top_coins_mode_tags
-            + self.short_scalp_mode_tags
-          )
-          for c in enter_tags
-        ) or not any(
-          c
-          in (
-            self.short_normal_mode_tags
-            + self.short_pump_mode_tags
-            + self.short_quick_mode_tags
-            + self.short_rebuy_mode_tags
-            + self.short_mode_tags
-            + self.short_rapid_mode_tags
-            + self.short_grind_mode_tags
-            + self.short_top_coins_mode_tags
-            + self.short_scalp_mode_tags
-          )
-          for c in enter_tags
+        if trade_modes.any_of(
+          "short_normal",
+          "short_pump",
+          "short_quick",
+          "short",
+          "short_rapid",
+          "short_top_coins",
+          "short_scalp",
+        ) or not trade_modes.any_of(
+          "short_normal",
+          "short_pump",
+          "short_quick",
+          "short_rebuy",
+          "short",
+          "short_rapid",
+          "short_grind",
+          "short_top_coins",
+          "short_scalp",
         ):
           return self.short_grind_adjust_trade_position_v2(
             trade,
@@ -2377,6 +2588,36 @@ class NostalgiaForInfinityX6(IStrategy):
   # Informative Pairs
   # ---------------------------------------------------------------------------------------------
   def informative_pairs(self):
+    informative_pairs = self.informative_streams()
+
+    # The readers of a shared candles store only download what the store doesn't have
+    if self.shared_candles_store is not None and not self.shared_candles_store.writer:
+      store = self.shared_candles_store
+      current_time = datetime.now(timezone.utc)
+      informative_pairs = [
+        (pair, timeframe)
+        for pair, timeframe in informative_pairs
+        if not store.is_fresh(store.read(pair, timeframe), timeframe, current_time)
+      ]
+
+    # The informatives built from the base timeframe candles don't need to be refreshed
+    if self.local_informative_candles is not None:
+      informative_pairs = [
+        (pair, timeframe)
+        for pair, timeframe in informative_pairs
+        if not self.local_informative_candles.is_local(pair, timeframe)
+      ]
+
+    return informative_pairs
+
+  # Informative Streams
+  # ---------------------------------------------------------------------------------------------
+  def informative_streams(self) -> list:
+    """
+    All the (pair, timeframe) candles the indicators read besides the base timeframe of the whitelist, once each.
+
+    :return list: The (pair, timeframe) tuples.
+    """
     # get access to all pairs available in whitelist.
     pairs = self.dp.current_whitelist()
     # Assign tf to each pair so they can be downloaded and cached for strategy.
@@ -2409,7 +2650,61 @@ class NostalgiaForInfinityX6(IStrategy):
 
     informative_pairs.extend([(btc_info_pair, btc_info_timeframe) for btc_info_timeframe in self.btc_info_timeframes])
 
-    return informative_pairs
+    # BTC in the whitelist, or an informative timeframe that is the base one, would be asked for twice
+    whitelist_streams = {(pair, self.timeframe) for pair in pairs}
+    return [stream for stream in dict.fromkeys(informative_pairs) if stream not in whitelist_streams]
+
+  # Informative Candles
+  # ---------------------------------------------------------------------------------------------
+  def informative_candles(self, pair: str, timeframe: str) -> DataFrame:
+    """
+    The candles of an informative pair and timeframe: from the shared candles store when it has them up to date,
+    else built from the base timeframe candles once seeded, else from the data provider.
+
+    :param pair: The pair.
+    :param timeframe: The timeframe.
+    :return DataFrame: The candles, a copy safe to add columns to.
+    """
+    if self.shared_candles_store is not None and not self.shared_candles_store.writer:
+      store = self.shared_candles_store
+      current_time = datetime.now(timezone.utc)
+      candles = store.read(pair, timeframe)
+      if store.is_fresh(candles, timeframe, current_time):
+        return candles.copy(deep=False)
+      exchange_candles = self.dp.get_pair_dataframe(pair=pair, timeframe=timeframe)
+      if not store.is_fresh(exchange_candles, timeframe, current_time):
+        # A candle closed since informative_pairs took the stream from the store, it wasn't refreshed in this loop
+        exchange_candles = self.refresh_informative_candles(pair, timeframe)
+      return exchange_candles
+    elif self.local_informative_candles is not None and self.local_informative_candles.can_derive(timeframe):
+      base_candles = self.dp.get_pair_dataframe(pair=pair, timeframe=self.timeframe)
+      if self.local_informative_candles.is_local(pair, timeframe):
+        candles = self.local_informative_candles.update(pair, timeframe, base_candles)
+        if candles is not None:
+          return candles.copy(deep=False)
+        # Dropped on a gap, the exchange stream wasn't refreshed since it was seeded, it is seeded again next time
+        return self.refresh_informative_candles(pair, timeframe)
+      else:
+        candles = self.dp.get_pair_dataframe(pair=pair, timeframe=timeframe)
+        # Aged out like the exchange candles would be
+        candle_limit = self.dp._exchange.ohlcv_candle_limit(timeframe, self.config["candle_type_def"])
+        self.local_informative_candles.seed(
+          pair, timeframe, candles, base_candles, candle_limit + self.startup_candle_count
+        )
+        return candles
+    return self.dp.get_pair_dataframe(pair=pair, timeframe=timeframe)
+
+  def refresh_informative_candles(self, pair: str, timeframe: str) -> DataFrame:
+    """
+    Downloads the new candles of an informative stream that wasn't in informative_pairs for this loop.
+
+    :param pair: The pair.
+    :param timeframe: The timeframe.
+    :return DataFrame: The exchange candles.
+    """
+    log.info(f"Refreshing the {pair} {timeframe} candles from the exchange.")
+    self.dp._exchange.refresh_latest_ohlcv([(pair, timeframe, self.config["candle_type_def"])])
+    return self.dp.get_pair_dataframe(pair=pair, timeframe=timeframe)
 
   # Informative 1d Timeframe Indicators
   # ---------------------------------------------------------------------------------------------
@@ -2417,7 +2712,7 @@ class NostalgiaForInfinityX6(IStrategy):
     tik = time.perf_counter()
     assert self.dp, "DataProvider is required for multiple timeframes."
     # Get the informative pair
-    informative_1d = self.dp.get_pair_dataframe(pair=metadata["pair"], timeframe=info_timeframe)
+    informative_1d = self.informative_candles(metadata["pair"], info_timeframe)
 
     # Indicators
     # -----------------------------------------------------------------------------------------
@@ -2545,7 +2840,7 @@ class NostalgiaForInfinityX6(IStrategy):
     tik = time.perf_counter()
     assert self.dp, "DataProvider is required for multiple timeframes."
     # Get the informative pair
-    informative_4h = self.dp.get_pair_dataframe(pair=metadata["pair"], timeframe=info_timeframe)
+    informative_4h = self.informative_candles(metadata["pair"], info_timeframe)
 
     # Indicators
     # -----------------------------------------------------------------------------------------
@@ -2716,7 +3011,7 @@ class NostalgiaForInfinityX6(IStrategy):
     tik = time.perf_counter()
     assert self.dp, "DataProvider is required for multiple timeframes."
     # Get the informative pair
-    informative_1h = self.dp.get_pair_dataframe(pair=metadata["pair"], timeframe=info_timeframe)
+    informative_1h = self.informative_candles(metadata["pair"], info_timeframe)
 
     # Indicators
     # -----------------------------------------------------------------------------------------
@@ -2883,7 +3178,7 @@ class NostalgiaForInfinityX6(IStrategy):
     assert self.dp, "DataProvider is required for multiple timeframes."
 
     # Get the informative pair
-    informative_15m = self.dp.get_pair_dataframe(pair=metadata["pair"], timeframe=info_timeframe)
+    informative_15m = self.informative_candles(metadata["pair"], info_timeframe)
 
     # Indicators
     # -----------------------------------------------------------------------------------------
@@ -3003,6 +3298,36 @@ class NostalgiaForInfinityX6(IStrategy):
   def base_tf_5m_indicators(self, metadata: dict, df: DataFrame) -> DataFrame:
     tik = time.perf_counter()
 
+    # Incremental indicators (live & dry-run), only the newly closed candles are computed
+    is_incremental = self.incremental_indicators_enable and self.config["runmode"].value in ("live", "dry_run")
+    incremental_indicators = self.incremental_indicators_cache.get(metadata["pair"]) if is_incremental else None
+    if incremental_indicators is not None and incremental_indicators.extend(df):
+      df = pd.concat([df, incremental_indicators.dataframe(df.index)], axis=1)
+    else:
+      df = self.base_tf_5m_full_indicators(metadata, df)
+      if is_incremental:
+        self.incremental_indicators_cache[metadata["pair"]] = IncrementalIndicators.from_dataframe(df)
+
+    # Global protections
+    # -----------------------------------------------------------------------------------------
+    if not self.config["runmode"].value in ("live", "dry_run"):
+      # Backtest age filter
+      df["bt_agefilter_ok"] = False
+      df.loc[df.index > (12 * 24 * self.bt_min_age_days), "bt_agefilter_ok"] = True
+    else:
+      # Exchange downtime protection
+      df["live_data_ok"] = df["volume"].rolling(window=72, min_periods=72).min() > 0
+
+    # Performance logging
+    # -----------------------------------------------------------------------------------------
+    tok = time.perf_counter()
+    log.debug(f"[{metadata['pair']}] base_tf_5m_indicators took: {tok - tik:0.4f} seconds.")
+
+    return df
+
+  # Coin Pair Base Timeframe Full Indicators
+  # ---------------------------------------------------------------------------------------------
+  def base_tf_5m_full_indicators(self, metadata: dict, df: DataFrame) -> DataFrame:
     # Indicators
     # base_tf_5m_indicators_pandas_ta = pta.Strategy(
     #   name="base_tf_5m_indicators_pandas_ta",
@@ -3132,23 +3457,6 @@ class NostalgiaForInfinityX6(IStrategy):
     # Number of empty candles
     df["num_empty_288"] = (df["volume"] <= 0).rolling(window=288, min_periods=288).sum()
 
-    # -----------------------------------------------------------------------------------------
-
-    # Global protections
-    # -----------------------------------------------------------------------------------------
-    if not self.config["runmode"].value in ("live", "dry_run"):
-      # Backtest age filter
-      df["bt_agefilter_ok"] = False
-      df.loc[df.index > (12 * 24 * self.bt_min_age_days), "bt_agefilter_ok"] = True
-    else:
-      # Exchange downtime protection
-      df["live_data_ok"] = df["volume"].rolling(window=72, min_periods=72).min() > 0
-
-    # Performance logging
-    # -----------------------------------------------------------------------------------------
-    tok = time.perf_counter()
-    log.debug(f"[{metadata['pair']}] base_tf_5m_indicators took: {tok - tik:0.4f} seconds.")
-
     return df
 
   # Coin Pair Indicator Switch Case
@@ -3165,11 +3473,36 @@ class NostalgiaForInfinityX6(IStrategy):
     else:
       raise RuntimeError(f"{info_timeframe} not supported as informative timeframe for BTC pair.")
 
+  # Informative Cached Indicators
+  # ---------------------------------------------------------------------------------------------
+  def info_cached_indicators(self, metadata: dict, info_timeframe) -> DataFrame:
+    """
+    Returns the informative timeframe indicators of the pair, recomputed only when a new informative candle closes.
+
+    :param metadata: The pair metadata.
+    :param info_timeframe: The informative timeframe.
+    :return DataFrame: A shallow copy of the cached indicators, safe to hand to merge_informative_pairs.
+    """
+    # Backtesting & hyperopt compute each pair once, nothing to reuse there
+    if self.config["runmode"].value not in ("live", "dry_run"):
+      return self.info_switcher(metadata, info_timeframe)
+
+    info_candles = self.informative_candles(metadata["pair"], info_timeframe)
+    candle_key = (info_candles["date"].iloc[-1], len(info_candles)) if len(info_candles) > 0 else (None, 0)
+    info_indicators = self.info_cache.get(metadata["pair"], info_timeframe, candle_key)
+    if info_indicators is None:
+      info_indicators = self.info_switcher(metadata, info_timeframe)
+      self.info_cache.set(metadata["pair"], info_timeframe, candle_key, info_indicators)
+    else:
+      log.debug(f"[{metadata['pair']}] informative_{info_timeframe}_indicators served from cache.")
+
+    return info_indicators.copy(deep=False)
+
   # BTC 1D Indicators
   # ---------------------------------------------------------------------------------------------
   def btc_info_1d_indicators(self, btc_info_pair, btc_info_timeframe, metadata: dict) -> DataFrame:
     tik = time.perf_counter()
-    btc_info_1d = self.dp.get_pair_dataframe(btc_info_pair, btc_info_timeframe)
+    btc_info_1d = self.informative_candles(btc_info_pair, btc_info_timeframe)
     # Indicators
     # -----------------------------------------------------------------------------------------
     # btc_info_1d_indicators_pandas_ta = pta.Strategy(
@@ -3207,7 +3540,7 @@ class NostalgiaForInfinityX6(IStrategy):
   # ---------------------------------------------------------------------------------------------
   def btc_info_4h_indicators(self, btc_info_pair, btc_info_timeframe, metadata: dict) -> DataFrame:
     tik = time.perf_counter()
-    btc_info_4h = self.dp.get_pair_dataframe(btc_info_pair, btc_info_timeframe)
+    btc_info_4h = self.informative_candles(btc_info_pair, btc_info_timeframe)
     # Indicators
     # -----------------------------------------------------------------------------------------
 
@@ -3225,7 +3558,7 @@ class NostalgiaForInfinityX6(IStrategy):
   # ---------------------------------------------------------------------------------------------
   def btc_info_1h_indicators(self, btc_info_pair, btc_info_timeframe, metadata: dict) -> DataFrame:
     tik = time.perf_counter()
-    btc_info_1h = self.dp.get_pair_dataframe(btc_info_pair, btc_info_timeframe)
+    btc_info_1h = self.informative_candles(btc_info_pair, btc_info_timeframe)
     # Indicators
     # -----------------------------------------------------------------------------------------
 
@@ -3243,7 +3576,7 @@ class NostalgiaForInfinityX6(IStrategy):
   # ---------------------------------------------------------------------------------------------
   def btc_info_15m_indicators(self, btc_info_pair, btc_info_timeframe, metadata: dict) -> DataFrame:
     tik = time.perf_counter()
-    btc_info_15m = self.dp.get_pair_dataframe(btc_info_pair, btc_info_timeframe)
+    btc_info_15m = self.informative_candles(btc_info_pair, btc_info_timeframe)
     # Indicators
     # -----------------------------------------------------------------------------------------
 
@@ -3261,7 +3594,7 @@ class NostalgiaForInfinityX6(IStrategy):
   # ---------------------------------------------------------------------------------------------
   def btc_info_5m_indicators(self, btc_info_pair, btc_info_timeframe, metadata: dict) -> DataFrame:
     tik = time.perf_counter()
-    btc_info_5m = self.dp.get_pair_dataframe(btc_info_pair, btc_info_timeframe)
+    btc_info_5m = self.informative_candles(btc_info_pair, btc_info_timeframe)
     # Indicators
     # -----------------------------------------------------------------------------------------
 
@@ -3291,40 +3624,113 @@ class NostalgiaForInfinityX6(IStrategy):
     else:
       raise RuntimeError(f"{btc_info_timeframe} not supported as informative timeframe for BTC pair.")
 
-  # Populate Indicators
+  # BTC Cached Indicators
   # ---------------------------------------------------------------------------------------------
-  def populate_indicators(self, df: DataFrame, metadata: dict) -> DataFrame:
-    tik = time.perf_counter()
+  def btc_info_cached_indicators(self, btc_info_pair, btc_info_timeframe, metadata: dict) -> DataFrame:
     """
-        --> BTC informative indicators
-        ___________________________________________________________________________________________
-        """
-    if self.config["stake_currency"] in [
-      "USDT",
-      "BUSD",
-      "USDC",
-      "DAI",
-      "TUSD",
-      "FDUSD",
-      "PAX",
-      "USD",
-      "EUR",
-      "GBP",
-      "TRY",
-    ]:
-      if ("trading_mode" in self.config) and (self.config["trading_mode"] in ["futures", "margin"]):
-        btc_info_pair = f"BTC/{self.config['stake_currency']}:{self.config['stake_currency']}"
-      else:
-        btc_info_pair = f"BTC/{self.config['stake_currency']}"
+    Returns the BTC informative indicators, computed once per BTC candle and shared by all the pairs.
+
+    :param btc_info_pair: The BTC informative pair.
+    :param btc_info_timeframe: The BTC informative timeframe.
+    :param metadata: The pair metadata.
+    :return DataFrame: A shallow copy of the cached indicators, safe to hand to merge_informative_pairs.
+    """
+    btc_info_candles = self.informative_candles(btc_info_pair, btc_info_timeframe)
+    candle_key = (
+      (btc_info_candles["date"].iloc[-1], len(btc_info_candles)) if len(btc_info_candles) > 0 else (None, 0)
+    )
+    btc_informative = self.btc_info_cache.get(btc_info_pair, btc_info_timeframe, candle_key)
+    if btc_informative is None:
+      btc_informative = self.btc_info_switcher(btc_info_pair, btc_info_timeframe, metadata)
+      self.btc_info_cache.set(btc_info_pair, btc_info_timeframe, candle_key, btc_informative)
     else:
-      if ("trading_mode" in self.config) and (self.config["trading_mode"] in ["futures", "margin"]):
-        btc_info_pair = "BTC/USDT:USDT"
-      else:
-        btc_info_pair = "BTC/USDT"
+      log.debug(f"[{metadata['pair']}] btc_info_{btc_info_timeframe}_indicators served from cache.")
+
+    return btc_informative.copy(deep=False)
 
+  # Informatives Indicators
+  # ---------------------------------------------------------------------------------------------
+  def informatives_indicators(self, btc_info_pair, metadata: dict) -> tuple:
+    """
+    Builds the BTC and the pair informative timeframes, fanned out over num_cores_indicators_calc threads.
+
+    The builds are independent of each other and spend most of their time in TA-Lib and numpy, which
+    release the GIL, so a thread pool is enough (no pickling of the dataframes to worker processes).
+
+    :param btc_info_pair: The BTC informative pair.
+    :param metadata: The pair metadata.
+    :return tuple: The BTC informatives and the pair informatives, as dicts keyed by timeframe.
+    """
+    btc_jobs = [
+      (btc_info_timeframe, self.btc_info_cached_indicators, (btc_info_pair, btc_info_timeframe, metadata))
+      for btc_info_timeframe in self.btc_info_timeframes
+    ]
+    info_jobs = [
+      (info_timeframe, self.info_cached_indicators, (metadata, info_timeframe)) for info_timeframe in self.info_timeframes
+    ]
+
+    if self.num_cores_indicators_calc <= 1:
+      return (
+        {timeframe: func(*args) for timeframe, func, args in btc_jobs},
+        {timeframe: func(*args) for timeframe, func, args in info_jobs},
+      )
+
+    if self.indicators_executor is None:
+      self.indicators_executor = ThreadPoolExecutor(
+        max_workers=self.num_cores_indicators_calc, thread_name_prefix="nfi_indicators"
+      )
+      # Backtesting doesn't call ft_bot_cleanup, the threads go with the strategy
+      weakref.finalize(self, self.indicators_executor.shutdown, wait=False)
+    btc_futures = {timeframe: self.indicators_executor.submit(func, *args) for timeframe, func, args in btc_jobs}
+    info_futures = {timeframe: self.indicators_executor.submit(func, *args) for timeframe, func, args in info_jobs}
+    return (
+      {timeframe: future.result() for timeframe, future in btc_futures.items()},
+      {timeframe: future.result() for timeframe, future in info_futures.items()},
+    )
+
+  # Lazy Indicators
+  # ---------------------------------------------------------------------------------------------
+  def init_lazy_indicators(self) -> None:
+    """
+    Recompiles the informative and base timeframe indicator methods of this instance without the columns that
+    neither the enabled entry conditions nor the exit/trade code read, directly or through another column.
+    """
+    if self.column_usage is None:
+      self.column_usage = ColumnUsage(type(self))
+    used = self.column_usage.used_columns(self.long_entry_signal_params, self.short_entry_signal_params)
+    # The incremental state is seeded from all of its columns
+    if self.incremental_indicators_enable and self.config["runmode"].value in ("live", "dry_run"):
+      used |= set(IncrementalIndicators.columns)
+    self.lazy_indicators_columns = self.column_usage.live_columns(used)
+    for name in dir(type(self)):
+      if not self.column_usage.lazy_methods.match(name):
+        continue
+      function = self.column_usage.lazy_indicator_method(getattr(type(self), name), self.lazy_indicators_columns)
+      if function is not None:
+        setattr(self, name, types.MethodType(function, self))
+    log.info(
+      f"Lazy indicators: computing {len(self.lazy_indicators_columns)} "
+      f"of {len(self.column_usage.indicators)} indicator columns."
+    )
+
+  # Pair Indicators
+  # ---------------------------------------------------------------------------------------------
+  def pair_indicators(self, metadata: dict, df: DataFrame, btc_info_pair: str) -> DataFrame:
+    """
+    Computes all the indicators of the pair: the merged BTC and pair informatives, the base timeframe and the
+    global protections.
+
+    :param metadata: The pair metadata.
+    :param df: The base timeframe candles.
+    :param btc_info_pair: The BTC informative pair.
+    :return DataFrame: The dataframe with all the indicators.
+    """
+    btc_informatives, informatives = self.informatives_indicators(btc_info_pair, metadata)
+
+    # All the informatives are merged at once below, only the columns that are kept
+    merges = []
     for btc_info_timeframe in self.btc_info_timeframes:
-      btc_informative = self.btc_info_switcher(btc_info_pair, btc_info_timeframe, metadata)
-      df = merge_informative_pair(df, btc_informative, self.timeframe, btc_info_timeframe, ffill=True)
+      btc_informative = btc_informatives[btc_info_timeframe]
       # Customize what we drop - in case we need to maintain some BTC informative ohlcv data
       # Default drop all
       drop_columns = {
@@ -3338,15 +3744,14 @@ class NostalgiaForInfinityX6(IStrategy):
         [f"{s}_{btc_info_timeframe}" for s in ["date", "open", "high", "low", "close", "volume"]],
       )
       drop_columns.append(f"date_{btc_info_timeframe}")
-      df.drop(columns=df.columns.intersection(drop_columns), inplace=True)
+      merges.append((btc_informative, btc_info_timeframe, drop_columns))
 
     """
         --> Indicators on informative timeframes
         ___________________________________________________________________________________________
         """
     for info_timeframe in self.info_timeframes:
-      info_indicators = self.info_switcher(metadata, info_timeframe)
-      df = merge_informative_pair(df, info_indicators, self.timeframe, info_timeframe, ffill=True)
+      info_indicators = informatives[info_timeframe]
       # Customize what we drop - in case we need to maintain some informative timeframe ohlcv data
       # Default drop all except base timeframe ohlcv data
       drop_columns = {
@@ -3355,7 +3760,9 @@ class NostalgiaForInfinityX6(IStrategy):
         "1h": [f"{s}_{info_timeframe}" for s in ["date", "open", "high", "low", "close", "volume"]],
         "15m": [f"{s}_{info_timeframe}" for s in ["date", "high", "low", "volume"]],
       }.get(info_timeframe, [f"{s}_{info_timeframe}" for s in ["date", "open", "high", "low", "close", "volume"]])
-      df.drop(columns=df.columns.intersection(drop_columns), inplace=True)
+      merges.append((info_indicators, info_timeframe, drop_columns))
+
+    df = merge_informative_pairs(df, merges, self.timeframe)
 
     """
         --> The indicators for the base timeframe  (5m)
@@ -3370,6 +3777,92 @@ class NostalgiaForInfinityX6(IStrategy):
     # df["RSI_14_1d"] = df["RSI_14_1d"].astype(np.float64).replace(to_replace=[np.nan, None], value=(50.0))
     df["RSI_14_1h"] = df["RSI_14_1h"].astype(np.float64).replace(to_replace=[np.nan, None], value=(50.0))
 
+    # Global protections, with the packed bitmasks of their clauses
+    if self.protections_bitmask_enable:
+      if self.protections_bitmask is None:
+        self.protections_bitmask = ProtectionsBitmask(type(self).protections_indicators)
+      df = self.protections_bitmask.populate(self, df)
+      if log.isEnabledFor(logging.DEBUG) and len(df) > 0:
+        for column, clauses in self.protections_bitmask.blocking_clauses(df, -1).items():
+          log.debug(f"[{metadata['pair']}] {column} blocked by: {' | '.join(clauses)}")
+    else:
+      df = self.protections_indicators(df)
+
+    return df
+
+  # Populate Indicators
+  # ---------------------------------------------------------------------------------------------
+  def populate_indicators(self, df: DataFrame, metadata: dict) -> DataFrame:
+    tik = time.perf_counter()
+    input_columns = set(df.columns)
+    if self.lazy_indicators_enable and self.lazy_indicators_columns is None:
+      self.init_lazy_indicators()
+    """
+        --> BTC informative indicators
+        ___________________________________________________________________________________________
+        """
+    if self.config["stake_currency"] in [
+      "USDT",
+      "BUSD",
+      "USDC",
+      "DAI",
+      "TUSD",
+      "FDUSD",
+      "PAX",
+      "USD",
+      "EUR",
+      "GBP",
+      "TRY",
+    ]:
+      if ("trading_mode" in self.config) and (self.config["trading_mode"] in ["futures", "margin"]):
+        btc_info_pair = f"BTC/{self.config['stake_currency']}:{self.config['stake_currency']}"
+      else:
+        btc_info_pair = f"BTC/{self.config['stake_currency']}"
+    else:
+      if ("trading_mode" in self.config) and (self.config["trading_mode"] in ["futures", "margin"]):
+        btc_info_pair = "BTC/USDT:USDT"
+      else:
+        btc_info_pair = "BTC/USDT"
+
+    # Backtesting: the indicators a previous run computed from the same candles with the same indicator code
+    indicators_cache_path = None
+    cached_df = None
+    if self.indicators_disk_cache is not None:
+      indicators_cache_path = self.indicators_disk_cache.file_path(self, df, metadata["pair"], btc_info_pair)
+      cached_df = self.indicators_disk_cache.load(indicators_cache_path, df.index)
+
+    if cached_df is not None:
+      df = cached_df
+    else:
+      df = self.pair_indicators(metadata, df, btc_info_pair)
+      if indicators_cache_path is not None:
+        self.indicators_disk_cache.save(indicators_cache_path, df)
+
+    if self.memory_lean_mode_enable:
+      if self.column_usage is None:
+        self.column_usage = ColumnUsage(type(self))
+      df = self.column_usage.prune(df, input_columns)
+
+    if self.exit_signals_table is not None:
+      df = self.exit_signals_table.populate(df)
+
+    tok = time.perf_counter()
+    log.debug(f"[{metadata['pair']}] Populate indicators took a total of: {tok - tik:0.4f} seconds.")
+
+    if self.startup_profile is not None and "populate_indicators" not in self.startup_profile:
+      self.startup_profile["populate_indicators"] = tok - tik
+      if self.startup_profile_enable:
+        log.info(
+          f"Startup profile: import {self.startup_profile['import']:0.3f}s (without the compile), "
+          f"__init__ {self.startup_profile['__init__']:0.3f}s, "
+          f"first populate_indicators [{metadata['pair']}] {self.startup_profile['populate_indicators']:0.3f}s."
+        )
+
+    return df
+
+  # Global Protections
+  # ---------------------------------------------------------------------------------------------
+  def protections_indicators(self, df: DataFrame) -> DataFrame:
     # Global protections Long
     df["protections_long_global"] = (
       # 5m & 4h & 1d down move, 15m & 1h & 4h still not low enough, 1d still high
@@ -4976,9 +5469,6 @@ class NostalgiaForInfinityX6(IStrategy):
 
     df["protections_short_rebuy"] = True
 
-    tok = time.perf_counter()
-    log.debug(f"[{metadata['pair']}] Populate indicators took a total of: {tok - tik:0.4f} seconds.")
-
     return df
 
   # Confirm Trade Entry
@@ -4994,6 +5484,15 @@ class NostalgiaForInfinityX6(IStrategy):
     entry_tag: Optional[str],
     side: str,
     **kwargs,
+  ) -> bool:
+    is_confirmed = self._confirm_trade_entry(pair, rate, current_time, entry_tag, side)
+    if is_confirmed and self.open_trades_snapshot is not None:
+      # Counted from now on, so the slot limits hold for the other entries of this loop
+      self.open_trades_snapshot.add(side, entry_tag)
+    return is_confirmed
+
+  def _confirm_trade_entry(
+    self, pair: str, rate: float, current_time: datetime, entry_tag: Optional[str], side: str
   ) -> bool:
     # Force Entry
     if entry_tag == "force_entry":
@@ -5002,17 +5501,20 @@ class NostalgiaForInfinityX6(IStrategy):
     # Mode configurations (dynamic structure)
     mode_configs = {
       "grind": {
+        "mode": "long_grind",
         "tags": self.long_grind_mode_tags,
         "coins": self.grind_mode_coins,
         "max_slots": self.grind_mode_max_slots,
         "log_message": "grind mode",
       },
       "top_coins": {
+        "mode": "long_top_coins",
         "tags": self.long_top_coins_mode_tags,
         "coins": self.top_coins_mode_coins,
         "log_message": "top coins mode",
       },
       "scalp": {
+        "mode": "long_scalp",
         "tags": self.long_scalp_mode_tags,
         "min_free_slots": self.min_free_slots_scalp_mode,
         "log_message": "scalp mode",
@@ -5020,8 +5522,9 @@ class NostalgiaForInfinityX6(IStrategy):
     }
 
     # Mode Validation
+    trade_modes = self.trade_mode_table.classify(entry_tag)
     for mode, config in mode_configs.items():
-      if all(c in config["tags"] for c in entry_tag.split()):
+      if trade_modes.all_of(config["mode"]):
         if mode == "grind":
           return self._handle_grind_mode(pair, config, current_time)
         elif mode == "top_coins":
@@ -5031,9 +5534,9 @@ class NostalgiaForInfinityX6(IStrategy):
 
     # Long/Short Slot Validation (only in futures mode)
     if self.is_futures_mode and (self.futures_max_open_trades_long != 0 or self.futures_max_open_trades_short != 0):
-      open_trades = Trade.get_trades_proxy(is_open=True)
-      long_trades = sum(1 for t in open_trades if t.trade_direction == "long")
-      short_trades = sum(1 for t in open_trades if t.trade_direction == "short")
+      open_trades_snapshot = self.get_open_trades_snapshot()
+      long_trades = open_trades_snapshot.direction_counts["long"]
+      short_trades = open_trades_snapshot.direction_counts["short"]
 
       # Long trade limit validation
       if (
@@ -5056,9 +5559,9 @@ class NostalgiaForInfinityX6(IStrategy):
         return False
 
     # Slippage Validation
-    df, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-    if len(df) >= 1:
-      last_candle = df.iloc[-1].squeeze()
+    num_candles, candles = self.get_candle_context(pair)
+    if num_candles >= 1:
+      last_candle = candles[0]
       if (side == "long" and rate > last_candle["close"]) or (side == "short" and rate < last_candle["close"]):
         slippage = (rate / last_candle["close"]) - 1.0
         if (side == "long" and slippage < self.max_slippage) or (side == "short" and slippage > -self.max_slippage):
@@ -5075,8 +5578,7 @@ class NostalgiaForInfinityX6(IStrategy):
       log.info(f"[{current_time}] Cancelling entry for {pair} due to not being in grind mode coins list.")
       return False
 
-    open_trades = Trade.get_trades_proxy(is_open=True)
-    num_open_grind_mode = sum(1 for t in open_trades if all(c in config["tags"] for c in t.enter_tag.split()))
+    num_open_grind_mode = self.get_open_trades_snapshot().mode_counts[config["mode"]]
     if num_open_grind_mode >= config["max_slots"]:
       log.info(f"[{current_time}] Cancelling entry for {pair} due to grind mode slots limit reached.")
       return False
@@ -5091,7 +5593,7 @@ class NostalgiaForInfinityX6(IStrategy):
     return True
 
   def _handle_scalp_mode(self, pair: str, config: dict, current_time: datetime) -> bool:
-    current_free_slots = self.config["max_open_trades"] - Trade.get_open_trade_count()
+    current_free_slots = self.config["max_open_trades"] - self.get_open_trades_snapshot().count
     if current_free_slots < config["min_free_slots"]:
       log.info(f"[{current_time}] Cancelling entry for {pair} due to insufficient free slots.")
       return False
@@ -5135,12 +5637,31 @@ class NostalgiaForInfinityX6(IStrategy):
   # Bot Loop Start
   # ---------------------------------------------------------------------------------------------
   def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+    # The candle contexts only live for one loop
+    self.candle_context_cache.clear()
+
     if self.config["runmode"].value not in ("live", "dry_run"):
+      self.target_profit_cache.flush()
       return super().bot_loop_start(datetime, **kwargs)
 
+    # One query for the open trades of the whole loop
+    self.open_trades_snapshot = OpenTradesSnapshot(self.trade_mode_table, Trade.get_trades_proxy(is_open=True))
+
     if self.hold_support_enabled:
       self.load_hold_trades_config()
 
+    # The pairs that left the whitelist would be kept up to date for the life of the bot
+    if self.local_informative_candles is not None:
+      self.local_informative_candles.prune({pair for pair, _ in self.informative_streams()})
+
+    # The data provider was just refreshed, hand the new candles to the other bots
+    if self.shared_candles_store is not None and self.shared_candles_store.writer:
+      for pair, timeframe in self.informative_streams():
+        self.shared_candles_store.write(pair, timeframe, self.informative_candles(pair, timeframe))
+
+    # The profit target changes of the last loop, in one journal write
+    self.target_profit_cache.flush()
+
     return super().bot_loop_start(current_time, **kwargs)
 
   # Leverage
@@ -5156,10 +5677,10 @@ class NostalgiaForInfinityX6(IStrategy):
     side: str,
     **kwargs,
   ) -> float:
-    enter_tags = entry_tag.split()
-    if all(c in self.long_rebuy_mode_tags for c in enter_tags):
+    trade_modes = self.trade_mode_table.classify(entry_tag)
+    if trade_modes.all_of("long_rebuy"):
       return self.futures_mode_leverage_rebuy_mode
-    elif all(c in self.long_grind_mode_tags for c in enter_tags):
+    elif trade_modes.all_of("long_grind"):
       return self.futures_mode_leverage_grind_mode
     return self.futures_mode_leverage
 
@@ -5208,20 +5729,22 @@ class NostalgiaForInfinityX6(IStrategy):
   def _set_profit_target(
     self, pair: str, sell_reason: str, rate: float, current_profit: float, current_time: datetime
   ):
-    self.target_profit_cache.data[pair] = {
-      "rate": rate,
-      "profit": current_profit,
-      "sell_reason": sell_reason,
-      "time_profit_reached": current_time.isoformat(),
-    }
-    self.target_profit_cache.save()
+    # Written at the end of the next bot_loop_start
+    self.target_profit_cache.set(
+      pair,
+      {
+        "rate": rate,
+        "profit": current_profit,
+        "sell_reason": sell_reason,
+        "time_profit_reached": current_time.isoformat(),
+      },
+    )
 
   # Remove Profit Target
   # ---------------------------------------------------------------------------------------------
   def _remove_profit_target(self, pair: str):
     if self.target_profit_cache is not None:
-      self.target_profit_cache.data.pop(pair, None)
-      self.target_profit_cache.save()
+      self.target_profit_cache.pop(pair)
 
   # Get Hold Trades Config File
   # ---------------------------------------------------------------------------------------------
@@ -5250,6 +5773,19 @@ class NostalgiaForInfinityX6(IStrategy):
       )
       return hold_trades_config_file_absolute
 
+  # Get Open Trades Snapshot
+  # ---------------------------------------------------------------------------------------------
+  def get_open_trades_snapshot(self) -> "OpenTradesSnapshot":
+    """
+    The open trades snapshot of the current bot loop. Outside of live/dry-run, or before the first loop, a new one
+    built from the open trades (kept in memory when backtesting).
+
+    :return OpenTradesSnapshot: The open trades.
+    """
+    if self.open_trades_snapshot is not None:
+      return self.open_trades_snapshot
+    return OpenTradesSnapshot(self.trade_mode_table, Trade.get_trades_proxy(is_open=True))
+
   # Load Hold Trades Config
   # ---------------------------------------------------------------------------------------------
   def load_hold_trades_config(self):
@@ -5257,7 +5793,7 @@ class NostalgiaForInfinityX6(IStrategy):
       hold_trades_config_file = self.get_hold_trades_config_file()
       if hold_trades_config_file:
         log.warning("Loading hold support data from %s", hold_trades_config_file)
-        self.hold_trades_cache = HoldsCache(hold_trades_config_file)
+        self.hold_trades_cache = HoldsCache(hold_trades_config_file, self.get_open_trades_snapshot, watch=True)
 
     if self.hold_trades_cache:
       self.hold_trades_cache.load()
@@ -5271,9 +5807,7 @@ class NostalgiaForInfinityX6(IStrategy):
     if not self.hold_support_enabled:
       return False
 
-    # Just to be sure our hold data is loaded, should be a no-op call after the first bot loop
-    self.load_hold_trades_config()
-
+    # Loaded by bot_loop_start and kept current by its watcher, no filesystem access on the exit checks
     if not self.hold_trades_cache:
       # Cache hasn't been setup, likely because the corresponding file does not exist, sell
       return False
@@ -5398,19 +5932,13 @@ class NostalgiaForInfinityX6(IStrategy):
     is_backtest = self.dp.runmode.value in ["backtest", "hyperopt", "plot", "webserver"]
     # the number of free slots
     current_free_slots = self.config["max_open_trades"]
-    if not is_backtest:
-      current_free_slots = self.config["max_open_trades"] - Trade.get_open_trade_count()
     # Grind mode
     num_open_long_grind_mode = 0
     is_pair_long_grind_mode = metadata["pair"].split("/")[0] in self.grind_mode_coins
     if not is_backtest:
-      open_trades = Trade.get_trades_proxy(is_open=True)
-      for open_trade in open_trades:
-        enter_tag = open_trade.enter_tag
-        if enter_tag is not None:
-          enter_tags = enter_tag.split()
-          if all(c in self.long_grind_mode_tags for c in enter_tags):
-            num_open_long_grind_mode += 1
+      open_trades_snapshot = self.get_open_trades_snapshot()
+      current_free_slots = self.config["max_open_trades"] - open_trades_snapshot.count
+      num_open_long_grind_mode = open_trades_snapshot.mode_counts["long_grind"]
     # Top Coins mode
     is_pair_long_top_coins_mode = metadata["pair"].split("/")[0] in self.top_coins_mode_coins
     is_pair_short_top_coins_mode = metadata["pair"].split("/")[0] in self.top_coins_mode_coins
@@ -5418,6 +5946,16 @@ class NostalgiaForInfinityX6(IStrategy):
     is_btc_stake = self.config["stake_currency"] in self.btc_stakes
     allowed_empty_candles_288 = 144 if is_btc_stake else 60
 
+    # The conditions below, compiled to NumPy once and evaluated with shared sub-expressions
+    if self.entry_conditions_engine_enable:
+      if self.entry_conditions_engine is None:
+        self.entry_conditions_engine = EntryConditionsEngine(NostalgiaForInfinityX6.populate_entry_trend)
+        log.info(
+          f"Entry conditions compiled: {self.entry_conditions_engine.num_compiled}, "
+          f"pandas fallback: {self.entry_conditions_engine.num_fallback}."
+        )
+      return self.entry_conditions_engine.populate(self, df, locals())
+
     ###############################################################################################
 
     # LONG ENTRY CONDITIONS STARTS HERE
@@ -30598,11 +31136,11 @@ class NostalgiaForInfinityX6(IStrategy):
   ):
     is_backtest = self.is_backtest_mode()
     min_stake = self.correct_min_stake(min_stake)
-    df, _ = self.dp.get_analyzed_dataframe(trade.pair, self.timeframe)
-    if len(df) < 2:
+    num_candles, candles = self.get_candle_context(trade.pair)
+    if num_candles < 2:
       return None
-    last_candle = df.iloc[-1].squeeze()
-    previous_candle = df.iloc[-2].squeeze()
+    last_candle = candles[0]
+    previous_candle = candles[1]
 
     # we already waiting for an order to get filled
     if trade.has_open_orders:
@@ -30653,19 +31191,14 @@ class NostalgiaForInfinityX6(IStrategy):
     is_long_buyback_entry = self.long_buyback_entry_v2(last_candle, previous_candle, slice_profit, True)
     is_long_grind_entry = self.long_grind_entry_v2(last_candle, previous_candle, slice_profit, True)
 
-    grind_1_max_sub_grinds = 0
-    grind_1_stakes = (
-      self.grinding_v2_grind_1_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_1_stakes_spot.copy()
+    # Per trade grind state, the stake ladders scaled to the min stake once per slice amount and min stake
+    grind_state = self.get_grind_state(trade, filled_orders, "buy")
+    grind_1_stakes, grind_2_stakes, grind_3_stakes, grind_4_stakes, grind_5_stakes = grind_state.stakes(
+      self, slice_amount, trade.leverage, min_stake
     )
     grind_1_sub_thresholds = (
       self.grinding_v2_grind_1_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_1_thresholds_spot
     )
-    if (slice_amount * grind_1_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_1_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_1_stakes):
-        grind_1_stakes[i] *= multi
     grind_1_max_sub_grinds = len(grind_1_stakes)
     grind_1_derisk_grinds = (
       self.grinding_v2_grind_1_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_1_derisk_spot
@@ -30676,19 +31209,9 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_1_profit_threshold_spot
     )
 
-    grind_2_max_sub_grinds = 0
-    grind_2_stakes = (
-      self.grinding_v2_grind_2_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_2_stakes_spot.copy()
-    )
     grind_2_sub_thresholds = (
       self.grinding_v2_grind_2_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_2_thresholds_spot
     )
-    if (slice_amount * grind_2_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_2_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_2_stakes):
-        grind_2_stakes[i] *= multi
     grind_2_max_sub_grinds = len(grind_2_stakes)
     grind_2_derisk_grinds = (
       self.grinding_v2_grind_2_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_2_derisk_spot
@@ -30699,19 +31222,9 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_2_profit_threshold_spot
     )
 
-    grind_3_max_sub_grinds = 0
-    grind_3_stakes = (
-      self.grinding_v2_grind_3_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_3_stakes_spot.copy()
-    )
     grind_3_sub_thresholds = (
       self.grinding_v2_grind_3_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_3_thresholds_spot
     )
-    if (slice_amount * grind_3_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_3_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_3_stakes):
-        grind_3_stakes[i] *= multi
     grind_3_max_sub_grinds = len(grind_3_stakes)
     grind_3_derisk_grinds = (
       self.grinding_v2_grind_3_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_3_derisk_spot
@@ -30722,19 +31235,9 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_3_profit_threshold_spot
     )
 
-    grind_4_max_sub_grinds = 0
-    grind_4_stakes = (
-      self.grinding_v2_grind_4_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_4_stakes_spot.copy()
-    )
     grind_4_sub_thresholds = (
       self.grinding_v2_grind_4_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_4_thresholds_spot
     )
-    if (slice_amount * grind_4_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_4_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_4_stakes):
-        grind_4_stakes[i] *= multi
     grind_4_max_sub_grinds = len(grind_4_stakes)
     grind_4_derisk_grinds = (
       self.grinding_v2_grind_4_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_4_derisk_spot
@@ -30745,19 +31248,9 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_4_profit_threshold_spot
     )
 
-    grind_5_max_sub_grinds = 0
-    grind_5_stakes = (
-      self.grinding_v2_grind_5_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_5_stakes_spot.copy()
-    )
     grind_5_sub_thresholds = (
       self.grinding_v2_grind_5_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_5_thresholds_spot
     )
-    if (slice_amount * grind_5_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_5_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_5_stakes):
-        grind_5_stakes[i] *= multi
     grind_5_max_sub_grinds = len(grind_5_stakes)
     grind_5_derisk_grinds = (
       self.grinding_v2_grind_5_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_5_derisk_spot
@@ -30768,329 +31261,97 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_5_profit_threshold_spot
     )
 
-    is_derisk_1 = False
-    is_derisk_1_found = False  # derisk_level_1 de-risk exit
-    derisk_1_order = None
-    is_derisk_2 = False
-    is_derisk_2_found = False  # derisk_level_2 de-risk exit
-    derisk_2_order = None
-    is_derisk_3 = False
-    is_derisk_3_found = False  # derisk_level_3 de-risk exit
-    derisk_3_order = None
-    buyback_1_sub_grind_count = 0
-    buyback_1_total_amount = 0.0
-    buyback_1_total_cost = 0.0
-    buyback_1_current_open_rate = 0.0
-    buyback_1_current_grind_stake = 0.0
-    buyback_1_current_grind_stake_profit = 0.0
-    buyback_1_is_exit_found = False
-    buyback_1_found = False
-    buyback_1_buy_orders = []
-    buyback_1_orders = []
-    buyback_1_distance_ratio = 0.0
-    buyback_1_exit_order = None
-    buyback_1_exit_distance_ratio = 0.0
-    buyback_2_sub_grind_count = 0
-    buyback_2_total_amount = 0.0
-    buyback_2_total_cost = 0.0
-    buyback_2_current_open_rate = 0.0
-    buyback_2_current_grind_stake = 0.0
-    buyback_2_current_grind_stake_profit = 0.0
-    buyback_2_is_exit_found = False
-    buyback_2_found = False
-    buyback_2_buy_orders = []
-    buyback_2_orders = []
-    buyback_2_distance_ratio = 0.0
-    buyback_2_exit_order = None
-    buyback_2_exit_distance_ratio = 0.0
-    buyback_3_sub_grind_count = 0
-    buyback_3_total_amount = 0.0
-    buyback_3_total_cost = 0.0
-    buyback_3_current_open_rate = 0.0
-    buyback_3_current_grind_stake = 0.0
-    buyback_3_current_grind_stake_profit = 0.0
-    buyback_3_is_exit_found = False
-    buyback_3_found = False
-    buyback_3_buy_orders = []
-    buyback_3_orders = []
-    buyback_3_distance_ratio = 0.0
-    buyback_3_exit_order = None
-    buyback_3_exit_distance_ratio = 0.0
-    grind_1_sub_grind_count = 0
-    grind_1_total_amount = 0.0
-    grind_1_total_cost = 0.0
-    grind_1_current_open_rate = 0.0
-    grind_1_current_grind_stake = 0.0
-    grind_1_current_grind_stake_profit = 0.0
-    grind_1_is_exit_found = False
-    grind_1_found = False
-    grind_1_buy_orders = []
-    grind_1_orders = []
-    grind_1_distance_ratio = 0.0
-    grind_1_exit_order = None
-    grind_1_exit_distance_ratio = 0.0
-    grind_2_sub_grind_count = 0
-    grind_2_total_amount = 0.0
-    grind_2_total_cost = 0.0
-    grind_2_current_open_rate = 0.0
-    grind_2_current_grind_stake = 0.0
-    grind_2_current_grind_stake_profit = 0.0
-    grind_2_is_exit_found = False
-    grind_2_found = False
-    grind_2_buy_orders = []
-    grind_2_orders = []
-    grind_2_distance_ratio = 0.0
-    grind_2_exit_order = None
-    grind_2_exit_distance_ratio = 0.0
-    grind_3_sub_grind_count = 0
-    grind_3_total_amount = 0.0
-    grind_3_total_cost = 0.0
-    grind_3_current_open_rate = 0.0
-    grind_3_current_grind_stake = 0.0
-    grind_3_current_grind_stake_profit = 0.0
-    grind_3_is_exit_found = False
-    grind_3_found = False
-    grind_3_buy_orders = []
-    grind_3_orders = []
-    grind_3_distance_ratio = 0.0
-    grind_3_exit_order = None
-    grind_3_exit_distance_ratio = 0.0
-    grind_4_sub_grind_count = 0
-    grind_4_total_amount = 0.0
-    grind_4_total_cost = 0.0
-    grind_4_current_open_rate = 0.0
-    grind_4_current_grind_stake = 0.0
-    grind_4_current_grind_stake_profit = 0.0
-    grind_4_is_exit_found = False
-    grind_4_found = False
-    grind_4_buy_orders = []
-    grind_4_orders = []
-    grind_4_distance_ratio = 0.0
-    grind_4_exit_order = None
-    grind_4_exit_distance_ratio = 0.0
-    grind_5_sub_grind_count = 0
-    grind_5_total_amount = 0.0
-    grind_5_total_cost = 0.0
-    grind_5_current_open_rate = 0.0
-    grind_5_current_grind_stake = 0.0
-    grind_5_current_grind_stake_profit = 0.0
-    grind_5_is_exit_found = False
-    grind_5_found = False
-    grind_5_buy_orders = []
-    grind_5_orders = []
-    grind_5_distance_ratio = 0.0
-    grind_5_exit_order = None
-    grind_5_exit_distance_ratio = 0.0
-    for order in reversed(filled_orders):
-      if (order.ft_order_side == "buy") and (order is not filled_orders[0]):
-        order_tag = ""
-        if has_order_tags:
-          if order.ft_order_tag is not None:
-            order_tag = order.ft_order_tag
-        if not buyback_1_is_exit_found and order_tag == "buyback_1_entry":
-          buyback_1_sub_grind_count += 1
-          buyback_1_total_amount += order.safe_filled
-          buyback_1_total_cost += order.safe_filled * order.safe_price
-          buyback_1_buy_orders.append(order.id)
-          buyback_1_orders.append(order)
-          if not buyback_1_found:
-            buyback_1_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            buyback_1_found = True
-        elif not buyback_2_is_exit_found and order_tag == "buyback_2_entry":
-          buyback_2_sub_grind_count += 1
-          buyback_2_total_amount += order.safe_filled
-          buyback_2_total_cost += order.safe_filled * order.safe_price
-          buyback_2_buy_orders.append(order.id)
-          buyback_2_orders.append(order)
-          if not buyback_2_found:
-            buyback_2_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            buyback_2_found = True
-        elif not buyback_3_is_exit_found and order_tag == "buyback_3_entry":
-          buyback_3_sub_grind_count += 1
-          buyback_3_total_amount += order.safe_filled
-          buyback_3_total_cost += order.safe_filled * order.safe_price
-          buyback_3_buy_orders.append(order.id)
-          buyback_3_orders.append(order)
-          if not buyback_3_found:
-            buyback_3_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            buyback_3_found = True
-        elif not grind_1_is_exit_found and order_tag == "grind_1_entry":
-          grind_1_sub_grind_count += 1
-          grind_1_total_amount += order.safe_filled
-          grind_1_total_cost += order.safe_filled * order.safe_price
-          grind_1_buy_orders.append(order.id)
-          grind_1_orders.append(order)
-          if not grind_1_found:
-            grind_1_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_1_found = True
-        elif not grind_2_is_exit_found and order_tag == "grind_2_entry":
-          grind_2_sub_grind_count += 1
-          grind_2_total_amount += order.safe_filled
-          grind_2_total_cost += order.safe_filled * order.safe_price
-          grind_2_buy_orders.append(order.id)
-          grind_2_orders.append(order)
-          if not grind_2_found:
-            grind_2_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_2_found = True
-        elif not grind_3_is_exit_found and order_tag == "grind_3_entry":
-          grind_3_sub_grind_count += 1
-          grind_3_total_amount += order.safe_filled
-          grind_3_total_cost += order.safe_filled * order.safe_price
-          grind_3_buy_orders.append(order.id)
-          grind_3_orders.append(order)
-          if not grind_3_found:
-            grind_3_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_3_found = True
-        elif not grind_4_is_exit_found and order_tag == "grind_4_entry":
-          grind_4_sub_grind_count += 1
-          grind_4_total_amount += order.safe_filled
-          grind_4_total_cost += order.safe_filled * order.safe_price
-          grind_4_buy_orders.append(order.id)
-          grind_4_orders.append(order)
-          if not grind_4_found:
-            grind_4_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_4_found = True
-        elif not grind_5_is_exit_found and order_tag == "grind_5_entry":
-          grind_5_sub_grind_count += 1
-          grind_5_total_amount += order.safe_filled
-          grind_5_total_cost += order.safe_filled * order.safe_price
-          grind_5_buy_orders.append(order.id)
-          grind_5_orders.append(order)
-          if not grind_5_found:
-            grind_5_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_5_found = True
-      elif order.ft_order_side == "sell":
-        if (
-          order is filled_exits[-1]
-          and (order.safe_remaining * exit_rate / (trade.leverage if self.is_futures_mode else 1.0)) > min_stake
-        ):
-          partial_sell = True
-          # break
-        order_tag = ""
-        if has_order_tags:
-          if order.ft_order_tag is not None:
-            sell_order_tag = order.ft_order_tag
-            order_mode = sell_order_tag.split(" ", 1)
-            if len(order_mode) > 0:
-              order_tag = order_mode[0]
-        if order_tag in ["derisk_level_1", "d"]:
-          if not is_derisk_1_found:
-            is_derisk_1_found = True
-            is_derisk_1 = True
-            derisk_1_order = order
-        elif order_tag in ["derisk_level_2"]:
-          if not is_derisk_2_found:
-            is_derisk_2_found = True
-            is_derisk_2 = True
-            derisk_2_order = order
-        elif order_tag in ["derisk_level_3"]:
-          if not is_derisk_3_found:
-            is_derisk_3_found = True
-            is_derisk_3 = True
-            derisk_3_order = order
-        elif not buyback_1_is_exit_found and order_tag in ["buyback_1_exit", "buyback_1_derisk"]:
-          buyback_1_is_exit_found = True
-          buyback_1_exit_order = order
-        elif not buyback_2_is_exit_found and order_tag in ["buyback_2_exit", "buyback_2_derisk"]:
-          buyback_2_is_exit_found = True
-          buyback_2_exit_order = order
-        elif not buyback_3_is_exit_found and order_tag in ["buyback_3_exit", "buyback_3_derisk"]:
-          buyback_3_is_exit_found = True
-          buyback_3_exit_order = order
-        elif not grind_1_is_exit_found and order_tag in ["grind_1_exit", "grind_1_derisk"]:
-          grind_1_is_exit_found = True
-          grind_1_exit_order = order
-        elif not grind_2_is_exit_found and order_tag in ["grind_2_exit", "grind_2_derisk"]:
-          grind_2_is_exit_found = True
-          grind_2_exit_order = order
-        elif not grind_3_is_exit_found and order_tag in ["grind_3_exit", "grind_3_derisk"]:
-          grind_3_is_exit_found = True
-          grind_3_exit_order = order
-        elif not grind_4_is_exit_found and order_tag in ["grind_4_exit", "grind_4_derisk"]:
-          grind_4_is_exit_found = True
-          grind_4_exit_order = order
-        elif not grind_5_is_exit_found and order_tag in ["grind_5_exit", "grind_5_derisk"]:
-          grind_5_is_exit_found = True
-          grind_5_exit_order = order
-        elif order_tag in ["derisk_global"]:
-          if not buyback_1_is_exit_found:
-            buyback_1_is_exit_found = True
-            buyback_1_exit_order = order
-          if not buyback_2_is_exit_found:
-            buyback_2_is_exit_found = True
-            buyback_2_exit_order = order
-          if not buyback_3_is_exit_found:
-            buyback_3_is_exit_found = True
-            buyback_3_exit_order = order
-          if not grind_1_is_exit_found:
-            grind_1_is_exit_found = True
-            grind_1_exit_order = order
-          if not grind_2_is_exit_found:
-            grind_2_is_exit_found = True
-            grind_2_exit_order = order
-          if not grind_3_is_exit_found:
-            grind_3_is_exit_found = True
-            grind_3_exit_order = order
-          if not grind_4_is_exit_found:
-            grind_4_is_exit_found = True
-            grind_4_exit_order = order
-          if not grind_5_is_exit_found:
-            grind_5_is_exit_found = True
-            grind_5_exit_order = order
-
-    if buyback_1_sub_grind_count > 0:
-      buyback_1_current_open_rate = buyback_1_total_cost / buyback_1_total_amount
-      buyback_1_current_grind_stake = buyback_1_total_amount * exit_rate * (1 - trade.fee_close)
-      buyback_1_current_grind_stake_profit = buyback_1_current_grind_stake - buyback_1_total_cost
-    if buyback_2_sub_grind_count > 0:
-      buyback_2_current_open_rate = buyback_2_total_cost / buyback_2_total_amount
-      buyback_2_current_grind_stake = buyback_2_total_amount * exit_rate * (1 - trade.fee_close)
-      buyback_2_current_grind_stake_profit = buyback_2_current_grind_stake - buyback_2_total_cost
-    if buyback_3_sub_grind_count > 0:
-      buyback_3_current_open_rate = buyback_3_total_cost / buyback_3_total_amount
-      buyback_3_current_grind_stake = buyback_3_total_amount * exit_rate * (1 - trade.fee_close)
-      buyback_3_current_grind_stake_profit = buyback_3_current_grind_stake - buyback_3_total_cost
-    if grind_1_sub_grind_count > 0:
-      grind_1_current_open_rate = grind_1_total_cost / grind_1_total_amount
-      grind_1_current_grind_stake = grind_1_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_1_current_grind_stake_profit = grind_1_current_grind_stake - grind_1_total_cost
-    if grind_2_sub_grind_count > 0:
-      grind_2_current_open_rate = grind_2_total_cost / grind_2_total_amount
-      grind_2_current_grind_stake = grind_2_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_2_current_grind_stake_profit = grind_2_current_grind_stake - grind_2_total_cost
-    if grind_3_sub_grind_count > 0:
-      grind_3_current_open_rate = grind_3_total_cost / grind_3_total_amount
-      grind_3_current_grind_stake = grind_3_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_3_current_grind_stake_profit = grind_3_current_grind_stake - grind_3_total_cost
-    if grind_4_sub_grind_count > 0:
-      grind_4_current_open_rate = grind_4_total_cost / grind_4_total_amount
-      grind_4_current_grind_stake = grind_4_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_4_current_grind_stake_profit = grind_4_current_grind_stake - grind_4_total_cost
-    if grind_5_sub_grind_count > 0:
-      grind_5_current_open_rate = grind_5_total_cost / grind_5_total_amount
-      grind_5_current_grind_stake = grind_5_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_5_current_grind_stake_profit = grind_5_current_grind_stake - grind_5_total_cost
-
-    if grind_1_is_exit_found:
-      grind_1_exit_distance_ratio = (exit_rate - grind_1_exit_order.safe_price) / grind_1_exit_order.safe_price
-    if grind_2_is_exit_found:
-      grind_2_exit_distance_ratio = (exit_rate - grind_2_exit_order.safe_price) / grind_2_exit_order.safe_price
-    if grind_3_is_exit_found:
-      grind_3_exit_distance_ratio = (exit_rate - grind_3_exit_order.safe_price) / grind_3_exit_order.safe_price
-    if grind_4_is_exit_found:
-      grind_4_exit_distance_ratio = (exit_rate - grind_4_exit_order.safe_price) / grind_4_exit_order.safe_price
-    if buyback_1_is_exit_found:
-      buyback_1_exit_distance_ratio = (exit_rate - buyback_1_exit_order.safe_price) / buyback_1_exit_order.safe_price
-    elif is_derisk_1_found:
-      buyback_1_exit_distance_ratio = (exit_rate - derisk_1_order.safe_price) / derisk_1_order.safe_price
-    if buyback_2_is_exit_found:
-      buyback_2_exit_distance_ratio = (exit_rate - buyback_2_exit_order.safe_price) / buyback_2_exit_order.safe_price
-    elif is_derisk_2_found:
-      buyback_2_exit_distance_ratio = (exit_rate - derisk_2_order.safe_price) / derisk_2_order.safe_price
-    if buyback_3_is_exit_found:
-      buyback_3_exit_distance_ratio = (exit_rate - buyback_3_exit_order.safe_price) / buyback_3_exit_order.safe_price
-    elif is_derisk_3_found:
-      buyback_3_exit_distance_ratio = (exit_rate - derisk_3_order.safe_price) / derisk_3_order.safe_price
+    # Open sub-grinds, exits and de-risks of every level, parsed once per fill, at the current exit rate
+    grind_levels = grind_state.levels_at(exit_rate, trade.fee_close)
+    (
+      buyback_1_sub_grind_count,
+      buyback_1_total_amount,
+      buyback_1_current_open_rate,
+      buyback_1_current_grind_stake_profit,
+      buyback_1_is_exit_found,
+      buyback_1_buy_orders,
+      buyback_1_orders,
+      buyback_1_distance_ratio,
+      buyback_1_exit_distance_ratio,
+    ) = grind_levels[0]
+    (
+      buyback_2_sub_grind_count,
+      buyback_2_total_amount,
+      buyback_2_current_open_rate,
+      buyback_2_current_grind_stake_profit,
+      buyback_2_is_exit_found,
+      buyback_2_buy_orders,
+      buyback_2_orders,
+      buyback_2_distance_ratio,
+      buyback_2_exit_distance_ratio,
+    ) = grind_levels[1]
+    (
+      buyback_3_sub_grind_count,
+      buyback_3_total_amount,
+      buyback_3_current_open_rate,
+      buyback_3_current_grind_stake_profit,
+      buyback_3_is_exit_found,
+      buyback_3_buy_orders,
+      buyback_3_orders,
+      buyback_3_distance_ratio,
+      buyback_3_exit_distance_ratio,
+    ) = grind_levels[2]
+    (
+      grind_1_sub_grind_count,
+      grind_1_total_amount,
+      grind_1_current_open_rate,
+      grind_1_current_grind_stake_profit,
+      grind_1_is_exit_found,
+      grind_1_buy_orders,
+      grind_1_orders,
+      grind_1_distance_ratio,
+      grind_1_exit_distance_ratio,
+    ) = grind_levels[3]
+    (
+      grind_2_sub_grind_count,
+      grind_2_total_amount,
+      grind_2_current_open_rate,
+      grind_2_current_grind_stake_profit,
+      grind_2_is_exit_found,
+      grind_2_buy_orders,
+      grind_2_orders,
+      grind_2_distance_ratio,
+      grind_2_exit_distance_ratio,
+    ) = grind_levels[4]
+    (
+      grind_3_sub_grind_count,
+      grind_3_total_amount,
+      grind_3_current_open_rate,
+      grind_3_current_grind_stake_profit,
+      grind_3_is_exit_found,
+      grind_3_buy_orders,
+      grind_3_orders,
+      grind_3_distance_ratio,
+      grind_3_exit_distance_ratio,
+    ) = grind_levels[5]
+    (
+      grind_4_sub_grind_count,
+      grind_4_total_amount,
+      grind_4_current_open_rate,
+      grind_4_current_grind_stake_profit,
+      grind_4_is_exit_found,
+      grind_4_buy_orders,
+      grind_4_orders,
+      grind_4_distance_ratio,
+      grind_4_exit_distance_ratio,
+    ) = grind_levels[6]
+    (
+      grind_5_sub_grind_count,
+      grind_5_total_amount,
+      grind_5_current_open_rate,
+      grind_5_current_grind_stake_profit,
+      grind_5_is_exit_found,
+      grind_5_buy_orders,
+      grind_5_orders,
+      grind_5_distance_ratio,
+      grind_5_exit_distance_ratio,
+    ) = grind_levels[7]
+    is_derisk_1_found, is_derisk_2_found, is_derisk_3_found = grind_state.derisk_found
 
     # all buybacks & grinds
     current_open_grind_stake_profit = (
@@ -32553,11 +32814,11 @@ class NostalgiaForInfinityX6(IStrategy):
   ):
     is_backtest = self.dp.runmode.value in ["backtest", "hyperopt"]
     min_stake = self.correct_min_stake(min_stake)
-    df, _ = self.dp.get_analyzed_dataframe(trade.pair, self.timeframe)
-    if len(df) < 2:
+    num_candles, candles = self.get_candle_context(trade.pair)
+    if num_candles < 2:
       return None
-    last_candle = df.iloc[-1].squeeze()
-    previous_candle = df.iloc[-2].squeeze()
+    last_candle = candles[0]
+    previous_candle = candles[1]
 
     # we already waiting for an order to get filled
     if trade.has_open_orders:
@@ -35639,11 +35900,11 @@ class NostalgiaForInfinityX6(IStrategy):
     # min/max stakes include leverage. The return amounts is before leverage.
     min_stake /= trade.leverage
     max_stake /= trade.leverage
-    df, _ = self.dp.get_analyzed_dataframe(trade.pair, self.timeframe)
-    if len(df) < 2:
+    num_candles, candles = self.get_candle_context(trade.pair)
+    if num_candles < 2:
       return None
-    last_candle = df.iloc[-1].squeeze()
-    previous_candle = df.iloc[-2].squeeze()
+    last_candle = candles[0]
+    previous_candle = candles[1]
 
     # we already waiting for an order to get filled
     if trade.has_open_orders:
@@ -53521,11 +53782,11 @@ class NostalgiaForInfinityX6(IStrategy):
   ):
     is_backtest = self.is_backtest_mode()
     min_stake = self.correct_min_stake(min_stake)
-    df, _ = self.dp.get_analyzed_dataframe(trade.pair, self.timeframe)
-    if len(df) < 2:
+    num_candles, candles = self.get_candle_context(trade.pair)
+    if num_candles < 2:
       return None
-    last_candle = df.iloc[-1].squeeze()
-    previous_candle = df.iloc[-2].squeeze()
+    last_candle = candles[0]
+    previous_candle = candles[1]
 
     # we already waiting for an order to get filled
     if trade.has_open_orders:
@@ -53576,19 +53837,14 @@ class NostalgiaForInfinityX6(IStrategy):
     is_short_buyback_entry = self.short_buyback_entry_v2(last_candle, previous_candle, slice_profit, True)
     is_short_grind_entry = self.short_grind_entry_v2(last_candle, previous_candle, slice_profit, True)
 
-    grind_1_max_sub_grinds = 0
-    grind_1_stakes = (
-      self.grinding_v2_grind_1_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_1_stakes_spot.copy()
+    # Per trade grind state, the stake ladders scaled to the min stake once per slice amount and min stake
+    grind_state = self.get_grind_state(trade, filled_orders, "sell")
+    grind_1_stakes, grind_2_stakes, grind_3_stakes, grind_4_stakes, grind_5_stakes = grind_state.stakes(
+      self, slice_amount, trade.leverage, min_stake
     )
     grind_1_sub_thresholds = (
       self.grinding_v2_grind_1_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_1_thresholds_spot
     )
-    if (slice_amount * grind_1_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_1_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_1_stakes):
-        grind_1_stakes[i] *= multi
     grind_1_max_sub_grinds = len(grind_1_stakes)
     grind_1_derisk_grinds = (
       self.grinding_v2_grind_1_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_1_derisk_spot
@@ -53599,19 +53855,9 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_1_profit_threshold_spot
     )
 
-    grind_2_max_sub_grinds = 0
-    grind_2_stakes = (
-      self.grinding_v2_grind_2_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_2_stakes_spot.copy()
-    )
     grind_2_sub_thresholds = (
       self.grinding_v2_grind_2_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_2_thresholds_spot
     )
-    if (slice_amount * grind_2_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_2_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_2_stakes):
-        grind_2_stakes[i] *= multi
     grind_2_max_sub_grinds = len(grind_2_stakes)
     grind_2_derisk_grinds = (
       self.grinding_v2_grind_2_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_2_derisk_spot
@@ -53622,19 +53868,9 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_2_profit_threshold_spot
     )
 
-    grind_3_max_sub_grinds = 0
-    grind_3_stakes = (
-      self.grinding_v2_grind_3_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_3_stakes_spot.copy()
-    )
     grind_3_sub_thresholds = (
       self.grinding_v2_grind_3_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_3_thresholds_spot
     )
-    if (slice_amount * grind_3_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_3_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_3_stakes):
-        grind_3_stakes[i] *= multi
     grind_3_max_sub_grinds = len(grind_3_stakes)
     grind_3_derisk_grinds = (
       self.grinding_v2_grind_3_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_3_derisk_spot
@@ -53645,19 +53881,9 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_3_profit_threshold_spot
     )
 
-    grind_4_max_sub_grinds = 0
-    grind_4_stakes = (
-      self.grinding_v2_grind_4_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_4_stakes_spot.copy()
-    )
     grind_4_sub_thresholds = (
       self.grinding_v2_grind_4_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_4_thresholds_spot
     )
-    if (slice_amount * grind_4_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_4_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_4_stakes):
-        grind_4_stakes[i] *= multi
     grind_4_max_sub_grinds = len(grind_4_stakes)
     grind_4_derisk_grinds = (
       self.grinding_v2_grind_4_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_4_derisk_spot
@@ -53668,19 +53894,9 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_4_profit_threshold_spot
     )
 
-    grind_5_max_sub_grinds = 0
-    grind_5_stakes = (
-      self.grinding_v2_grind_5_stakes_futures.copy()
-      if self.is_futures_mode
-      else self.grinding_v2_grind_5_stakes_spot.copy()
-    )
     grind_5_sub_thresholds = (
       self.grinding_v2_grind_5_thresholds_futures if self.is_futures_mode else self.grinding_v2_grind_5_thresholds_spot
     )
-    if (slice_amount * grind_5_stakes[0] / (trade.leverage if self.is_futures_mode else 1.0)) < min_stake:
-      multi = min_stake / slice_amount / grind_5_stakes[0] * trade.leverage
-      for i, _ in enumerate(grind_5_stakes):
-        grind_5_stakes[i] *= multi
     grind_5_max_sub_grinds = len(grind_5_stakes)
     grind_5_derisk_grinds = (
       self.grinding_v2_grind_5_derisk_futures if self.is_futures_mode else self.grinding_v2_grind_5_derisk_spot
@@ -53691,329 +53907,97 @@ class NostalgiaForInfinityX6(IStrategy):
       else self.grinding_v2_grind_5_profit_threshold_spot
     )
 
-    is_derisk_1 = False
-    is_derisk_1_found = False  # derisk_level_1 de-risk exit
-    derisk_1_order = None
-    is_derisk_2 = False
-    is_derisk_2_found = False  # derisk_level_2 de-risk exit
-    derisk_2_order = None
-    is_derisk_3 = False
-    is_derisk_3_found = False  # derisk_level_3 de-risk exit
-    derisk_3_order = None
-    buyback_1_sub_grind_count = 0
-    buyback_1_total_amount = 0.0
-    buyback_1_total_cost = 0.0
-    buyback_1_current_open_rate = 0.0
-    buyback_1_current_grind_stake = 0.0
-    buyback_1_current_grind_stake_profit = 0.0
-    buyback_1_is_exit_found = False
-    buyback_1_found = False
-    buyback_1_buy_orders = []
-    buyback_1_orders = []
-    buyback_1_distance_ratio = 0.0
-    buyback_1_exit_order = None
-    buyback_1_exit_distance_ratio = 0.0
-    buyback_2_sub_grind_count = 0
-    buyback_2_total_amount = 0.0
-    buyback_2_total_cost = 0.0
-    buyback_2_current_open_rate = 0.0
-    buyback_2_current_grind_stake = 0.0
-    buyback_2_current_grind_stake_profit = 0.0
-    buyback_2_is_exit_found = False
-    buyback_2_found = False
-    buyback_2_buy_orders = []
-    buyback_2_orders = []
-    buyback_2_distance_ratio = 0.0
-    buyback_2_exit_order = None
-    buyback_2_exit_distance_ratio = 0.0
-    buyback_3_sub_grind_count = 0
-    buyback_3_total_amount = 0.0
-    buyback_3_total_cost = 0.0
-    buyback_3_current_open_rate = 0.0
-    buyback_3_current_grind_stake = 0.0
-    buyback_3_current_grind_stake_profit = 0.0
-    buyback_3_is_exit_found = False
-    buyback_3_found = False
-    buyback_3_buy_orders = []
-    buyback_3_orders = []
-    buyback_3_distance_ratio = 0.0
-    buyback_3_exit_order = None
-    buyback_3_exit_distance_ratio = 0.0
-    grind_1_sub_grind_count = 0
-    grind_1_total_amount = 0.0
-    grind_1_total_cost = 0.0
-    grind_1_current_open_rate = 0.0
-    grind_1_current_grind_stake = 0.0
-    grind_1_current_grind_stake_profit = 0.0
-    grind_1_is_exit_found = False
-    grind_1_found = False
-    grind_1_buy_orders = []
-    grind_1_orders = []
-    grind_1_distance_ratio = 0.0
-    grind_1_exit_order = None
-    grind_1_exit_distance_ratio = 0.0
-    grind_2_sub_grind_count = 0
-    grind_2_total_amount = 0.0
-    grind_2_total_cost = 0.0
-    grind_2_current_open_rate = 0.0
-    grind_2_current_grind_stake = 0.0
-    grind_2_current_grind_stake_profit = 0.0
-    grind_2_is_exit_found = False
-    grind_2_found = False
-    grind_2_buy_orders = []
-    grind_2_orders = []
-    grind_2_distance_ratio = 0.0
-    grind_2_exit_order = None
-    grind_2_exit_distance_ratio = 0.0
-    grind_3_sub_grind_count = 0
-    grind_3_total_amount = 0.0
-    grind_3_total_cost = 0.0
-    grind_3_current_open_rate = 0.0
-    grind_3_current_grind_stake = 0.0
-    grind_3_current_grind_stake_profit = 0.0
-    grind_3_is_exit_found = False
-    grind_3_found = False
-    grind_3_buy_orders = []
-    grind_3_orders = []
-    grind_3_distance_ratio = 0.0
-    grind_3_exit_order = None
-    grind_3_exit_distance_ratio = 0.0
-    grind_4_sub_grind_count = 0
-    grind_4_total_amount = 0.0
-    grind_4_total_cost = 0.0
-    grind_4_current_open_rate = 0.0
-    grind_4_current_grind_stake = 0.0
-    grind_4_current_grind_stake_profit = 0.0
-    grind_4_is_exit_found = False
-    grind_4_found = False
-    grind_4_buy_orders = []
-    grind_4_orders = []
-    grind_4_distance_ratio = 0.0
-    grind_4_exit_order = None
-    grind_4_exit_distance_ratio = 0.0
-    grind_5_sub_grind_count = 0
-    grind_5_total_amount = 0.0
-    grind_5_total_cost = 0.0
-    grind_5_current_open_rate = 0.0
-    grind_5_current_grind_stake = 0.0
-    grind_5_current_grind_stake_profit = 0.0
-    grind_5_is_exit_found = False
-    grind_5_found = False
-    grind_5_buy_orders = []
-    grind_5_orders = []
-    grind_5_distance_ratio = 0.0
-    grind_5_exit_order = None
-    grind_5_exit_distance_ratio = 0.0
-    for order in reversed(filled_orders):
-      if (order.ft_order_side == "sell") and (order is not filled_orders[0]):
-        order_tag = ""
-        if has_order_tags:
-          if order.ft_order_tag is not None:
-            order_tag = order.ft_order_tag
-        if not buyback_1_is_exit_found and order_tag == "buyback_1_entry":
-          buyback_1_sub_grind_count += 1
-          buyback_1_total_amount += order.safe_filled
-          buyback_1_total_cost += order.safe_filled * order.safe_price
-          buyback_1_buy_orders.append(order.id)
-          buyback_1_orders.append(order)
-          if not buyback_1_found:
-            buyback_1_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            buyback_1_found = True
-        elif not buyback_2_is_exit_found and order_tag == "buyback_2_entry":
-          buyback_2_sub_grind_count += 1
-          buyback_2_total_amount += order.safe_filled
-          buyback_2_total_cost += order.safe_filled * order.safe_price
-          buyback_2_buy_orders.append(order.id)
-          buyback_2_orders.append(order)
-          if not buyback_2_found:
-            buyback_2_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            buyback_2_found = True
-        elif not buyback_3_is_exit_found and order_tag == "buyback_3_entry":
-          buyback_3_sub_grind_count += 1
-          buyback_3_total_amount += order.safe_filled
-          buyback_3_total_cost += order.safe_filled * order.safe_price
-          buyback_3_buy_orders.append(order.id)
-          buyback_3_orders.append(order)
-          if not buyback_3_found:
-            buyback_3_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            buyback_3_found = True
-        elif not grind_1_is_exit_found and order_tag == "grind_1_entry":
-          grind_1_sub_grind_count += 1
-          grind_1_total_amount += order.safe_filled
-          grind_1_total_cost += order.safe_filled * order.safe_price
-          grind_1_buy_orders.append(order.id)
-          grind_1_orders.append(order)
-          if not grind_1_found:
-            grind_1_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_1_found = True
-        elif not grind_2_is_exit_found and order_tag == "grind_2_entry":
-          grind_2_sub_grind_count += 1
-          grind_2_total_amount += order.safe_filled
-          grind_2_total_cost += order.safe_filled * order.safe_price
-          grind_2_buy_orders.append(order.id)
-          grind_2_orders.append(order)
-          if not grind_2_found:
-            grind_2_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_2_found = True
-        elif not grind_3_is_exit_found and order_tag == "grind_3_entry":
-          grind_3_sub_grind_count += 1
-          grind_3_total_amount += order.safe_filled
-          grind_3_total_cost += order.safe_filled * order.safe_price
-          grind_3_buy_orders.append(order.id)
-          grind_3_orders.append(order)
-          if not grind_3_found:
-            grind_3_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_3_found = True
-        elif not grind_4_is_exit_found and order_tag == "grind_4_entry":
-          grind_4_sub_grind_count += 1
-          grind_4_total_amount += order.safe_filled
-          grind_4_total_cost += order.safe_filled * order.safe_price
-          grind_4_buy_orders.append(order.id)
-          grind_4_orders.append(order)
-          if not grind_4_found:
-            grind_4_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_4_found = True
-        elif not grind_5_is_exit_found and order_tag == "grind_5_entry":
-          grind_5_sub_grind_count += 1
-          grind_5_total_amount += order.safe_filled
-          grind_5_total_cost += order.safe_filled * order.safe_price
-          grind_5_buy_orders.append(order.id)
-          grind_5_orders.append(order)
-          if not grind_5_found:
-            grind_5_distance_ratio = (exit_rate - order.safe_price) / order.safe_price
-            grind_5_found = True
-      elif order.ft_order_side == "buy":
-        if (
-          order is filled_exits[-1]
-          and (order.safe_remaining * exit_rate / (trade.leverage if self.is_futures_mode else 1.0)) > min_stake
-        ):
-          partial_sell = True
-          # break
-        order_tag = ""
-        if has_order_tags:
-          if order.ft_order_tag is not None:
-            sell_order_tag = order.ft_order_tag
-            order_mode = sell_order_tag.split(" ", 1)
-            if len(order_mode) > 0:
-              order_tag = order_mode[0]
-        if order_tag in ["derisk_level_1", "d"]:
-          if not is_derisk_1_found:
-            is_derisk_1_found = True
-            is_derisk_1 = True
-            derisk_1_order = order
-        elif order_tag in ["derisk_level_2"]:
-          if not is_derisk_2_found:
-            is_derisk_2_found = True
-            is_derisk_2 = True
-            derisk_2_order = order
-        elif order_tag in ["derisk_level_3"]:
-          if not is_derisk_3_found:
-            is_derisk_3_found = True
-            is_derisk_3 = True
-            derisk_3_order = order
-        elif not buyback_1_is_exit_found and order_tag in ["buyback_1_exit", "buyback_1_derisk"]:
-          buyback_1_is_exit_found = True
-          buyback_1_exit_order = order
-        elif not buyback_2_is_exit_found and order_tag in ["buyback_2_exit", "buyback_2_derisk"]:
-          buyback_2_is_exit_found = True
-          buyback_2_exit_order = order
-        elif not buyback_3_is_exit_found and order_tag in ["buyback_3_exit", "buyback_3_derisk"]:
-          buyback_3_is_exit_found = True
-          buyback_3_exit_order = order
-        elif not grind_1_is_exit_found and order_tag in ["grind_1_exit", "grind_1_derisk"]:
-          grind_1_is_exit_found = True
-          grind_1_exit_order = order
-        elif not grind_2_is_exit_found and order_tag in ["grind_2_exit", "grind_2_derisk"]:
-          grind_2_is_exit_found = True
-          grind_2_exit_order = order
-        elif not grind_3_is_exit_found and order_tag in ["grind_3_exit", "grind_3_derisk"]:
-          grind_3_is_exit_found = True
-          grind_3_exit_order = order
-        elif not grind_4_is_exit_found and order_tag in ["grind_4_exit", "grind_4_derisk"]:
-          grind_4_is_exit_found = True
-          grind_4_exit_order = order
-        elif not grind_5_is_exit_found and order_tag in ["grind_5_exit", "grind_5_derisk"]:
-          grind_5_is_exit_found = True
-          grind_5_exit_order = order
-        elif order_tag in ["derisk_global"]:
-          if not buyback_1_is_exit_found:
-            buyback_1_is_exit_found = True
-            buyback_1_exit_order = order
-          if not buyback_2_is_exit_found:
-            buyback_2_is_exit_found = True
-            buyback_2_exit_order = order
-          if not buyback_3_is_exit_found:
-            buyback_3_is_exit_found = True
-            buyback_3_exit_order = order
-          if not grind_1_is_exit_found:
-            grind_1_is_exit_found = True
-            grind_1_exit_order = order
-          if not grind_2_is_exit_found:
-            grind_2_is_exit_found = True
-            grind_2_exit_order = order
-          if not grind_3_is_exit_found:
-            grind_3_is_exit_found = True
-            grind_3_exit_order = order
-          if not grind_4_is_exit_found:
-            grind_4_is_exit_found = True
-            grind_4_exit_order = order
-          if not grind_5_is_exit_found:
-            grind_5_is_exit_found = True
-            grind_5_exit_order = order
-
-    if buyback_1_sub_grind_count > 0:
-      buyback_1_current_open_rate = buyback_1_total_cost / buyback_1_total_amount
-      buyback_1_current_grind_stake = buyback_1_total_amount * exit_rate * (1 - trade.fee_close)
-      buyback_1_current_grind_stake_profit = buyback_1_current_grind_stake - buyback_1_total_cost
-    if buyback_2_sub_grind_count > 0:
-      buyback_2_current_open_rate = buyback_2_total_cost / buyback_2_total_amount
-      buyback_2_current_grind_stake = buyback_2_total_amount * exit_rate * (1 - trade.fee_close)
-      buyback_2_current_grind_stake_profit = buyback_2_current_grind_stake - buyback_2_total_cost
-    if buyback_3_sub_grind_count > 0:
-      buyback_3_current_open_rate = buyback_3_total_cost / buyback_3_total_amount
-      buyback_3_current_grind_stake = buyback_3_total_amount * exit_rate * (1 - trade.fee_close)
-      buyback_3_current_grind_stake_profit = buyback_3_current_grind_stake - buyback_3_total_cost
-    if grind_1_sub_grind_count > 0:
-      grind_1_current_open_rate = grind_1_total_cost / grind_1_total_amount
-      grind_1_current_grind_stake = grind_1_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_1_current_grind_stake_profit = grind_1_current_grind_stake - grind_1_total_cost
-    if grind_2_sub_grind_count > 0:
-      grind_2_current_open_rate = grind_2_total_cost / grind_2_total_amount
-      grind_2_current_grind_stake = grind_2_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_2_current_grind_stake_profit = grind_2_current_grind_stake - grind_2_total_cost
-    if grind_3_sub_grind_count > 0:
-      grind_3_current_open_rate = grind_3_total_cost / grind_3_total_amount
-      grind_3_current_grind_stake = grind_3_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_3_current_grind_stake_profit = grind_3_current_grind_stake - grind_3_total_cost
-    if grind_4_sub_grind_count > 0:
-      grind_4_current_open_rate = grind_4_total_cost / grind_4_total_amount
-      grind_4_current_grind_stake = grind_4_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_4_current_grind_stake_profit = grind_4_current_grind_stake - grind_4_total_cost
-    if grind_5_sub_grind_count > 0:
-      grind_5_current_open_rate = grind_5_total_cost / grind_5_total_amount
-      grind_5_current_grind_stake = grind_5_total_amount * exit_rate * (1 - trade.fee_close)
-      grind_5_current_grind_stake_profit = grind_5_current_grind_stake - grind_5_total_cost
-
-    if grind_1_is_exit_found:
-      grind_1_exit_distance_ratio = (exit_rate - grind_1_exit_order.safe_price) / grind_1_exit_order.safe_price
-    if grind_2_is_exit_found:
-      grind_2_exit_distance_ratio = (exit_rate - grind_2_exit_order.safe_price) / grind_2_exit_order.safe_price
-    if grind_3_is_exit_found:
-      grind_3_exit_distance_ratio = (exit_rate - grind_3_exit_order.safe_price) / grind_3_exit_order.safe_price
-    if grind_4_is_exit_found:
-      grind_4_exit_distance_ratio = (exit_rate - grind_4_exit_order.safe_price) / grind_4_exit_order.safe_price
-    if buyback_1_is_exit_found:
-      buyback_1_exit_distance_ratio = (exit_rate - buyback_1_exit_order.safe_price) / buyback_1_exit_order.safe_price
-    elif is_derisk_1_found:
-      buyback_1_exit_distance_ratio = (exit_rate - derisk_1_order.safe_price) / derisk_1_order.safe_price
-    if buyback_2_is_exit_found:
-      buyback_2_exit_distance_ratio = (exit_rate - buyback_2_exit_order.safe_price) / buyback_2_exit_order.safe_price
-    elif is_derisk_2_found:
-      buyback_2_exit_distance_ratio = (exit_rate - derisk_2_order.safe_price) / derisk_2_order.safe_price
-    if buyback_3_is_exit_found:
-      buyback_3_exit_distance_ratio = (exit_rate - buyback_3_exit_order.safe_price) / buyback_3_exit_order.safe_price
-    elif is_derisk_3_found:
-      buyback_3_exit_distance_ratio = (exit_rate - derisk_3_order.safe_price) / derisk_3_order.safe_price
+    # Open sub-grinds, exits and de-risks of every level, parsed once per fill, at the current exit rate
+    grind_levels = grind_state.levels_at(exit_rate, trade.fee_close)
+    (
+      buyback_1_sub_grind_count,
+      buyback_1_total_amount,
+      buyback_1_current_open_rate,
+      buyback_1_current_grind_stake_profit,
+      buyback_1_is_exit_found,
+      buyback_1_buy_orders,
+      buyback_1_orders,
+      buyback_1_distance_ratio,
+      buyback_1_exit_distance_ratio,
+    ) = grind_levels[0]
+    (
+      buyback_2_sub_grind_count,
+      buyback_2_total_amount,
+      buyback_2_current_open_rate,
+      buyback_2_current_grind_stake_profit,
+      buyback_2_is_exit_found,
+      buyback_2_buy_orders,
+      buyback_2_orders,
+      buyback_2_distance_ratio,
+      buyback_2_exit_distance_ratio,
+    ) = grind_levels[1]
+    (
+      buyback_3_sub_grind_count,
+      buyback_3_total_amount,
+      buyback_3_current_open_rate,
+      buyback_3_current_grind_stake_profit,
+      buyback_3_is_exit_found,
+      buyback_3_buy_orders,
+      buyback_3_orders,
+      buyback_3_distance_ratio,
+      buyback_3_exit_distance_ratio,
+    ) = grind_levels[2]
+    (
+      grind_1_sub_grind_count,
+      grind_1_total_amount,
+      grind_1_current_open_rate,
+      grind_1_current_grind_stake_profit,
+      grind_1_is_exit_found,
+      grind_1_buy_orders,
+      grind_1_orders,
+      grind_1_distance_ratio,
+      grind_1_exit_distance_ratio,
+    ) = grind_levels[3]
+    (
+      grind_2_sub_grind_count,
+      grind_2_total_amount,
+      grind_2_current_open_rate,
+      grind_2_current_grind_stake_profit,
+      grind_2_is_exit_found,
+      grind_2_buy_orders,
+      grind_2_orders,
+      grind_2_distance_ratio,
+      grind_2_exit_distance_ratio,
+    ) = grind_levels[4]
+    (
+      grind_3_sub_grind_count,
+      grind_3_total_amount,
+      grind_3_current_open_rate,
+      grind_3_current_grind_stake_profit,
+      grind_3_is_exit_found,
+      grind_3_buy_orders,
+      grind_3_orders,
+      grind_3_distance_ratio,
+      grind_3_exit_distance_ratio,
+    ) = grind_levels[5]
+    (
+      grind_4_sub_grind_count,
+      grind_4_total_amount,
+      grind_4_current_open_rate,
+      grind_4_current_grind_stake_profit,
+      grind_4_is_exit_found,
+      grind_4_buy_orders,
+      grind_4_orders,
+      grind_4_distance_ratio,
+      grind_4_exit_distance_ratio,
+    ) = grind_levels[6]
+    (
+      grind_5_sub_grind_count,
+      grind_5_total_amount,
+      grind_5_current_open_rate,
+      grind_5_current_grind_stake_profit,
+      grind_5_is_exit_found,
+      grind_5_buy_orders,
+      grind_5_orders,
+      grind_5_distance_ratio,
+      grind_5_exit_distance_ratio,
+    ) = grind_levels[7]
+    is_derisk_1_found, is_derisk_2_found, is_derisk_3_found = grind_state.derisk_found
 
     # all buybacks & grinds
     current_open_grind_stake_profit = (
@@ -55476,11 +55460,11 @@ class NostalgiaForInfinityX6(IStrategy):
   ):
     is_backtest = self.dp.runmode.value in ["backtest", "hyperopt"]
     min_stake = self.correct_min_stake(min_stake)
-    df, _ = self.dp.get_analyzed_dataframe(trade.pair, self.timeframe)
-    if len(df) < 2:
+    num_candles, candles = self.get_candle_context(trade.pair)
+    if num_candles < 2:
       return None
-    last_candle = df.iloc[-1].squeeze()
-    previous_candle = df.iloc[-2].squeeze()
+    last_candle = candles[0]
+    previous_candle = candles[1]
 
     # we already waiting for an order to get filled
     if trade.has_open_orders:
@@ -58500,11 +58484,11 @@ class NostalgiaForInfinityX6(IStrategy):
     # min/max stakes include leverage. The return amounts is before leverage.
     min_stake /= trade.leverage
     max_stake /= trade.leverage
-    df, _ = self.dp.get_analyzed_dataframe(trade.pair, self.timeframe)
-    if len(df) < 2:
+    num_candles, candles = self.get_candle_context(trade.pair)
+    if num_candles < 2:
       return None
-    last_candle = df.iloc[-1].squeeze()
-    previous_candle = df.iloc[-2].squeeze()
+    last_candle = candles[0]
+    previous_candle = candles[1]
 
     # we already waiting for an order to get filled
     if trade.has_open_orders:
@@ -58801,14 +58785,587 @@ def top_percent_change(self, df: DataFrame, length: int) -> float:
 # +---------------------------------------------------------------------------+
 
 
+# Multi Timeframe Merge
+# ---------------------------------------------------------------------------------------------
+def merge_informative_pairs(df: DataFrame, informatives: list, timeframe: str) -> DataFrame:
+  """
+  Same result as merge_informative_pair(ffill=True) for each informative followed by dropping the unneeded
+  columns, but every informative is aligned with one searchsorted, only the kept columns are taken, and the
+  dataframe is copied once.
+
+  :param df: The base timeframe dataframe.
+  :param informatives: (informative dataframe, informative timeframe, dropped columns) tuples, in merge order.
+  :param timeframe: The base timeframe.
+  :return DataFrame: The merged dataframe.
+  """
+  df = df.reset_index(drop=True)
+  dates = df["date"].values
+  minutes = timeframe_to_minutes(timeframe)
+  blocks = [df]
+  for informative, info_timeframe, drop_columns in informatives:
+    minutes_inf = timeframe_to_minutes(info_timeframe)
+    if minutes_inf < minutes:
+      raise ValueError("Tried to merge a faster timeframe to a slower timeframe.")
+    informative = informative.reset_index(drop=True)
+    # The informative candle is available once it's closed
+    date_merge = informative["date"]
+    if minutes < minutes_inf:
+      date_merge = date_merge + pd.to_timedelta(minutes_inf, "m") - pd.to_timedelta(minutes, "m")
+    date_merge = date_merge.values
+    # merge_ordered(fill_method="ffill") carries the last exactly matching informative row forward
+    positions = np.searchsorted(date_merge, dates)
+    matched = positions < len(date_merge)
+    matched[matched] = date_merge[positions[matched]] == dates[matched]
+    indexer = np.where(matched, positions, -1)
+    if len(indexer) > 0:
+      indexer = np.maximum.accumulate(indexer)
+    columns = [column for column in informative.columns if f"{column}_{info_timeframe}" not in drop_columns]
+    block = informative[columns].reindex(indexer)
+    block.index = df.index
+    block.columns = [f"{column}_{info_timeframe}" for column in columns]
+    # The rows before the first match get the last informative candle closed before it (no lookahead)
+    if len(indexer) > 1 and len(date_merge) > 0 and indexer[0] == -1:
+      valid = np.flatnonzero(indexer != -1)
+      if len(valid) > 0:
+        first_valid_idx = valid[0]
+        previous = np.flatnonzero(date_merge < date_merge[indexer[first_valid_idx]])
+        if len(previous) > 0:
+          fill_row = informative.iloc[previous[-1]]
+          fill_row.index = [f"{column}_{info_timeframe}" for column in informative.columns]
+          block.iloc[:first_valid_idx] = block.iloc[:first_valid_idx].fillna(fill_row)
+    blocks.append(block)
+  return pd.concat(blocks, axis=1)
+
+
+# Column Usage Class
+# ---------------------------------------------------------------------------------------------
+class ColumnUsage:
+  """
+  Static analysis of the strategy source.
+
+  The entry/exit/trade code only ever references columns by name, so every string literal outside of the
+  indicator methods is a (superset of the) column it can read. The indicator methods give, for each computed
+  column, the columns it is computed from, so the columns nothing ends up reading can be found.
+  """
+
+  # Oscillators, ratios and percentages, the float32 candidates (the ones no comparison reads)
+  float32_prefixes = (
+    "RSI_",
+    "MFI_",
+    "CMF_",
+    "WILLR_",
+    "AROONU_",
+    "AROOND_",
+    "STOCHk_",
+    "STOCHd_",
+    "STOCHRSIk_",
+    "STOCHRSId_",
+    "KST_",
+    "KSTs_",
+    "UO_",
+    "ROC_",
+    "CCI_",
+    "BBB_",
+    "BBP_",
+    "change_pct",
+    "top_wick_pct",
+    "bot_wick_pct",
+  )
+
+  # The indicator methods that can be recompiled without the assignments of the unneeded columns
+  lazy_methods = re.compile(r"^(informative_\w+|base_tf_5m_full)_indicators$")
+
+  # The names the dataframe and the candles go by in the entry/exit/trade code
+  frame_names = re.compile(r"^(df|dataframe|last_candle|previous_candle(_\d+)?)$")
+
+  # The pandas methods that compare a column with a threshold
+  compare_methods = ("gt", "ge", "lt", "le", "eq", "ne", "between")
+
+  def __init__(self, strategy_class):
+    # All the string literals outside of the indicator methods
+    self.used = set()
+    # The same, without the ones only found in the entry condition blocks
+    self.unconditional = set()
+    # Read as isinstance(candle[column], np.float64), these have to stay float64
+    self.float64_checked = set()
+    # Read in a comparison (or through a local name), float32 rounding could flip these at a threshold
+    self.compared = set()
+    # (side, condition index) -> columns read by the entry condition
+    self.entry_conditions = {}
+    # Method name -> columns read through df[...], last_candle[...] and previous_candle*[...]
+    self.method_columns = {}
+    # Method name -> the methods it calls on self
+    self.calls = {}
+    # Computed column -> (indicator method, columns it is computed from)
+    self.indicators = {}
+    # Columns read by the indicator methods that always run in full
+    self.fixed_reads = set()
+    # Base classes first, so the overrides of a subclass win
+    for cls in reversed(strategy_class.__mro__):
+      if not issubclass(cls, NostalgiaForInfinityX6):
+        continue
+      for node in self.class_node(cls).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+          if self.is_indicator_method(node.name):
+            self.parse_indicator_method(node)
+          else:
+            self.parse_method(node, node.name)
+        else:
+          self.parse_method(node, None)
+
+  @staticmethod
+  def class_node(cls) -> ast.ClassDef:
+    """
+    The class definition of cls, taken from the parsed module. inspect.getsource(cls) parses the whole module to find
+    the class and then tokenizes the class again, which costs seconds on the first populate_indicators.
+
+    :param cls: a class defined at the top level of its module
+    :return ast.ClassDef: the class definition
+    """
+    module_node = ast.parse(inspect.getsource(inspect.getmodule(cls)))
+    for node in module_node.body:
+      if isinstance(node, ast.ClassDef) and node.name == cls.__name__:
+        return node
+    return ast.parse(textwrap.dedent(inspect.getsource(cls))).body[0]
+
+  @staticmethod
+  def is_indicator_method(name: str) -> bool:
+    return name == "populate_indicators" or name.endswith("_indicators")
+
+  @staticmethod
+  def entry_condition_key(node):
+    """(side, index) when the node is an `if long/short_entry_condition_index == N:` block, else None."""
+    if (
+      isinstance(node, ast.If)
+      and isinstance(node.test, ast.Compare)
+      and isinstance(node.test.left, ast.Name)
+      and node.test.left.id in ("long_entry_condition_index", "short_entry_condition_index")
+      and len(node.test.ops) == 1
+      and isinstance(node.test.ops[0], ast.Eq)
+      and isinstance(node.test.comparators[0], ast.Constant)
+    ):
+      return (node.test.left.id.split("_")[0], node.test.comparators[0].value)
+    return None
+
+  def parse_method(self, node, method_name):
+    if method_name is not None:
+      self.method_columns[method_name] = set()
+      self.calls[method_name] = set()
+    pending = [(node, None, False)]
+    while pending:
+      child, condition, compared = pending.pop()
+      condition = self.entry_condition_key(child) or condition
+      compared = compared or self.is_comparison(child)
+      if isinstance(child, ast.Constant) and isinstance(child.value, str):
+        self.used.add(child.value)
+        if condition is None:
+          self.unconditional.add(child.value)
+      elif (
+        isinstance(child, ast.Subscript)
+        and isinstance(child.value, ast.Name)
+        and self.frame_names.match(child.value.id)
+        and isinstance(child.slice, ast.Constant)
+        and isinstance(child.slice.value, str)
+      ):
+        if method_name is not None:
+          self.method_columns[method_name].add(child.slice.value)
+        if condition is not None:
+          self.entry_conditions.setdefault(condition, set()).add(child.slice.value)
+        if compared:
+          self.compared.add(child.slice.value)
+      elif (
+        isinstance(child, ast.Call)
+        and isinstance(child.func, ast.Name)
+        and child.func.id == "isinstance"
+        and len(child.args) == 2
+        and isinstance(child.args[0], ast.Subscript)
+        and isinstance(child.args[0].slice, ast.Constant)
+        and ast.unparse(child.args[1]) == "np.float64"
+      ):
+        self.float64_checked.add(child.args[0].slice.value)
+      elif (
+        method_name is not None
+        and isinstance(child, ast.Call)
+        and isinstance(child.func, ast.Attribute)
+        and isinstance(child.func.value, ast.Name)
+        and child.func.value.id == "self"
+      ):
+        self.calls[method_name].add(child.func.attr)
+      pending.extend((grandchild, condition, compared) for grandchild in ast.iter_child_nodes(child))
+
+  @classmethod
+  def is_comparison(cls, node) -> bool:
+    """Whether the column reads under node can end up compared: comparisons and values kept in a local name."""
+    if isinstance(node, ast.Compare):
+      return True
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+      return node.func.attr in cls.compare_methods
+    if isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign, ast.NamedExpr)):
+      targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+      return any(isinstance(target, (ast.Name, ast.Tuple, ast.List)) for target in targets)
+    return False
+
+  @staticmethod
+  def indicator_naming(node):
+    """(frame name, column prefix, column suffix) of an indicator method, None when it returns no dataframe."""
+    # The dataframe the method returns is the one the columns are written to
+    returns = [
+      child.value.id for child in ast.walk(node) if isinstance(child, ast.Return) and isinstance(child.value, ast.Name)
+    ]
+    if not returns:
+      return None
+    # informative_1h["RSI_3"] ends up as RSI_3_1h, btc_info_1h["close"] as btc_close_1h
+    prefix = ""
+    suffix = ""
+    match = re.match(r"^(informative|btc_info)_(\w+)_indicators$", node.name)
+    if match is not None:
+      prefix = "btc_" if match.group(1) == "btc_info" else ""
+      suffix = f"_{match.group(2)}"
+    return returns[-1], prefix, suffix
+
+  def parse_indicator_method(self, node):
+    naming = self.indicator_naming(node)
+    if naming is None:
+      return
+    frame, prefix, suffix = naming
+
+    def column_reads(expression):
+      reads = set()
+      for child in ast.walk(expression):
+        if isinstance(child, ast.Subscript) and isinstance(child.value, ast.Name):
+          if (
+            child.value.id == frame
+            and isinstance(child.ctx, ast.Load)
+            and isinstance(child.slice, ast.Constant)
+            and isinstance(child.slice.value, str)
+          ):
+            reads.add(f"{prefix}{child.slice.value}{suffix}")
+        elif isinstance(child, ast.Name) and child.id in variables:
+          reads |= variables[child.id]
+      return reads
+
+    # Local name -> columns its value is computed from
+    variables = {}
+    assignments = sorted((child for child in ast.walk(node) if isinstance(child, ast.Assign)), key=lambda a: a.lineno)
+    for assignment in assignments:
+      reads = column_reads(assignment.value)
+      for target in assignment.targets:
+        if (
+          isinstance(target, ast.Subscript)
+          and isinstance(target.value, ast.Name)
+          and target.value.id == frame
+          and isinstance(target.slice, ast.Constant)
+          and isinstance(target.slice.value, str)
+        ):
+          column = f"{prefix}{target.slice.value}{suffix}"
+          # Rewritten columns (RSI_14_1h in populate_indicators) depend on what every writer reads
+          method_name, dependencies = self.indicators.get(column, (node.name, set()))
+          self.indicators[column] = (method_name, (dependencies | reads) - {column})
+        elif isinstance(target, ast.Name):
+          variables[target.id] = reads
+
+    # The methods that aren't recompiled without the unneeded columns read everything they read
+    if not self.lazy_methods.match(node.name):
+      self.fixed_reads |= column_reads(node)
+
+  def used_columns(self, long_entry_signal_params: dict, short_entry_signal_params: dict) -> set:
+    """
+    The columns read with the given entry conditions enabled, the rest of the code (and the indicator methods
+    that always run in full) always counts.
+
+    :param long_entry_signal_params: The long_entry_signal_params in effect.
+    :param short_entry_signal_params: The short_entry_signal_params in effect.
+    :return set: The read columns.
+    """
+    used = self.unconditional | self.fixed_reads
+    for (side, index), columns in self.entry_conditions.items():
+      signal_params = long_entry_signal_params if side == "long" else short_entry_signal_params
+      # Conditions that aren't in the params never run
+      if signal_params.get(f"{side}_entry_condition_{index}_enable", False):
+        used |= columns
+    return used
+
+  def live_columns(self, used: set) -> set:
+    """
+    The computed columns needed for the given read columns, with the columns they are computed from.
+
+    :param used: The read columns.
+    :return set: The needed computed columns.
+    """
+    live = set()
+    pending = [column for column in used if column in self.indicators]
+    while pending:
+      column = pending.pop()
+      if column in live:
+        continue
+      live.add(column)
+      pending.extend(dependency for dependency in self.indicators[column][1] if dependency in self.indicators)
+    return live
+
+  def dead_columns(self, used: set = None) -> set:
+    """
+    The computed columns nothing reads, directly or through another column.
+
+    :param used: The read columns, all of them when None.
+    :return set: The dead columns.
+    """
+    return set(self.indicators) - self.live_columns(self.used | self.fixed_reads if used is None else used)
+
+  def family_columns(self, method_name: str) -> set:
+    """
+    The columns read by a method and everything it calls (an exit/grind family).
+
+    :param method_name: The method the family starts at.
+    :return set: The read columns.
+    """
+    columns = set()
+    seen = set()
+    pending = [method_name]
+    while pending:
+      name = pending.pop()
+      if name in seen or name not in self.method_columns:
+        continue
+      seen.add(name)
+      columns |= self.method_columns[name]
+      pending.extend(self.calls[name])
+    return columns
+
+  def lazy_indicator_method(self, function, live: set):
+    """
+    Recompiles an indicator method without the assignments of the columns that aren't needed, then without the
+    intermediates (bbands_20_2, stochrsi...) nothing reads anymore.
+
+    :param function: The indicator method, as found on the class.
+    :param live: The needed computed columns.
+    :return: The recompiled function, None when it computes nothing unneeded.
+    """
+    node = ast.parse(textwrap.dedent(inspect.getsource(function))).body[0]
+    naming = self.indicator_naming(node)
+    if naming is None:
+      return None
+    frame, prefix, suffix = naming
+
+    def is_unneeded_column(statement):
+      return (
+        isinstance(statement, ast.Assign)
+        and len(statement.targets) == 1
+        and isinstance(statement.targets[0], ast.Subscript)
+        and isinstance(statement.targets[0].value, ast.Name)
+        and statement.targets[0].value.id == frame
+        and isinstance(statement.targets[0].slice, ast.Constant)
+        and f"{prefix}{statement.targets[0].slice.value}{suffix}" not in live
+      )
+
+    def remove(body, is_removed):
+      kept = []
+      for statement in body:
+        if is_removed(statement):
+          continue
+        for field in ("body", "orelse", "finalbody"):
+          if isinstance(getattr(statement, field, None), list) and getattr(statement, field):
+            setattr(statement, field, remove(getattr(statement, field), is_removed))
+        for handler in getattr(statement, "handlers", []):
+          handler.body = remove(handler.body, is_removed)
+        kept.append(statement)
+      return kept or [ast.Pass()]
+
+    def is_unused_variable(statement):
+      return (
+        isinstance(statement, ast.Assign)
+        and len(statement.targets) == 1
+        and isinstance(statement.targets[0], ast.Name)
+        and statement.targets[0].id not in loaded
+      )
+
+    num_nodes = sum(1 for _ in ast.walk(node))
+    node.body = remove(node.body, is_unneeded_column)
+    while True:
+      loaded = {child.id for child in ast.walk(node) if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load)}
+      if not any(is_unused_variable(child) for child in ast.walk(node)):
+        break
+      node.body = remove(node.body, is_unused_variable)
+    if sum(1 for _ in ast.walk(node)) == num_nodes:
+      return None
+
+    module = ast.fix_missing_locations(ast.Module(body=[node], type_ignores=[]))
+    namespace = {}
+    exec(compile(module, f"<lazy {node.name}>", "exec"), function.__globals__, namespace)
+    return namespace[node.name]
+
+  def report(self, long_entry_signal_params: dict, short_entry_signal_params: dict) -> str:
+    """
+    Human readable column usage: per entry condition, per method, and the computed columns never read.
+
+    :param long_entry_signal_params: The long_entry_signal_params in effect.
+    :param short_entry_signal_params: The short_entry_signal_params in effect.
+    :return str: The report.
+    """
+    lines = ["Entry conditions"]
+    for side, index in sorted(self.entry_conditions):
+      signal_params = long_entry_signal_params if side == "long" else short_entry_signal_params
+      state = "enabled" if signal_params.get(f"{side}_entry_condition_{index}_enable", False) else "disabled"
+      columns = sorted(self.entry_conditions[(side, index)])
+      lines.append(f"  {side} #{index} ({state}, {len(columns)}): {', '.join(columns)}")
+    lines.append("Exit and trade methods")
+    for method_name in sorted(self.method_columns):
+      columns = sorted(self.method_columns[method_name])
+      if columns:
+        lines.append(f"  {method_name} ({len(columns)}): {', '.join(columns)}")
+    lines.append("Exit and grind families")
+    for hook in ("custom_exit", "adjust_trade_position"):
+      for method_name in sorted(self.calls.get(hook, ())):
+        columns = sorted(self.family_columns(method_name))
+        if columns:
+          lines.append(f"  {hook} -> {method_name} ({len(columns)}): {', '.join(columns)}")
+    dead = self.dead_columns()
+    lines.append(f"Computed but never read ({len(dead)})")
+    lines.extend(f"  {column} ({self.indicators[column][0]})" for column in sorted(dead))
+    disabled = self.dead_columns(self.used_columns(long_entry_signal_params, short_entry_signal_params)) - dead
+    lines.append(f"Only read by the disabled entry conditions ({len(disabled)})")
+    lines.extend(f"  {column} ({self.indicators[column][0]})" for column in sorted(disabled))
+    return "\n".join(lines)
+
+  def prune(self, df: DataFrame, keep_columns: set) -> DataFrame:
+    """
+    Drops the columns nothing reads and downcasts the non-price indicators no comparison reads to float32, in one
+    copy. The compared ones stay float64, so the entry/exit thresholds see the exact values.
+
+    :param df: The dataframe with all the indicators.
+    :param keep_columns: Columns always kept (the ones freqtrade handed in).
+    :return DataFrame: The lean dataframe.
+    """
+    columns = [column for column in df.columns if column in keep_columns or column in self.used]
+    float32_columns = {
+      column: np.float32
+      for column in columns
+      if column not in keep_columns
+      and column not in self.float64_checked
+      and column not in self.compared
+      and column.startswith(self.float32_prefixes)
+      and df[column].dtype == np.float64
+    }
+    return df[columns].astype(float32_columns)
+
+
+# File Watcher Class
+# ---------------------------------------------------------------------------------------------
+class FileWatcher:
+  """
+  Calls on_change from its own thread when a file is written, replaced or removed. inotify (through libc) watches
+  the parent directory, since editors and `mv` replace the file rather than write it, and the file is stat()ed on
+  every event of the directory and every poll_interval seconds, the only check where inotify is not available
+  (or misses the changes, as on some network and Docker Desktop mounts).
+  """
+
+  IN_CLOSE_WRITE = 0x00000008
+  IN_MOVED_FROM = 0x00000040
+  IN_MOVED_TO = 0x00000080
+  IN_DELETE = 0x00000200
+
+  poll_interval = 5.0
+
+  def __init__(self, path, on_change, stamp):
+    """
+    :param path: The watched file.
+    :param on_change: Called when the file changed.
+    :param stamp: file_stamp(path) taken before the caller read the file, a change since then calls on_change.
+    """
+    self.path = pathlib.Path(path)
+    self.on_change = on_change
+    self.stopped = threading.Event()
+    self.inotify_fd = self.inotify_watch()
+    # Written to by stop(), to wake the thread up from its select()
+    self.wakeup_read_fd, self.wakeup_write_fd = os.pipe()
+    self.stamp = stamp
+    self.thread = threading.Thread(target=self.run, name=f"watch-{self.path.name}", daemon=True)
+    self.thread.start()
+
+  def inotify_watch(self) -> Optional[int]:
+    """
+    :return int: The inotify file descriptor watching the parent directory, None when inotify is not available.
+    """
+    try:
+      libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+      inotify_fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+      return None
+    if inotify_fd < 0:
+      return None
+    mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_DELETE
+    if libc.inotify_add_watch(inotify_fd, os.fsencode(self.path.parent), mask) < 0:
+      os.close(inotify_fd)
+      return None
+    return inotify_fd
+
+  @staticmethod
+  def file_stamp(path):
+    try:
+      stat = os.stat(path)
+    except FileNotFoundError:
+      return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+  def run(self):
+    while not self.stopped.is_set():
+      # First of all, the file can have changed since the caller took the stamp
+      stamp = self.file_stamp(self.path)
+      if stamp != self.stamp:
+        self.stamp = stamp
+        try:
+          self.on_change()
+        except Exception:
+          log.exception("Failed to handle the change of %s", self.path)
+      if self.inotify_fd is not None:
+        readable, _, _ = select.select([self.inotify_fd, self.wakeup_read_fd], [], [], self.poll_interval)
+        if self.inotify_fd in readable:
+          # The events only wake the thread up, the stamp tells whether the watched file changed
+          try:
+            while os.read(self.inotify_fd, 65536):
+              pass
+          except BlockingIOError:
+            pass
+      else:
+        self.stopped.wait(self.poll_interval)
+    if self.inotify_fd is not None:
+      os.close(self.inotify_fd)
+    os.close(self.wakeup_read_fd)
+
+  def stop(self):
+    """
+    Stops the thread and waits for it, it closes the inotify file descriptor on its way out.
+    """
+    self.stopped.set()
+    os.write(self.wakeup_write_fd, b"\0")
+    self.thread.join()
+    os.close(self.wakeup_write_fd)
+
+
 # Cache Class
 # ---------------------------------------------------------------------------------------------
 class Cache:
-  def __init__(self, path):
+  def __init__(self, path, deferred=False):
     self.path = path
-    self.data = {}
+    self._data = {}
     self._mtime = None
     self._previous_data = {}
+    # Deferred: the file is only read on the first access to the data
+    self._deferred = deferred
+    if not deferred:
+      self._initial_load()
+
+  @property
+  def data(self):
+    if self._deferred:
+      self._deferred = False
+      self._initial_load()
+    return self._data
+
+  @data.setter
+  def data(self, data):
+    self._deferred = False
+    self._data = data
+
+  def _initial_load(self):
     try:
       self.load()
     except FileNotFoundError:
@@ -58827,7 +59384,7 @@ class Cache:
       self._load()
 
   def save(self):
-    if self.data != self._previous_data:
+    if not self._deferred and self.data != self._previous_data:
       self._save()
 
   def process_loaded_data(self, data):
@@ -58847,12 +59404,265 @@ class Cache:
 
   def _save(self):
     # This method only exists to simplify unit testing
-    rapidjson.dump(self.data, self.path.open("w"), **self.rapidjson_dump_kwargs())
-    self._mtime = self.path.stat().st_mtime
+    self._write()
     self._previous_data = copy.deepcopy(self.data)
 
+  def _write(self):
+    # Written to a temp file and renamed over the file, a crash leaves the previous version in place
+    temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+    try:
+      with temp_path.open("w") as wfh:
+        rapidjson.dump(self.data, wfh, **self.rapidjson_dump_kwargs())
+        wfh.flush()
+        os.fsync(wfh.fileno())
+      os.replace(temp_path, self.path)
+    except BaseException:
+      temp_path.unlink(missing_ok=True)
+      raise
+    # The same resolution as load() compares against
+    self._mtime = self.path.stat().st_mtime_ns
+
+
+class WriteBehindCache(Cache):
+  """
+  Cache written behind the changes: set() and pop() only mark the keys dirty, flush() appends their final values to
+  a journal next to the file (one write and fsync for all the changes since the last flush). The journal is replayed
+  on load and compacted into the file, written atomically, every journal_compact_records records.
+  """
+
+  journal_compact_records = 1000
+
+  def __init__(self, path, deferred=False):
+    self.journal_path = path.with_name(f"{path.name}.journal")
+    # The keys changed since the last flush
+    self._dirty = set()
+    self._journal_records = 0
+    super().__init__(path, deferred)
+
+  def set(self, key, value):
+    self.data[key] = value
+    self._dirty.add(key)
+
+  def pop(self, key):
+    if key in self.data:
+      del self.data[key]
+      self._dirty.add(key)
+
+  def save(self):
+    self.flush()
+
+  def flush(self):
+    """
+    Journals the keys changed since the last flush, [key, value] or [key] once removed.
+    """
+    if not self._dirty:
+      return
+    records = [
+      rapidjson.dumps([key, self._data[key]] if key in self._data else [key], **self.rapidjson_dump_kwargs())
+      for key in self._dirty
+    ]
+    with self.journal_path.open("a") as wfh:
+      wfh.write("\n".join(records) + "\n")
+      wfh.flush()
+      os.fsync(wfh.fileno())
+    self._dirty.clear()
+    self._journal_records += len(records)
+    if self._journal_records >= self.journal_compact_records:
+      self.compact()
+
+  def close(self):
+    """
+    Journals the pending changes, the cache must not be used afterwards.
+    """
+    self.flush()
+
+  def compact(self):
+    """
+    Writes the data to the file and empties the journal, which the file now includes.
+    """
+    self._write()
+    with self.journal_path.open("w"):
+      pass
+    self._journal_records = 0
+
+  def _initial_load(self):
+    super()._initial_load()
+    try:
+      with self.journal_path.open("r") as rfh:
+        lines = rfh.readlines()
+    except FileNotFoundError:
+      return
+    for line in lines:
+      try:
+        record = rapidjson.loads(line, **self.rapidjson_load_kwargs())
+      except rapidjson.JSONDecodeError:
+        # A flush cut short by a crash, the records before it are complete. Compacted now, the next records would
+        # be appended to the cut one.
+        log.warning("Dropped the incomplete end of the journal %s", self.journal_path)
+        self.compact()
+        return
+      if len(record) == 2:
+        self._data[record[0]] = record[1]
+      else:
+        self._data.pop(record[0], None)
+      self._journal_records += 1
+
+
+class SqliteCache(WriteBehindCache):
+  """
+  WriteBehindCache kept in a table of an SQLite database (WAL mode) instead of a JSON file and its journal. A flush
+  upserts and deletes the changed keys only, in one transaction, so the cost of a change doesn't grow with the
+  number of keys. Several bots can share the database, each in its own namespace.
+  """
+
+  upsert_sql = (
+    "INSERT INTO {table} (namespace, key, value) VALUES (?, ?, ?) "
+    "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value"
+  )
+
+  def __init__(self, path, namespace: str, deferred=False, import_path=None):
+    self.namespace = namespace
+    # JSON cache file (with its journal) to take the data over from, once per namespace
+    self.import_path = import_path
+    self.connection = None
+    super().__init__(pathlib.Path(path), deferred)
+
+  def connect(self) -> sqlite3.Connection:
+    if self.connection is None:
+      self.path.parent.mkdir(parents=True, exist_ok=True)
+      # Autocommit, the flushes open their own transactions
+      self.connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+      self.connection.execute("PRAGMA journal_mode=WAL")
+      self.connection.execute("PRAGMA synchronous=NORMAL")
+      # state: the cached data, meta: what happened to a namespace (the import of the JSON cache)
+      for table in ("state", "meta"):
+        self.connection.execute(
+          f"CREATE TABLE IF NOT EXISTS {table} ("
+          "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (namespace, key)"
+          ") WITHOUT ROWID"
+        )
+    return self.connection
+
+  def load(self):
+    rows = self.connect().execute("SELECT key, value FROM state WHERE namespace = ?", (self.namespace,)).fetchall()
+    self._data = {key: rapidjson.loads(value, **self.rapidjson_load_kwargs()) for key, value in rows}
+
+  def _initial_load(self):
+    self.load()
+    if self.import_path is None:
+      return
+    connection = self.connect()
+    imported_sql = "SELECT 1 FROM meta WHERE namespace = ? AND key = 'imported'"
+    if connection.execute(imported_sql, (self.namespace,)).fetchone() is not None:
+      return
+    # Only into an empty namespace (one filled before the import was recorded is taken as imported), and only once:
+    # the JSON file is left as it was, keys removed since must not come back from it
+    data = {} if self._data else WriteBehindCache(self.import_path).data
+    dump_kwargs = self.rapidjson_dump_kwargs()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+      if connection.execute(imported_sql, (self.namespace,)).fetchone() is None:
+        connection.executemany(
+          self.upsert_sql.format(table="state"),
+          [(self.namespace, key, rapidjson.dumps(value, **dump_kwargs)) for key, value in data.items()],
+        )
+        connection.execute(
+          self.upsert_sql.format(table="meta"), (self.namespace, "imported", str(self.import_path))
+        )
+      else:
+        data = {}
+    except BaseException:
+      connection.execute("ROLLBACK")
+      raise
+    connection.execute("COMMIT")
+    if data:
+      self._data = data
+      log.info("Took the data of %s over into %s (%s)", self.import_path, self.path, self.namespace)
+
+  def flush(self):
+    """
+    Writes the keys changed since the last flush, in one transaction.
+    """
+    if not self._dirty:
+      return
+    dump_kwargs = self.rapidjson_dump_kwargs()
+    upserts = [
+      (self.namespace, key, rapidjson.dumps(self._data[key], **dump_kwargs)) for key in self._dirty if key in self._data
+    ]
+    deletes = [(self.namespace, key) for key in self._dirty if key not in self._data]
+    connection = self.connect()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+      connection.executemany(self.upsert_sql.format(table="state"), upserts)
+      connection.executemany("DELETE FROM state WHERE namespace = ? AND key = ?", deletes)
+    except BaseException:
+      connection.execute("ROLLBACK")
+      raise
+    connection.execute("COMMIT")
+    self._dirty.clear()
+
+  def close(self):
+    super().close()
+    if self.connection is not None:
+      self.connection.close()
+      self.connection = None
+
+  def compact(self):
+    # Nothing to compact, the checkpoints of the WAL file are automatic
+    pass
+
 
 class HoldsCache(Cache):
+  def __init__(self, path, open_trades_snapshot=None, watch=False):
+    # Callable returning the OpenTradesSnapshot to check the configured trades against
+    self.open_trades_snapshot = open_trades_snapshot
+    # The holds file as read by the watcher thread, processed by the next load()
+    self._changed_data = None
+    self._changed_lock = threading.Lock()
+    self._watcher = None
+    # Before the file is read, so a write in between is still seen as a change
+    stamp = FileWatcher.file_stamp(path)
+    super().__init__(path)
+    if watch:
+      self._watcher = FileWatcher(self.path, self._read_changed, stamp)
+
+  def close(self):
+    if self._watcher is not None:
+      self._watcher.stop()
+      self._watcher = None
+
+  def load(self):
+    if self._watcher is None:
+      return super().load()
+    # No filesystem access, the watcher already read the changed file
+    with self._changed_lock:
+      data, self._changed_data = self._changed_data, None
+    if data is not None:
+      self.data = self.process_loaded_data(data)
+
+  def _read_changed(self):
+    # Runs on the watcher thread, a removed file holds nothing
+    try:
+      with self.path.open("r") as rfh:
+        data = rapidjson.load(rfh, **self.rapidjson_load_kwargs())
+    except FileNotFoundError:
+      data = {}
+    except rapidjson.JSONDecodeError as exc:
+      log.error("Failed to load JSON from %s: %s", self.path, exc)
+      return
+    with self._changed_lock:
+      self._changed_data = data
+
+  def _load(self):
+    with self.path.open("r") as rfh:
+      try:
+        data = rapidjson.load(rfh, **self.rapidjson_load_kwargs())
+      except rapidjson.JSONDecodeError as exc:
+        log.error("Failed to load JSON from %s: %s", self.path, exc)
+      else:
+        self.data = self.process_loaded_data(data)
+        self._mtime = self.path.stat().st_mtime_ns
+
   @staticmethod
   def rapidjson_load_kwargs():
     return {
@@ -58872,15 +59682,25 @@ class HoldsCache(Cache):
     raise RuntimeError("The holds cache does not allow programatical save")
 
   def process_loaded_data(self, data):
+    # Published read-only and swapped as a whole, the exit checks never see a half updated version
+    holds = self.process_holds(data)
+    return types.MappingProxyType(
+      {key: types.MappingProxyType(value) if isinstance(value, dict) else value for key, value in holds.items()}
+    )
+
+  def process_holds(self, data):
     trade_ids = data.get("trade_ids")
     trade_pairs = data.get("trade_pairs")
 
     if not trade_ids and not trade_pairs:
       return data
 
-    open_trades = {}
-    for trade in Trade.get_trades_proxy(is_open=True):
-      open_trades[trade.id] = open_trades[trade.pair] = trade
+    if self.open_trades_snapshot is not None:
+      open_trades = self.open_trades_snapshot().by_key
+    else:
+      open_trades = {}
+      for trade in Trade.get_trades_proxy(is_open=True):
+        open_trades[trade.id] = open_trades[trade.pair] = trade
 
     r_trade_ids = {}
     if trade_ids:
@@ -58990,4 +59810,2043 @@ class HoldsCache(Cache):
       except ValueError:
         pass
       _data[key] = value
-    return _data
\ No newline at end of file
+    return _data
+
+# Informative Cache Class
+# ---------------------------------------------------------------------------------------------
+class InformativeCache:
+  """
+  In-memory cache of informative dataframes, keyed by (pair, timeframe) and tagged with the candle key
+  (last candle date) they were computed for. Only the latest candle is kept per (pair, timeframe).
+  """
+
+  def __init__(self):
+    self.data = {}
+
+  def get(self, pair: str, timeframe: str, candle_key):
+    entry = self.data.get((pair, timeframe))
+    if entry is not None and entry[0] == candle_key:
+      return entry[1]
+    return None
+
+  def set(self, pair: str, timeframe: str, candle_key, df: DataFrame):
+    self.data[(pair, timeframe)] = (candle_key, df)
+
+  def clear(self):
+    self.data.clear()
+
+
+# Indicators Disk Cache Class
+# ---------------------------------------------------------------------------------------------
+class IndicatorsDiskCache:
+  """
+  Backtesting: the indicators of every pair, as uncompressed Feather files read back memory-mapped.
+
+  A file is named after the pair, the timeframe, a hash of all the candles the indicators are computed from
+  (the pair, its informative timeframes and the BTC informatives) and a hash of the indicator code and settings,
+  so reruns with other entry/exit logic reuse it and any change to the candles or to the indicators misses.
+  Only the latest file of a pair and timeframe is kept.
+  """
+
+  ohlcv_columns = ("date", "open", "high", "low", "close", "volume")
+
+  def __init__(self, path):
+    self.path = pathlib.Path(path)
+    self.code_hash = None
+
+  @staticmethod
+  def indicators_code_hash(strategy) -> str:
+    """
+    The hash of the strategy source files (this module and the ones of the subclasses, so any class, helper or
+    class attribute the indicators go through), the parameters the config overrides, the settings the indicators
+    depend on and the versions of the libraries that compute them.
+
+    :param strategy: The strategy instance, with its lazy indicator columns initialized.
+    :return str: The hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    source_files = []
+    for cls in reversed(type(strategy).__mro__):
+      if issubclass(cls, NostalgiaForInfinityX6) and inspect.getfile(cls) not in source_files:
+        source_files.append(inspect.getfile(cls))
+    for source_file in source_files:
+      digest.update(pathlib.Path(source_file).read_bytes())
+    # The class attributes set from the config (nfi_parameters, the old top level style, the advanced mode)
+    config_names = set(strategy.config.get("nfi_parameters", {})) | set(strategy.config)
+    overrides = sorted(
+      (name, repr(getattr(strategy, name)))
+      for name in config_names
+      if isinstance(name, str) and hasattr(type(strategy), name) and not callable(getattr(type(strategy), name))
+    )
+    digest.update(repr(overrides).encode())
+    settings = (
+      strategy.timeframe,
+      tuple(strategy.info_timeframes),
+      tuple(strategy.btc_info_timeframes),
+      strategy.config["runmode"].value,
+      strategy.bt_min_age_days,
+      strategy.protections_bitmask_enable,
+      None if strategy.lazy_indicators_columns is None else sorted(strategy.lazy_indicators_columns),
+      np.__version__,
+      pd.__version__,
+      talib.__version__,
+      pta.version,
+    )
+    digest.update(repr(settings).encode())
+    return digest.hexdigest()
+
+  def file_path(self, strategy, df: DataFrame, pair: str, btc_info_pair: str) -> pathlib.Path:
+    """
+    The cache file of the pair for these candles.
+
+    :param strategy: The strategy instance.
+    :param df: The base timeframe candles.
+    :param pair: The pair.
+    :param btc_info_pair: The BTC informative pair.
+    :return Path: The cache file path (it may not exist).
+    """
+    if self.code_hash is None:
+      self.code_hash = self.indicators_code_hash(strategy)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(df.index.to_numpy()).tobytes())
+    frames = [df]
+    frames += [strategy.informative_candles(pair, timeframe) for timeframe in strategy.info_timeframes]
+    frames += [strategy.informative_candles(btc_info_pair, timeframe) for timeframe in strategy.btc_info_timeframes]
+    for frame in frames:
+      digest.update(str(len(frame)).encode())
+      for column in self.ohlcv_columns:
+        digest.update(np.ascontiguousarray(frame[column].values).tobytes())
+    pair_name = re.sub(r"[^\w.-]", "_", pair)
+    return self.path / f"{pair_name}-{strategy.timeframe}-{digest.hexdigest()}-{self.code_hash}.feather"
+
+  def load(self, file_path: pathlib.Path, index) -> Optional[DataFrame]:
+    """
+    Reads the cached indicators, memory-mapped.
+
+    :param file_path: The cache file path.
+    :param index: The index of the base timeframe candles.
+    :return DataFrame: The cached dataframe with the given index, None when there is none.
+    """
+    if not file_path.is_file():
+      return None
+    try:
+      df = feather.read_table(file_path, memory_map=True).to_pandas()
+    except Exception as exc:
+      log.warning(f"Failed to read the indicators cache {file_path}: {exc}")
+      return None
+    if len(df) != len(index):
+      return None
+    df.index = index
+    return df
+
+  def save(self, file_path: pathlib.Path, df: DataFrame) -> None:
+    """
+    Writes the indicators (atomically, other backtests can be reading the same directory) and removes the files
+    of the same pair and timeframe that are now stale.
+
+    :param file_path: The cache file path.
+    :param df: The dataframe with all the indicators.
+    """
+    self.path.mkdir(parents=True, exist_ok=True)
+    temp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    try:
+      feather.write_feather(df.reset_index(drop=True), temp_path, compression="uncompressed")
+      os.replace(temp_path, file_path)
+    except Exception as exc:
+      log.warning(f"Failed to write the indicators cache {file_path}: {exc}")
+      temp_path.unlink(missing_ok=True)
+      return
+    prefix = file_path.name.rsplit("-", 2)[0]
+    for stale_path in self.path.glob(f"{prefix}-*.feather"):
+      if stale_path != file_path:
+        stale_path.unlink(missing_ok=True)
+
+
+# Shared Candles Store Class
+# ---------------------------------------------------------------------------------------------
+class SharedCandlesStore:
+  """
+  Live & dry-run: the informative candles shared by the bots of one host, one Arrow IPC (Feather) file per pair and
+  timeframe, read back memory-mapped.
+
+  The writer bot refreshes the files from its data provider each loop, replacing a file (temp file and rename)
+  when a new candle closed, so readers keep a valid mapping of the previous one. The readers take the candles from
+  the store and only ask the exchange for the streams that are missing or stale there, a store that doesn't have the
+  last closed candle yet (the writer loop not run since it closed) is never used.
+  """
+
+  def __init__(self, path, writer: bool):
+    self.path = pathlib.Path(path)
+    self.writer = writer
+    # (pair, timeframe) -> ((st_mtime_ns, st_size), candles)
+    self.frames = {}
+    # (pair, timeframe) -> (last candle date, number of candles) of the last write
+    self.written = {}
+    self.path.mkdir(parents=True, exist_ok=True)
+
+  def file_path(self, pair: str, timeframe: str) -> pathlib.Path:
+    pair_name = re.sub(r"[^\w.-]", "_", pair)
+    return self.path / f"{pair_name}-{timeframe}.arrow"
+
+  def write(self, pair: str, timeframe: str, candles: DataFrame) -> None:
+    """
+    Replaces the candles of the pair and timeframe, when they changed since the last write.
+
+    :param pair: The pair.
+    :param timeframe: The timeframe.
+    :param candles: The candles from the data provider.
+    """
+    if len(candles) == 0:
+      return
+    candle_key = (candles["date"].iat[-1], len(candles))
+    if self.written.get((pair, timeframe)) == candle_key:
+      return
+    file_path = self.file_path(pair, timeframe)
+    temp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    try:
+      feather.write_feather(
+        candles[["date", "open", "high", "low", "close", "volume"]].reset_index(drop=True),
+        temp_path,
+        compression="uncompressed",
+      )
+      os.replace(temp_path, file_path)
+    except Exception as exc:
+      log.warning(f"Failed to write the shared candles {file_path}: {exc}")
+      temp_path.unlink(missing_ok=True)
+      return
+    self.written[(pair, timeframe)] = candle_key
+
+  def read(self, pair: str, timeframe: str) -> Optional[DataFrame]:
+    """
+    The stored candles of the pair and timeframe, mapped again only when the writer replaced the file.
+
+    :param pair: The pair.
+    :param timeframe: The timeframe.
+    :return DataFrame: The candles (read-only arrays), None when the store doesn't have them.
+    """
+    file_path = self.file_path(pair, timeframe)
+    try:
+      stat = file_path.stat()
+    except FileNotFoundError:
+      return None
+    file_key = (stat.st_mtime_ns, stat.st_size)
+    entry = self.frames.get((pair, timeframe))
+    if entry is not None and entry[0] == file_key:
+      return entry[1]
+    try:
+      candles = feather.read_table(file_path, memory_map=True).to_pandas(split_blocks=True)
+    except Exception as exc:
+      log.warning(f"Failed to read the shared candles {file_path}: {exc}")
+      return None
+    self.frames[(pair, timeframe)] = (file_key, candles)
+    return candles
+
+  def is_fresh(self, candles: Optional[DataFrame], timeframe: str, current_time: datetime) -> bool:
+    """
+    Whether the candles end with the last closed candle.
+
+    :param candles: The stored (or exchange) candles.
+    :param timeframe: The timeframe.
+    :param current_time: The current time.
+    :return bool: True when the candles can be used.
+    """
+    if candles is None or len(candles) == 0:
+      return False
+    candle_duration = timedelta(minutes=timeframe_to_minutes(timeframe))
+    current_candle_date = timeframe_to_prev_date(timeframe, current_time)
+    return candles["date"].iat[-1] >= current_candle_date - candle_duration
+
+
+# Local Informative Candles Class
+# ---------------------------------------------------------------------------------------------
+class LocalInformativeCandles:
+  """
+  Live & dry-run: informative timeframes kept up to date from the base timeframe candles instead of the exchange.
+
+  A (pair, timeframe) is seeded once with its exchange candles (the base timeframe doesn't go back far enough to
+  build the history), after checking that the base candles resampled to the timeframe give the same candles where
+  both overlap. From then on every informative candle that closes is built from its base candles, and the stream
+  no longer has to be refreshed from the exchange. A timeframe failing the check keeps the exchange candles, for
+  all the pairs, and a stream the base candles can't extend any more (a gap) is seeded again.
+
+  Only the informative candles whose base candles have all closed are built, never the one in progress, so merged
+  with merge_informative_pairs (forward-filled) every base candle sees exactly what the exchange candles give it.
+  Each update only resamples the base candles past the last informative candle.
+  """
+
+  def __init__(self, base_timeframe: str):
+    self.base_timeframe = base_timeframe
+    # (pair, timeframe) -> (the candles, the number of candles kept, the last base candle date they are updated to)
+    self.series = {}
+    # timeframe -> result of the parity check
+    self.parity = {}
+    # The timeframes of a pair are built in parallel (num_cores_indicators_calc)
+    self.lock = threading.Lock()
+
+  def can_derive(self, timeframe: str) -> bool:
+    minutes = timeframe_to_minutes(timeframe)
+    base_minutes = timeframe_to_minutes(self.base_timeframe)
+    # The candles have to start at the same times as the exchange ones, from midnight UTC
+    return (
+      minutes > base_minutes
+      and minutes % base_minutes == 0
+      and (24 * 60) % minutes == 0
+      and self.parity.get(timeframe) is not False
+    )
+
+  def is_local(self, pair: str, timeframe: str) -> bool:
+    return (pair, timeframe) in self.series
+
+  def prune(self, pairs: set) -> None:
+    """
+    Drops the streams of the pairs no longer used, the ones that left the whitelist.
+
+    :param pairs: The pairs whose streams are kept.
+    """
+    with self.lock:
+      for stream in [stream for stream in self.series if stream[0] not in pairs]:
+        del self.series[stream]
+
+  def resample(self, base_candles: DataFrame, timeframe: str) -> DataFrame:
+    """
+    Resamples the base candles to the timeframe, only the candles all of whose base candles are there.
+
+    :param base_candles: The base timeframe candles.
+    :param timeframe: The informative timeframe.
+    :return DataFrame: The closed informative candles.
+    """
+    num_base_candles = timeframe_to_minutes(timeframe) // timeframe_to_minutes(self.base_timeframe)
+    dates = base_candles["date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    if len(dates) == 0:
+      return DataFrame(columns=["date", "open", "high", "low", "close", "volume"])
+    period = timeframe_to_minutes(timeframe) * 60 * 1_000_000_000
+    starts = dates - dates % period
+    # The base candles are sorted, every informative candle is a run of the same start, complete when it's as long as
+    # the number of base candles in it
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    length = np.diff(np.r_[first, len(starts)])
+    first = first[length == num_base_candles]
+    if len(first) == 0:
+      return DataFrame(columns=["date", "open", "high", "low", "close", "volume"])
+    rows = first[:, None] + np.arange(num_base_candles)
+    return DataFrame(
+      {
+        "date": pd.to_datetime(starts[first], utc=True),
+        "open": base_candles["open"].to_numpy()[first],
+        "high": base_candles["high"].to_numpy()[rows].max(axis=1),
+        "low": base_candles["low"].to_numpy()[rows].min(axis=1),
+        "close": base_candles["close"].to_numpy()[first + num_base_candles - 1],
+        "volume": base_candles["volume"].to_numpy()[rows].sum(axis=1),
+      }
+    )
+
+  def seed(self, pair: str, timeframe: str, candles: DataFrame, base_candles: DataFrame, max_candles: int) -> bool:
+    """
+    Starts keeping the (pair, timeframe) locally, when the resampled base candles match the exchange ones.
+
+    :param pair: The pair.
+    :param timeframe: The informative timeframe.
+    :param candles: The exchange candles of the timeframe.
+    :param base_candles: The base timeframe candles of the pair.
+    :param max_candles: The number of candles kept, the oldest ones age out.
+    :return bool: True when the stream is now kept locally.
+    """
+    if len(candles) == 0 or len(base_candles) == 0:
+      return False
+    resampled = self.resample(base_candles, timeframe)
+    # Exchange candles not refreshed up to the base ones can't be extended from them
+    if len(resampled) == 0 or resampled["date"].iat[-1] > candles["date"].iat[-1]:
+      return False
+    overlap = resampled.merge(candles, on="date", suffixes=("", "_exchange"))
+    if len(overlap) == 0:
+      return False
+    matches = all(
+      np.array_equal(overlap[column].to_numpy(), overlap[f"{column}_exchange"].to_numpy())
+      for column in ("open", "high", "low", "close")
+    ) and np.allclose(overlap["volume"].to_numpy(), overlap["volume_exchange"].to_numpy(), rtol=1e-6)
+    if not matches:
+      with self.lock:
+        self.parity[timeframe] = False
+        for stream in [stream for stream in self.series if stream[1] == timeframe]:
+          del self.series[stream]
+      log.warning(
+        f"{pair} {self.base_timeframe} candles resampled to {timeframe} don't match the exchange ones, "
+        f"the {timeframe} informatives keep being downloaded."
+      )
+      return False
+    with self.lock:
+      if self.parity.get(timeframe) is False:
+        return False
+      self.parity[timeframe] = True
+      self.series[(pair, timeframe)] = (
+        candles[["date", "open", "high", "low", "close", "volume"]].reset_index(drop=True),
+        max(max_candles, len(candles)),
+        base_candles["date"].iat[-1],
+      )
+    return True
+
+  def update(self, pair: str, timeframe: str, base_candles: DataFrame) -> Optional[DataFrame]:
+    """
+    Appends the informative candles closed since the last update.
+
+    :param pair: The pair.
+    :param timeframe: The informative timeframe.
+    :param base_candles: The base timeframe candles of the pair.
+    :return DataFrame: The candles, None when the base candles no longer reach back to the last one (stream dropped).
+    """
+    with self.lock:
+      return self._update(pair, timeframe, base_candles)
+
+  def _update(self, pair: str, timeframe: str, base_candles: DataFrame) -> Optional[DataFrame]:
+    stream = self.series.get((pair, timeframe))
+    if stream is None:
+      return None
+    candles, max_candles, base_date = stream
+    if len(base_candles) > 0 and base_candles["date"].iat[-1] == base_date:
+      return candles
+    next_date = candles["date"].iat[-1] + timedelta(minutes=timeframe_to_minutes(timeframe))
+    if len(base_candles) == 0 or base_candles["date"].iat[0] > next_date:
+      del self.series[(pair, timeframe)]
+      return None
+    base_date = base_candles["date"].iat[-1]
+    # Only the base candles past the last informative candle
+    new_base_candles = base_candles.iloc[base_candles["date"].searchsorted(next_date) :]
+    new_candles = self.resample(new_base_candles, timeframe)
+    if len(new_candles) == 0:
+      self.series[(pair, timeframe)] = (candles, max_candles, base_date)
+      return candles
+    # A base candle missing in between, the exchange candle would have it
+    if new_candles["date"].iat[0] != next_date or len(new_candles) != (
+      (new_candles["date"].iat[-1] - next_date) // timedelta(minutes=timeframe_to_minutes(timeframe)) + 1
+    ):
+      del self.series[(pair, timeframe)]
+      return None
+    candles = pd.concat([candles, new_candles], ignore_index=True).tail(max_candles).reset_index(drop=True)
+    self.series[(pair, timeframe)] = (candles, max_candles, base_date)
+    return candles
+
+
+# Trade Order Aggregates Class
+# ---------------------------------------------------------------------------------------------
+class TradeOrderAggregates:
+  """
+  Running sums of the filled orders of one trade, accumulated in the same order as calc_total_profit always
+  did (entries first, then exits), so the results are identical. New fills only add their own terms, a change
+  in the entries replays the exits on top of the new entry sums.
+  """
+
+  __slots__ = (
+    "key",
+    "num_entries",
+    "last_entry",
+    "entry_amount",
+    "entry_profit",
+    "total_stake",
+    "num_exits",
+    "last_exit",
+    "total_amount",
+    "total_profit",
+  )
+
+  def __init__(self, key):
+    # (pair, open date, is_short, fee open rate, fee close rate)
+    self.key = key
+    self.num_entries = 0
+    self.last_entry = None
+    self.entry_amount = 0.0
+    self.entry_profit = 0.0
+    self.total_stake = 0.0
+    self.num_exits = 0
+    self.last_exit = None
+    self.total_amount = 0.0
+    self.total_profit = 0.0
+
+  @staticmethod
+  def order_key(order):
+    return (order.id, order.safe_filled, order.safe_price)
+
+  def update(self, filled_entries, filled_exits):
+    is_short = self.key[2]
+    fee_open_rate = self.key[3]
+    fee_close_rate = self.key[4]
+
+    # The already summed orders must still be the head of the lists, an older order filling after a newer one
+    # shifts the last summed one
+    if self.num_entries > len(filled_entries) or (
+      self.num_entries > 0 and self.order_key(filled_entries[self.num_entries - 1]) != self.last_entry
+    ):
+      self.num_entries = 0
+      self.entry_amount = 0.0
+      self.entry_profit = 0.0
+      self.total_stake = 0.0
+    if self.num_exits > len(filled_exits) or (
+      self.num_exits > 0 and self.order_key(filled_exits[self.num_exits - 1]) != self.last_exit
+    ):
+      self.num_exits = 0
+
+    if self.num_entries < len(filled_entries):
+      for entry_order in filled_entries[self.num_entries :]:
+        if is_short:
+          entry_stake = entry_order.safe_filled * entry_order.safe_price * (1 - fee_open_rate)
+          self.entry_amount += entry_order.safe_filled
+          self.total_stake += entry_stake
+          self.entry_profit += entry_stake
+        else:
+          entry_stake = entry_order.safe_filled * entry_order.safe_price * (1 + fee_open_rate)
+          self.entry_amount += entry_order.safe_filled
+          self.total_stake += entry_stake
+          self.entry_profit -= entry_stake
+      self.num_entries = len(filled_entries)
+      self.last_entry = self.order_key(filled_entries[-1])
+      # The exits are summed on top of the entries
+      self.num_exits = 0
+
+    if self.num_exits == 0:
+      self.total_amount = self.entry_amount
+      self.total_profit = self.entry_profit
+    if self.num_exits < len(filled_exits):
+      for exit_order in filled_exits[self.num_exits :]:
+        if is_short:
+          exit_stake = exit_order.safe_filled * exit_order.safe_price * (1 + fee_close_rate)
+          self.total_amount -= exit_order.safe_filled
+          self.total_profit -= exit_stake
+        else:
+          exit_stake = exit_order.safe_filled * exit_order.safe_price * (1 - fee_close_rate)
+          self.total_amount -= exit_order.safe_filled
+          self.total_profit += exit_stake
+      self.num_exits = len(filled_exits)
+      self.last_exit = self.order_key(filled_exits[-1])
+
+
+# Grind State Class
+# ---------------------------------------------------------------------------------------------
+class GrindState:
+  """
+  The grinding v2 state of one trade, parsed from the tags of its filled orders once per fill instead of on every
+  adjust_trade_position call: per level the open sub-grinds since the last exit of the level (count, amount, cost,
+  entry orders, last entry price), the price the level last exited at, and the de-risk levels done. The order scan
+  is the one of long/short_grind_adjust_trade_position_v2, newest order first, so the sums are the same to the bit.
+  Each call only computes the exit rate dependent values of the 8 levels (scalar math, NumPy costs more than it
+  saves on 8 values).
+  """
+
+  levels = ("buyback_1", "buyback_2", "buyback_3", "grind_1", "grind_2", "grind_3", "grind_4", "grind_5")
+  entry_tags = {f"{level}_entry": index for index, level in enumerate(levels)}
+  exit_tags = {
+    f"{level}_{exit_kind}": index for index, level in enumerate(levels) for exit_kind in ("exit", "derisk")
+  }
+  derisk_tags = {"derisk_level_1": 0, "d": 0, "derisk_level_2": 1, "derisk_level_3": 2}
+
+  __slots__ = (
+    "key",
+    "counts",
+    "amounts",
+    "costs",
+    "open_rates",
+    "buy_orders",
+    "orders",
+    "last_entry_prices",
+    "exit_prices",
+    "has_exit_price",
+    "is_exit_found",
+    "derisk_found",
+    "stakes_key",
+    "stakes_value",
+  )
+
+  def __init__(self, key, filled_orders, entry_side: str, has_order_tags: bool):
+    # (pair, open date, entry side, has order tags, number of filled orders, last filled order)
+    self.key = key
+    exit_side = "sell" if entry_side == "buy" else "buy"
+    num_levels = len(self.levels)
+    counts = [0] * num_levels
+    amounts = [0.0] * num_levels
+    costs = [0.0] * num_levels
+    buy_orders = [[] for _ in self.levels]
+    orders = [[] for _ in self.levels]
+    last_entry_prices = [1.0] * num_levels
+    is_exit_found = [False] * num_levels
+    exit_orders = [None] * num_levels
+    derisk_orders = [None] * 3
+    for order in reversed(filled_orders):
+      if (order.ft_order_side == entry_side) and (order is not filled_orders[0]):
+        order_tag = order.ft_order_tag if has_order_tags and order.ft_order_tag is not None else ""
+        level = self.entry_tags.get(order_tag)
+        if level is not None and not is_exit_found[level]:
+          if counts[level] == 0:
+            last_entry_prices[level] = order.safe_price
+          counts[level] += 1
+          amounts[level] += order.safe_filled
+          costs[level] += order.safe_filled * order.safe_price
+          buy_orders[level].append(order.id)
+          orders[level].append(order)
+      elif order.ft_order_side == exit_side:
+        order_tag = ""
+        if has_order_tags and order.ft_order_tag is not None:
+          order_tag = order.ft_order_tag.split(" ", 1)[0]
+        derisk_level = self.derisk_tags.get(order_tag)
+        level = self.exit_tags.get(order_tag)
+        if derisk_level is not None:
+          if derisk_orders[derisk_level] is None:
+            derisk_orders[derisk_level] = order
+        elif level is not None:
+          if not is_exit_found[level]:
+            is_exit_found[level] = True
+            exit_orders[level] = order
+        elif order_tag == "derisk_global":
+          for level in range(num_levels):
+            if not is_exit_found[level]:
+              is_exit_found[level] = True
+              exit_orders[level] = order
+
+    # Where the exit distance of a level is measured from: grind_1-4 their exit, buyback_1-3 their exit or else
+    # the de-risk of the same level (grind_5 has none)
+    exit_prices = [1.0] * num_levels
+    has_exit_price = [False] * num_levels
+    for level, level_name in enumerate(self.levels):
+      exit_order = exit_orders[level]
+      if level_name.startswith("buyback_") and exit_order is None:
+        exit_order = derisk_orders[level]
+      elif level_name == "grind_5":
+        exit_order = None
+      if exit_order is not None:
+        exit_prices[level] = exit_order.safe_price
+        has_exit_price[level] = True
+
+    self.counts = counts
+    self.amounts = amounts
+    self.costs = costs
+    self.open_rates = [cost / amount if count > 0 else 0.0 for count, amount, cost in zip(counts, amounts, costs)]
+    self.buy_orders = buy_orders
+    self.orders = orders
+    self.last_entry_prices = last_entry_prices
+    self.exit_prices = exit_prices
+    self.has_exit_price = has_exit_price
+    self.is_exit_found = is_exit_found
+    self.derisk_found = tuple(order is not None for order in derisk_orders)
+    self.stakes_key = None
+    self.stakes_value = None
+
+  def stakes(self, strategy, slice_amount: float, leverage: float, min_stake: float) -> tuple:
+    """
+    The stake ladders of grind_1-5, scaled up when the first stake would be under the min stake.
+
+    :param strategy: The strategy, for its grinding_v2_grind_N_stakes_futures/spot settings.
+    :param slice_amount: The cost of the first entry.
+    :param leverage: The leverage of the trade.
+    :param min_stake: The corrected min stake.
+    :return tuple: The five ladders, lists of stake ratios.
+    """
+    stakes_key = (strategy.is_futures_mode, slice_amount, leverage, min_stake)
+    if self.stakes_key != stakes_key:
+      market = "futures" if strategy.is_futures_mode else "spot"
+      ladders = []
+      for grind in range(1, 6):
+        stakes = np.array(getattr(strategy, f"grinding_v2_grind_{grind}_stakes_{market}"), dtype=np.float64)
+        if (slice_amount * stakes[0] / (leverage if strategy.is_futures_mode else 1.0)) < min_stake:
+          stakes *= min_stake / slice_amount / stakes[0] * leverage
+        ladders.append(stakes.tolist())
+      self.stakes_key = stakes_key
+      self.stakes_value = tuple(ladders)
+    return self.stakes_value
+
+  def levels_at(self, exit_rate: float, fee_close: float) -> list:
+    """
+    The values of every level at the exit rate, in the order of GrindState.levels.
+
+    :param exit_rate: The exit rate.
+    :param fee_close: The close fee of the trade.
+    :return list: Per level (sub-grind count, total amount, open rate, open stake profit, exit found, entry order
+      ids, entry orders, distance from the last entry, distance from the exit).
+    """
+    levels = []
+    for level, count in enumerate(self.counts):
+      stake_profit = 0.0
+      distance_ratio = 0.0
+      if count > 0:
+        stake_profit = self.amounts[level] * exit_rate * (1 - fee_close) - self.costs[level]
+        distance_ratio = (exit_rate - self.last_entry_prices[level]) / self.last_entry_prices[level]
+      exit_distance_ratio = 0.0
+      if self.has_exit_price[level]:
+        exit_distance_ratio = (exit_rate - self.exit_prices[level]) / self.exit_prices[level]
+      levels.append(
+        (
+          count,
+          self.amounts[level],
+          self.open_rates[level],
+          stake_profit,
+          self.is_exit_found[level],
+          self.buy_orders[level],
+          self.orders[level],
+          distance_ratio,
+          exit_distance_ratio,
+        )
+      )
+    return levels
+
+
+# Trade Mode Classes
+# ---------------------------------------------------------------------------------------------
+class TradeModes:
+  """
+  Mode classification of one enter_tag value. any_of/all_of answer any(c in <modes tags> for c in enter_tags)
+  and all(c in <modes tags> for c in enter_tags), with the answers memoized per combination of modes.
+  """
+
+  __slots__ = ("table", "tags", "results")
+
+  def __init__(self, table, enter_tag: str):
+    self.table = table
+    self.tags = frozenset(enter_tag.split())
+    self.results = {}
+
+  def any_of(self, *modes) -> bool:
+    key = ("any",) + modes
+    result = self.results.get(key)
+    if result is None:
+      result = self.results[key] = not self.tags.isdisjoint(self.table.tags(modes))
+    return result
+
+  def all_of(self, *modes) -> bool:
+    key = ("all",) + modes
+    result = self.results.get(key)
+    if result is None:
+      result = self.results[key] = self.tags <= self.table.tags(modes)
+    return result
+
+
+class TradeModeTable:
+  """
+  Frozensets of the <mode>_mode_tags lists of the strategy ("long_rebuy" -> long_rebuy_mode_tags) and the
+  memoized TradeModes of every enter_tag value seen.
+  """
+
+  def __init__(self, strategy):
+    self.strategy = strategy
+    self.mode_tags = {}
+    self.trade_modes = {}
+
+  def tags(self, modes) -> frozenset:
+    tags = self.mode_tags.get(modes)
+    if tags is None:
+      tags = self.mode_tags[modes] = frozenset().union(
+        *(getattr(self.strategy, f"{mode}_mode_tags") for mode in modes)
+      )
+    return tags
+
+  def classify(self, enter_tag: str) -> TradeModes:
+    trade_modes = self.trade_modes.get(enter_tag)
+    if trade_modes is None:
+      trade_modes = self.trade_modes[enter_tag] = TradeModes(self, enter_tag)
+    return trade_modes
+
+
+# Open Trades Snapshot Class
+# ---------------------------------------------------------------------------------------------
+class OpenTradesSnapshot:
+  """
+  The open trades as of the start of a bot loop, with their counts by direction and by mode ("long_grind" counts the
+  trades whose enter_tag is all long_grind_mode_tags). Read by the hooks of the loop instead of querying the trades
+  per pair; the entries confirmed during the loop are added, so the slot limits keep holding until the next snapshot.
+  """
+
+  modes = ("grind", "top_coins", "scalp", "rebuy")
+
+  def __init__(self, trade_mode_table: TradeModeTable, trades):
+    self.trade_mode_table = trade_mode_table
+    self.trades = list(trades)
+    # Trade id and pair -> open trade
+    self.by_key = {}
+    self.count = 0
+    self.direction_counts = {"long": 0, "short": 0}
+    self.mode_counts = {f"{direction}_{mode}": 0 for direction in ("long", "short") for mode in self.modes}
+    for trade in self.trades:
+      self.by_key[trade.id] = self.by_key[trade.pair] = trade
+      self.add(trade.trade_direction, trade.enter_tag)
+
+  def add(self, direction: str, enter_tag: Optional[str]):
+    """
+    Counts one more open trade.
+
+    :param direction: "long" or "short"
+    :param enter_tag: The enter_tag of the trade, the trades without one are not counted in any mode.
+    """
+    self.count += 1
+    self.direction_counts[direction] += 1
+    if enter_tag is not None:
+      trade_modes = self.trade_mode_table.classify(enter_tag)
+      for mode in self.mode_counts:
+        if trade_modes.all_of(mode):
+          self.mode_counts[mode] += 1
+
+
+# Candle Snapshot Classes
+# ---------------------------------------------------------------------------------------------
+class CandleColumns(dict):
+  """
+  Column name -> NumPy array of a dataframe, converted on first use and shared by the candle snapshots.
+  """
+
+  __slots__ = ("df",)
+
+  def __init__(self, df: DataFrame):
+    super().__init__()
+    self.df = df
+
+  def __missing__(self, column):
+    values = self[column] = self.df[column].to_numpy()
+    return values
+
+
+class CandleSnapshot:
+  """
+  One dataframe row, read by label like the df.iloc[position] Series it replaces at a fraction of the cost.
+  The values keep their NumPy scalar types, so the isinstance(..., np.float64) checks behave the same.
+  """
+
+  __slots__ = ("columns", "position")
+
+  def __init__(self, columns: CandleColumns, position: int):
+    self.columns = columns
+    self.position = position
+
+  def __getitem__(self, column):
+    return self.columns[column][self.position]
+
+  @classmethod
+  def from_dataframe(cls, df: DataFrame, positions) -> list:
+    """
+    Snapshots of the rows at the given positions, sharing the column arrays.
+
+    :param df: The dataframe.
+    :param positions: The row positions, as accepted by df.iloc.
+    :return list: One CandleSnapshot per position.
+    """
+    columns = CandleColumns(df)
+    return [cls(columns, position) for position in positions]
+
+
+# Incremental EMA (TA-Lib semantics, seeded with the SMA of the first values)
+# ---------------------------------------------------------------------------------------------
+class IncrementalEma:
+  def __init__(self, length: int):
+    self.length = length
+    self.k = 2.0 / (length + 1)
+    self.seed = []
+    self.value = np.nan
+
+  def update(self, x: float) -> float:
+    if self.seed is not None:
+      if x != x:
+        return np.nan
+      self.seed.append(x)
+      if len(self.seed) < self.length:
+        return np.nan
+      total = 0.0
+      for value in self.seed:
+        total += value
+      self.value = total / self.length
+      self.seed = None
+      return self.value
+    self.value = ((x - self.value) * self.k) + self.value
+    return self.value
+
+
+# Incremental SMA (TA-Lib semantics, running period total)
+# ---------------------------------------------------------------------------------------------
+class IncrementalSma:
+  def __init__(self, length: int):
+    self.length = length
+    self.window = deque()
+    self.total = 0.0
+
+  def update(self, x: float) -> float:
+    if not self.window and x != x:
+      return np.nan
+    self.window.append(x)
+    self.total += x
+    if len(self.window) < self.length:
+      return np.nan
+    value = self.total / self.length
+    self.total -= self.window.popleft()
+    return value
+
+
+# Incremental RSI (TA-Lib semantics, Wilder smoothing)
+# ---------------------------------------------------------------------------------------------
+class IncrementalRsi:
+  def __init__(self, length: int):
+    self.length = length
+    self.prev = None
+    self.count = 0
+    self.gain = 0.0
+    self.loss = 0.0
+
+  def update(self, x: float) -> float:
+    if self.prev is None:
+      if x == x:
+        self.prev = x
+      return np.nan
+    diff = x - self.prev
+    self.prev = x
+    self.count += 1
+    if self.count > self.length:
+      self.gain *= self.length - 1
+      self.loss *= self.length - 1
+    if diff < 0:
+      self.loss -= diff
+    else:
+      self.gain += diff
+    if self.count < self.length:
+      return np.nan
+    self.gain /= self.length
+    self.loss /= self.length
+    total = self.gain + self.loss
+    if -0.00000001 < total < 0.00000001:
+      return 0.0
+    return 100.0 * (self.gain / total)
+
+
+# Incremental Rolling Window (pandas semantics, NaN until the window is full of valid values)
+# ---------------------------------------------------------------------------------------------
+class IncrementalRolling:
+  def __init__(self, length: int):
+    self.length = length
+    self.window = deque(maxlen=length)
+
+  def update(self, x: float) -> bool:
+    self.window.append(x)
+    return len(self.window) == self.length and not any(v != v for v in self.window)
+
+  def sum(self, x: float) -> float:
+    return math.fsum(self.window) if self.update(x) else np.nan
+
+  def mean(self, x: float) -> float:
+    return math.fsum(self.window) / self.length if self.update(x) else np.nan
+
+  def max(self, x: float) -> float:
+    return max(self.window) if self.update(x) else np.nan
+
+  def min(self, x: float) -> float:
+    return min(self.window) if self.update(x) else np.nan
+
+
+# Incremental Indicators Class
+# ---------------------------------------------------------------------------------------------
+class IncrementalIndicators:
+  """
+  Append-only indicator state for the base timeframe of one pair.
+
+  Keeps the EMA/RSI/Wilder accumulators and the rolling windows behind the base_tf_5m_indicators
+  columns, so a newly closed candle is folded in with O(1) work instead of a full recompute. The
+  values follow the TA-Lib (through pandas_ta) and pandas rolling implementations of the full path.
+  """
+
+  rsi_lengths = (3, 4, 14, 20)
+  ema_lengths = (3, 9, 12, 16, 20, 26, 50, 100, 200)
+  sma_lengths = (9, 16, 21, 30, 200)
+  columns = (
+    ["RSI_3", "RSI_4", "RSI_14", "RSI_20", "RSI_3_change_pct", "RSI_14_change_pct"]
+    + [f"EMA_{length}" for length in ema_lengths]
+    + [f"SMA_{length}" for length in sma_lengths]
+    + ["BBL_20_2.0", "BBM_20_2.0", "BBU_20_2.0", "BBB_20_2.0", "BBP_20_2.0"]
+    + ["MFI_14", "CMF_20", "WILLR_14", "WILLR_480", "AROONU_14", "AROOND_14"]
+    + ["STOCHRSIk_14_14_3_3", "STOCHRSId_14_14_3_3", "KST_10_15_20_30_10_10_10_15", "KSTs_9"]
+    + ["OBV", "OBV_change_pct", "ROC_2", "ROC_9", "change_pct"]
+    + ["close_max_12", "close_max_48", "close_min_12", "close_min_48", "num_empty_288"]
+  )
+
+  def __init__(self):
+    self.dates = None
+    self.values = None
+    self.last_close = None
+    self.rsi = {length: IncrementalRsi(length) for length in self.rsi_lengths}
+    self.ema = {length: IncrementalEma(length) for length in self.ema_lengths}
+    self.sma = {length: IncrementalSma(length) for length in self.sma_lengths}
+    # BB 20 - STD2
+    self.bb_mid = IncrementalSma(20)
+    self.bb_squares = IncrementalSma(20)
+    # MFI
+    self.mfi_prev_typical = None
+    self.mfi_flows = deque(maxlen=14)
+    # CMF
+    self.cmf_ad = IncrementalRolling(20)
+    self.cmf_volume = IncrementalRolling(20)
+    # Williams %R
+    self.willr_high = {length: IncrementalRolling(length) for length in (14, 480)}
+    self.willr_low = {length: IncrementalRolling(length) for length in (14, 480)}
+    # AROON
+    self.aroon_highs = deque(maxlen=15)
+    self.aroon_lows = deque(maxlen=15)
+    # Stochastic RSI
+    self.stochrsi_max = IncrementalRolling(14)
+    self.stochrsi_min = IncrementalRolling(14)
+    self.stochrsi_k = IncrementalSma(3)
+    self.stochrsi_d = IncrementalSma(3)
+    # KST
+    self.kst_rocma = {
+      roc_length: IncrementalRolling(sma_length) for roc_length, sma_length in ((10, 10), (15, 10), (20, 10), (30, 15))
+    }
+    self.kst_signal = IncrementalRolling(9)
+    # OBV
+    self.obv = None
+    # ROC
+    self.closes = deque(maxlen=31)
+    # Close max/min
+    self.close_max = {length: IncrementalRolling(length) for length in (12, 48)}
+    self.close_min = {length: IncrementalRolling(length) for length in (12, 48)}
+    # Number of empty candles
+    self.empty_candles = IncrementalRolling(288)
+
+    self.last = dict.fromkeys(self.columns, np.nan)
+
+  def update(self, open_: float, high: float, low: float, close: float, volume: float) -> dict:
+    row = {}
+    prev = self.last
+    # RSI
+    for length in self.rsi_lengths:
+      row[f"RSI_{length}"] = self.rsi[length].update(close)
+    row["RSI_3_change_pct"] = ((np.float64(row["RSI_3"]) - prev["RSI_3"]) / prev["RSI_3"]) * 100.0
+    row["RSI_14_change_pct"] = ((np.float64(row["RSI_14"]) - prev["RSI_14"]) / prev["RSI_14"]) * 100.0
+    # EMA
+    for length in self.ema_lengths:
+      row[f"EMA_{length}"] = self.ema[length].update(close)
+    for length in (100, 200):
+      if row[f"EMA_{length}"] != row[f"EMA_{length}"]:
+        row[f"EMA_{length}"] = 0.0
+    # SMA
+    for length in self.sma_lengths:
+      row[f"SMA_{length}"] = self.sma[length].update(close)
+    # BB 20 - STD2
+    bb_mid = self.bb_mid.update(close)
+    bb_variance = self.bb_squares.update(close * close) - (bb_mid * bb_mid)
+    bb_dev = (math.sqrt(bb_variance) if not bb_variance < 0.00000001 else 0.0) * 2.0
+    row["BBL_20_2.0"] = bb_mid - bb_dev
+    row["BBM_20_2.0"] = bb_mid
+    row["BBU_20_2.0"] = bb_mid + bb_dev
+    bb_range = (row["BBU_20_2.0"] - row["BBL_20_2.0"]) or np.finfo(float).eps
+    row["BBB_20_2.0"] = 100 * bb_range / bb_mid
+    row["BBP_20_2.0"] = ((close - row["BBL_20_2.0"]) or np.finfo(float).eps) / bb_range
+    # MFI
+    typical = ((high + low) + close) / 3.0
+    if self.mfi_prev_typical is None:
+      row["MFI_14"] = np.nan
+    else:
+      flow = typical * volume
+      diff = typical - self.mfi_prev_typical
+      self.mfi_flows.append((flow if diff > 0 else 0.0, flow if diff < 0 else 0.0))
+      if len(self.mfi_flows) < 14:
+        row["MFI_14"] = np.nan
+      else:
+        pos_flow = math.fsum(flow[0] for flow in self.mfi_flows)
+        neg_flow = math.fsum(flow[1] for flow in self.mfi_flows)
+        row["MFI_14"] = 0.0 if (pos_flow + neg_flow) < 1.0 else 100.0 * (pos_flow / (pos_flow + neg_flow))
+    self.mfi_prev_typical = typical
+    # CMF
+    cmf_ad = (2 * close - (high + low)) * (volume / ((high - low) or np.finfo(float).eps))
+    row["CMF_20"] = np.float64(self.cmf_ad.sum(cmf_ad)) / self.cmf_volume.sum(volume)
+    # Williams %R
+    for length in (14, 480):
+      highest = self.willr_high[length].max(high)
+      lowest = self.willr_low[length].min(low)
+      willr_range = (highest - lowest) / (-100.0)
+      row[f"WILLR_{length}"] = (highest - close) / willr_range if willr_range != 0.0 else 0.0
+    # AROON
+    self.aroon_highs.append(high)
+    self.aroon_lows.append(low)
+    if len(self.aroon_highs) < 15:
+      row["AROONU_14"] = np.nan
+      row["AROOND_14"] = np.nan
+    else:
+      highest_idx = max(range(15), key=lambda i: (self.aroon_highs[i], i))
+      lowest_idx = min(range(15), key=lambda i: (self.aroon_lows[i], -i))
+      row["AROONU_14"] = (100.0 / 14) * (14 - (14 - highest_idx))
+      row["AROOND_14"] = (100.0 / 14) * (14 - (14 - lowest_idx))
+    # Stochastic RSI
+    stochrsi_rsi = row["RSI_14"]
+    highest_rsi = self.stochrsi_max.max(stochrsi_rsi)
+    lowest_rsi = self.stochrsi_min.min(stochrsi_rsi)
+    stoch = 100 * (stochrsi_rsi - lowest_rsi) / ((highest_rsi - lowest_rsi) or np.finfo(float).eps)
+    row["STOCHRSIk_14_14_3_3"] = self.stochrsi_k.update(stoch)
+    row["STOCHRSId_14_14_3_3"] = self.stochrsi_d.update(row["STOCHRSIk_14_14_3_3"])
+    # ROC
+    self.closes.append(close)
+    rocs = {}
+    for length in (2, 9, 10, 15, 20, 30):
+      if len(self.closes) <= length:
+        rocs[length] = np.nan
+      else:
+        prev_close = self.closes[-1 - length]
+        rocs[length] = ((close / prev_close) - 1.0) * 100.0 if prev_close != 0.0 else 0.0
+    # KST
+    rocma = {length: self.kst_rocma[length].mean(rocs[length]) for length in self.kst_rocma}
+    row["KST_10_15_20_30_10_10_10_15"] = 100 * (rocma[10] + 2 * rocma[15] + 3 * rocma[20] + 4 * rocma[30])
+    row["KSTs_9"] = self.kst_signal.mean(row["KST_10_15_20_30_10_10_10_15"])
+    # OBV
+    if self.obv is None:
+      self.obv = volume
+    elif close > self.closes[-2]:
+      self.obv += volume
+    elif close < self.closes[-2]:
+      self.obv -= volume
+    row["OBV"] = self.obv
+    row["OBV_change_pct"] = ((np.float64(row["OBV"]) - prev["OBV"]) / abs(prev["OBV"])) * 100.0
+    row["ROC_2"] = rocs[2]
+    row["ROC_9"] = rocs[9]
+    # Candle change
+    row["change_pct"] = (close - open_) / open_ * 100.0
+    # Close max/min
+    for length in (12, 48):
+      row[f"close_max_{length}"] = self.close_max[length].max(close)
+    for length in (12, 48):
+      row[f"close_min_{length}"] = self.close_min[length].min(close)
+    # Number of empty candles
+    row["num_empty_288"] = self.empty_candles.sum(1.0 if volume <= 0 else 0.0)
+
+    self.last = row
+    return row
+
+  @classmethod
+  def from_dataframe(cls, df: DataFrame) -> "IncrementalIndicators":
+    """
+    Seeds the state from a fully computed dataframe.
+
+    The accumulators are rebuilt by replaying the candles, the indicator values are taken from the full compute.
+
+    :param df: DataFrame with the candles and the base timeframe indicators.
+    :return IncrementalIndicators: The seeded state.
+    """
+    state = cls()
+    with np.errstate(divide="ignore", invalid="ignore"):
+      for candle in zip(
+        df["open"].tolist(), df["high"].tolist(), df["low"].tolist(), df["close"].tolist(), df["volume"].tolist()
+      ):
+        state.update(*candle)
+    state.dates = df["date"].values.copy()
+    state.values = {column: df[column].to_numpy(dtype=np.float64, copy=True) for column in cls.columns}
+    state.last = {column: state.values[column][-1] for column in cls.columns} if len(df) > 0 else state.last
+    state.last_close = df["close"].iat[-1] if len(df) > 0 else None
+    return state
+
+  def extend(self, df: DataFrame) -> bool:
+    """
+    Extends the state with the candles of df that closed since the last call.
+
+    :param df: DataFrame with the candles, the already known candles must match the state.
+    :return bool: False if df is not an append-only continuation of the state (a full recompute is needed).
+    """
+    dates = df["date"].values
+    if self.dates is None or len(self.dates) == 0 or len(dates) == 0:
+      return False
+    start = np.searchsorted(self.dates, dates[0])
+    overlap = len(self.dates) - start
+    if overlap <= 0 or overlap > len(dates) or not np.array_equal(self.dates[start:], dates[:overlap]):
+      return False
+    if df["close"].iat[overlap - 1] != self.last_close:
+      return False
+
+    new_candles = df.iloc[overlap:]
+    rows = []
+    with np.errstate(divide="ignore", invalid="ignore"):
+      for candle in zip(
+        new_candles["open"].tolist(),
+        new_candles["high"].tolist(),
+        new_candles["low"].tolist(),
+        new_candles["close"].tolist(),
+        new_candles["volume"].tolist(),
+      ):
+        rows.append(self.update(*candle))
+
+    self.dates = dates.copy()
+    for column in self.columns:
+      self.values[column] = np.concatenate(
+        (self.values[column][start:], np.array([row[column] for row in rows], dtype=np.float64))
+      )
+    # OBV is cumulative from the first candle of the window, re-anchor it when the window slides
+    obv = self.values["OBV"]
+    obv_offset = obv[0] - df["volume"].iat[0]
+    if obv_offset != 0.0:
+      obv -= obv_offset
+      self.obv -= obv_offset
+      obv_change_pct = np.full(len(obv), np.nan)
+      with np.errstate(divide="ignore", invalid="ignore"):
+        obv_change_pct[1:] = ((obv[1:] - obv[:-1]) / np.abs(obv[:-1])) * 100.0
+      self.values["OBV_change_pct"] = obv_change_pct
+      self.last = {**self.last, "OBV": obv[-1], "OBV_change_pct": obv_change_pct[-1]}
+    self.last_close = df["close"].iat[-1]
+    return True
+
+  def dataframe(self, index) -> DataFrame:
+    return DataFrame({column: self.values[column] for column in self.columns}, index=index)
+
+
+# Entry Conditions Engine Class
+# ---------------------------------------------------------------------------------------------
+class EntryConditionsEngine:
+  """
+  Compiles the long/short entry conditions of populate_entry_trend into NumPy functions.
+
+  The conditions stay written in populate_entry_trend, the engine parses its source once and turns every
+  `if <side>_entry_condition_index == N:` block into a function over the column arrays. Every comparison,
+  arithmetic or method sub-expression is memoized by its source text for the whole call, so the ones shared
+  between conditions (protections_long_global, the RSI_3 guards, ...) are only evaluated once. Blocks with
+  anything else than plain appends of column expressions keep running the original pandas code.
+  """
+
+  class Unsupported(Exception):
+    pass
+
+  sides = (
+    ("long", "long_entry_signal_params", "long_entry_condition_index", "long_entry_logic"),
+    ("short", "short_entry_signal_params", "short_entry_condition_index", "short_entry_logic"),
+  )
+  column_methods = ("shift", "notna", "fillna", "infer_objects")
+  # The keyword arguments the column helpers implement, calls with any other keyword run as written
+  column_method_keywords = {"shift": ("periods",), "fillna": ("value",)}
+
+  def __init__(self, populate_entry_trend):
+    source = textwrap.dedent(inspect.getsource(populate_entry_trend))
+    self.namespace = dict(populate_entry_trend.__globals__)
+    self.namespace.update(
+      {
+        "_memo": self._memo,
+        "_shift": self._shift,
+        "_notna": self._notna,
+        "_fillna": self._fillna,
+      }
+    )
+    self.conditions = {side: {} for side, *_ in self.sides}
+    self.num_compiled = 0
+    self.num_fallback = 0
+    for node in ast.walk(ast.parse(source)):
+      if not (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)):
+        continue
+      test = node.test
+      if not (
+        isinstance(test.left, ast.Name)
+        and len(test.ops) == 1
+        and isinstance(test.ops[0], ast.Eq)
+        and isinstance(test.comparators[0], ast.Constant)
+      ):
+        continue
+      for side, _, index_name, logic_name in self.sides:
+        if test.left.id == index_name:
+          self.conditions[side][test.comparators[0].value] = self._compile(
+            node.body, logic_name, f"{side}_{test.comparators[0].value}"
+          )
+
+  # Compilation
+  # ---------------------------------------------------------------------------------------------
+  def _compile(self, body, logic_name, name):
+    fallback = self._build(
+      body, logic_name, f"_fallback_{name}", ["_ctx"], _ContextNames(logic_name, self.namespace)
+    )
+    if not all(self._is_append(statement, logic_name) for statement in body):
+      self.num_fallback += 1
+      return (None, fallback)
+    compiled = self._build(
+      body, logic_name, f"_compiled_{name}", ["_col", "_m", "_ctx"], _ColumnExpressions(logic_name, self.namespace)
+    )
+    self.num_compiled += 1
+    return (compiled, fallback)
+
+  def _build(self, body, logic_name, func_name, args, transformer):
+    statements = [transformer.visit(copy.deepcopy(statement)) for statement in body]
+    func = ast.FunctionDef(
+      name=func_name,
+      args=ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=arg) for arg in args],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+      ),
+      body=(
+        [ast.Assign(targets=[ast.Name(id=logic_name, ctx=ast.Store())], value=ast.List(elts=[], ctx=ast.Load()))]
+        + statements
+        + [ast.Return(value=ast.Name(id=logic_name, ctx=ast.Load()))]
+      ),
+      decorator_list=[],
+      returns=None,
+      type_params=[],
+    )
+    module = ast.fix_missing_locations(ast.Module(body=[func], type_ignores=[]))
+    exec(compile(module, f"<{func_name}>", "exec"), self.namespace)
+    return self.namespace[func_name]
+
+  def _is_append(self, statement, logic_name) -> bool:
+    return (
+      isinstance(statement, ast.Expr)
+      and isinstance(statement.value, ast.Call)
+      and isinstance(statement.value.func, ast.Attribute)
+      and statement.value.func.attr == "append"
+      and isinstance(statement.value.func.value, ast.Name)
+      and statement.value.func.value.id == logic_name
+      and len(statement.value.args) == 1
+      and not statement.value.keywords
+      and self._is_column_expression(statement.value.args[0])
+    )
+
+  @classmethod
+  def _is_column_expression(cls, node) -> bool:
+    if isinstance(node, ast.Constant):
+      return True
+    if isinstance(node, ast.Name):
+      return node.id != "df"
+    if isinstance(node, ast.Attribute):
+      return isinstance(node.value, ast.Name) and node.value.id in ("self", "np")
+    if isinstance(node, ast.Subscript):
+      return (
+        isinstance(node.value, ast.Name)
+        and node.value.id == "df"
+        and isinstance(node.slice, ast.Constant)
+        and isinstance(node.slice.value, str)
+      )
+    if isinstance(node, ast.BinOp):
+      return cls._is_column_expression(node.left) and cls._is_column_expression(node.right)
+    if isinstance(node, ast.UnaryOp):
+      return cls._is_column_expression(node.operand)
+    if isinstance(node, ast.Compare):
+      return (
+        len(node.ops) == 1 and cls._is_column_expression(node.left) and cls._is_column_expression(node.comparators[0])
+      )
+    if isinstance(node, ast.Call):
+      return (
+        isinstance(node.func, ast.Attribute)
+        and node.func.attr in cls.column_methods
+        and cls._is_column_expression(node.func.value)
+        and all(cls._is_column_expression(arg) for arg in node.args)
+        and all(
+          keyword.arg in cls.column_method_keywords.get(node.func.attr, ()) and cls._is_column_expression(keyword.value)
+          for keyword in node.keywords
+        )
+      )
+    return False
+
+  # Column helpers (pandas semantics on NumPy arrays)
+  # ---------------------------------------------------------------------------------------------
+  @staticmethod
+  def _memo(memo, key, value):
+    memo[key] = value
+    return value
+
+  @staticmethod
+  def _shift(values, periods=1):
+    if values.dtype.kind == "b":
+      raise EntryConditionsEngine.Unsupported()
+    if values.dtype.kind != "f":
+      values = values.astype(np.float64)
+    shifted = np.empty_like(values)
+    if periods >= 0:
+      shifted[:periods] = np.nan
+      shifted[periods:] = values[: len(values) - periods]
+    else:
+      shifted[periods:] = np.nan
+      shifted[:periods] = values[-periods:]
+    return shifted
+
+  @staticmethod
+  def _notna(values):
+    if values.dtype.kind != "f":
+      return np.ones(len(values), dtype=bool)
+    return ~np.isnan(values)
+
+  @staticmethod
+  def _fillna(values, value):
+    if values.dtype.kind != "f":
+      return values
+    return np.where(np.isnan(values), value, values)
+
+  # Evaluation
+  # ---------------------------------------------------------------------------------------------
+  def populate(self, strategy, df: DataFrame, ctx: dict) -> DataFrame:
+    """
+    Fills enter_long, enter_short and enter_tag exactly like the loops of populate_entry_trend.
+
+    :param strategy: The strategy instance.
+    :param df: The dataframe, with enter_tag/enter_long/enter_short already reset.
+    :param ctx: The local variables of populate_entry_trend (free slots, grind mode counts, ...).
+    :return DataFrame: The dataframe with the entry columns set.
+    """
+    columns = {}
+
+    def column(name):
+      values = columns.get(name)
+      if values is None:
+        series = df[name]
+        if series.dtype.kind not in "biuf":
+          raise EntryConditionsEngine.Unsupported()
+        values = columns[name] = series.to_numpy()
+      return values
+
+    memo = {}
+    num_rows = len(df)
+    tags = np.full(num_rows, "", dtype=object)
+    volume_ok = df["volume"].to_numpy() > 0
+    for side, params_name, _, _ in self.sides:
+      side_conditions = []
+      params = getattr(strategy, params_name)
+      for enabled_entry_signal in params:
+        entry_condition_index = int(enabled_entry_signal.split("_")[3])
+        if not params[f"{enabled_entry_signal}"]:
+          continue
+        item_entry = self._evaluate(side, entry_condition_index, column, memo, ctx, df, volume_ok)
+        tags[item_entry] += f"{entry_condition_index} "
+        side_conditions.append(item_entry)
+      if side_conditions:
+        df.loc[:, f"enter_{side}"] = pd.Series(reduce(lambda x, y: x | y, side_conditions), index=df.index)
+
+    df.loc[:, "enter_tag"] = tags
+    return df
+
+  def _evaluate(self, side, entry_condition_index, column, memo, ctx, df, volume_ok):
+    compiled, fallback = self.conditions[side].get(entry_condition_index, (None, None))
+    if compiled is not None:
+      try:
+        with np.errstate(all="ignore"):
+          entry_logic = compiled(column, memo, ctx)
+        item_entry = np.ones(len(df), dtype=bool)
+        for logic in entry_logic:
+          item_entry &= logic
+        return item_entry & volume_ok
+      except EntryConditionsEngine.Unsupported:
+        pass
+    entry_logic = [True] + (fallback(ctx) if fallback is not None else []) + [df["volume"] > 0]
+    item_entry = reduce(lambda x, y: x & y, entry_logic)
+    return item_entry.reindex(df.index, fill_value=False).to_numpy(dtype=bool)
+
+
+class _ContextNames(ast.NodeTransformer):
+  """
+  Resolves the local variables of populate_entry_trend (df, self, free slots, ...) through the _ctx dict.
+  """
+
+  def __init__(self, logic_name, namespace):
+    self.logic_name = logic_name
+    self.namespace = namespace
+
+  def visit_Name(self, node):
+    if node.id == self.logic_name or node.id in self.namespace or hasattr(builtins, node.id):
+      return node
+    return ast.copy_location(
+      ast.Subscript(value=ast.Name(id="_ctx", ctx=ast.Load()), slice=ast.Constant(value=node.id), ctx=node.ctx),
+      node,
+    )
+
+
+class _ColumnExpressions(_ContextNames):
+  """
+  Lowers the column expressions to NumPy: df["col"] reads the column array, the pandas methods map to the
+  engine helpers and every non-boolean sub-expression is memoized by its source text.
+  """
+
+  def visit_Subscript(self, node):
+    if isinstance(node.value, ast.Name) and node.value.id == "df":
+      return ast.Call(func=ast.Name(id="_col", ctx=ast.Load()), args=[node.slice], keywords=[])
+    return self.generic_visit(node)
+
+  def visit_Compare(self, node):
+    key = ast.unparse(node)
+    return self._memoized(key, self.generic_visit(node))
+
+  def visit_BinOp(self, node):
+    if isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+      return self.generic_visit(node)
+    key = ast.unparse(node)
+    return self._memoized(key, self.generic_visit(node))
+
+  def visit_Call(self, node):
+    if not (isinstance(node.func, ast.Attribute) and node.func.attr in EntryConditionsEngine.column_methods):
+      return self.generic_visit(node)
+    key = ast.unparse(node)
+    values = self.visit(node.func.value)
+    args = [self.visit(arg) for arg in node.args]
+    keywords = [ast.keyword(arg=keyword.arg, value=self.visit(keyword.value)) for keyword in node.keywords]
+    if node.func.attr == "infer_objects":
+      lowered = values
+    else:
+      lowered = ast.Call(
+        func=ast.Name(id=f"_{node.func.attr}", ctx=ast.Load()), args=[values] + args, keywords=keywords
+      )
+    return self._memoized(key, lowered)
+
+  def _memoized(self, key, lowered):
+    return ast.IfExp(
+      test=ast.Compare(
+        left=ast.Constant(value=key), ops=[ast.In()], comparators=[ast.Name(id="_m", ctx=ast.Load())]
+      ),
+      body=ast.Subscript(value=ast.Name(id="_m", ctx=ast.Load()), slice=ast.Constant(value=key), ctx=ast.Load()),
+      orelse=ast.Call(
+        func=ast.Name(id="_memo", ctx=ast.Load()),
+        args=[ast.Name(id="_m", ctx=ast.Load()), ast.Constant(value=key), lowered],
+        keywords=[],
+      ),
+    )
+
+
+# Protections Bitmask Class
+# ---------------------------------------------------------------------------------------------
+class ProtectionsBitmask:
+  """
+  Evaluates the global protections as packed bitmasks.
+
+  The protections stay written in protections_indicators, every `df[name] = (clause) & (clause) & ...`
+  assignment gets its clauses lowered to NumPy (with the entry conditions memo, so a comparison shared by
+  several clauses is only evaluated once) and packed into uint64 words, bit N of <name>_mask_<N // 64> being
+  clause N. The boolean column is still set, true where all the bits are set, and the cleared bits tell which
+  clauses block a candle. Any other statement, or a column the clauses can't be lowered for, runs as written.
+  """
+
+  word_bits = 64
+
+  def __init__(self, protections_indicators):
+    source = textwrap.dedent(inspect.getsource(protections_indicators))
+    source_lines = source.split("\n")
+    self.protections_indicators = protections_indicators
+    self.namespace = dict(protections_indicators.__globals__)
+    self.namespace.update(
+      {
+        "_memo": EntryConditionsEngine._memo,
+        "_shift": EntryConditionsEngine._shift,
+        "_notna": EntryConditionsEngine._notna,
+        "_fillna": EntryConditionsEngine._fillna,
+      }
+    )
+    # Column -> clause descriptions
+    self.clauses = {}
+    # (column or None, function, written columns or None when unknown), in the order of protections_indicators
+    self.statements = []
+    function_node = ast.parse(source).body[0]
+    for num_statement, statement in enumerate(function_node.body):
+      if isinstance(statement, ast.Return):
+        continue
+      column = self._mask_column(statement)
+      if column is None:
+        function = self._build([statement], f"_protections_{num_statement}", ["self", "df"])
+        self.statements.append((None, function, self._written_columns(statement)))
+        continue
+      clauses = self._flatten(statement.value)
+      self.clauses[column] = [self._describe(clause, source_lines, num_clause) for num_clause, clause in enumerate(clauses)]
+      lowered = [_ColumnExpressions("df", self.namespace).visit(copy.deepcopy(clause)) for clause in clauses]
+      body = [ast.Return(value=ast.List(elts=lowered, ctx=ast.Load()))]
+      function = self._build(body, f"_protections_{num_statement}", ["_col", "_m", "_ctx"])
+      written = {column} | {f"{column}_mask_{num_word}" for num_word in range(len(self.full_words(len(clauses))))}
+      self.statements.append((column, function, frozenset(written)))
+
+  # Compilation
+  # ---------------------------------------------------------------------------------------------
+  def _mask_column(self, statement):
+    if not (
+      isinstance(statement, ast.Assign)
+      and len(statement.targets) == 1
+      and isinstance(statement.targets[0], ast.Subscript)
+      and isinstance(statement.targets[0].value, ast.Name)
+      and statement.targets[0].value.id == "df"
+      and isinstance(statement.targets[0].slice, ast.Constant)
+      and isinstance(statement.targets[0].slice.value, str)
+    ):
+      return None
+    clauses = self._flatten(statement.value)
+    if len(clauses) < 2 or not all(EntryConditionsEngine._is_column_expression(clause) for clause in clauses):
+      return None
+    return statement.targets[0].slice.value
+
+  @staticmethod
+  def _written_columns(statement):
+    # The df["name"] columns a statement sets, None when it does anything else
+    if isinstance(statement, ast.Assign):
+      targets = statement.targets
+    elif isinstance(statement, ast.AugAssign):
+      targets = [statement.target]
+    else:
+      return None
+    written = set()
+    for target in targets:
+      if not (
+        isinstance(target, ast.Subscript)
+        and isinstance(target.value, ast.Name)
+        and target.value.id == "df"
+        and isinstance(target.slice, ast.Constant)
+      ):
+        return None
+      written.add(target.slice.value)
+    return frozenset(written) if written else None
+
+  def _flatten(self, node):
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitAnd):
+      return self._flatten(node.left) + [node.right]
+    return [node]
+
+  @staticmethod
+  def _describe(clause, source_lines, num_clause) -> str:
+    # The comment lines right above the clause, past its opening parenthesis
+    line = clause.lineno - 2
+    while line >= 0 and source_lines[line].strip() in ("(", "& ("):
+      line -= 1
+    comments = []
+    while line >= 0 and source_lines[line].strip().startswith("#"):
+      comments.insert(0, source_lines[line].strip().lstrip("#").strip())
+      line -= 1
+    return " ".join(comments) if comments else f"clause {num_clause}"
+
+  def _build(self, body, func_name, args):
+    func = ast.FunctionDef(
+      name=func_name,
+      args=ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=arg) for arg in args],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+      ),
+      body=body,
+      decorator_list=[],
+      returns=None,
+      type_params=[],
+    )
+    module = ast.fix_missing_locations(ast.Module(body=[func], type_ignores=[]))
+    exec(compile(module, f"<{func_name}>", "exec"), self.namespace)
+    return self.namespace[func_name]
+
+  # Evaluation
+  # ---------------------------------------------------------------------------------------------
+  def populate(self, strategy, df: DataFrame) -> DataFrame:
+    """
+    Sets the protection columns exactly like protections_indicators, plus the <name>_mask_N words.
+
+    :param strategy: The strategy instance.
+    :param df: The dataframe with the indicators.
+    :return DataFrame: The dataframe with the protection columns set.
+    """
+    columns = {}
+
+    def column(name):
+      values = columns.get(name)
+      if values is None:
+        series = df[name]
+        if series.dtype.kind not in "biuf":
+          raise EntryConditionsEngine.Unsupported()
+        values = columns[name] = series.to_numpy()
+      return values
+
+    memo = {}
+    ctx = {"self": strategy, "df": df}
+    num_rows = len(df)
+    mask_columns = []
+    try:
+      # In the order of protections_indicators, a statement sees the columns the previous ones set
+      for name, function, written in self.statements:
+        if name is None:
+          function(strategy, df)
+        else:
+          with np.errstate(all="ignore"):
+            clauses = function(column, memo, ctx)
+            words = self.pack([np.broadcast_to(clause, num_rows) for clause in clauses])
+          protected = np.ones(num_rows, dtype=bool)
+          for num_word, full_word in enumerate(self.full_words(len(self.clauses[name]))):
+            df[f"{name}_mask_{num_word}"] = words[num_word]
+            mask_columns.append(f"{name}_mask_{num_word}")
+            protected &= words[num_word] == full_word
+          df[name] = protected
+        # An already read column was set again, the memoized sub-expressions can depend on it
+        if written is None or not written.isdisjoint(columns):
+          columns.clear()
+          memo.clear()
+    except EntryConditionsEngine.Unsupported:
+      # The statements only set columns, run them all again as written
+      df.drop(columns=mask_columns, inplace=True)
+      return self.protections_indicators(strategy, df)
+    return df
+
+  def pack(self, clauses: list) -> np.ndarray:
+    """
+    Packs the boolean clause arrays into uint64 words.
+
+    :param clauses: The boolean arrays, one per clause.
+    :return ndarray: (num words, num rows) uint64 array, bit N % 64 of word N // 64 set where clause N is true.
+    """
+    num_rows = len(clauses[0]) if clauses else 0
+    words = np.zeros((len(self.full_words(len(clauses))), num_rows), dtype=np.uint64)
+    for num_clause, clause in enumerate(clauses):
+      words[num_clause // self.word_bits] |= clause.astype(np.uint64) << np.uint64(num_clause % self.word_bits)
+    return words
+
+  def full_words(self, num_clauses: int) -> list:
+    """The value of each word when all of its clauses are true."""
+    full_words = []
+    for first_clause in range(0, num_clauses, self.word_bits):
+      num_bits = min(self.word_bits, num_clauses - first_clause)
+      full_words.append(np.uint64((1 << num_bits) - 1))
+    return full_words
+
+  def blocking_clauses(self, df: DataFrame, index: int = -1) -> dict:
+    """
+    The clauses that are false on a candle.
+
+    :param df: The dataframe, with the mask words populated.
+    :param index: The (positional) candle index.
+    :return dict: Protection column -> descriptions of its false clauses, only for the columns that are false.
+    """
+    blocking = {}
+    for name, descriptions in self.clauses.items():
+      if f"{name}_mask_0" not in df.columns or df[name].iat[index]:
+        continue
+      blocking[name] = [
+        description
+        for num_clause, description in enumerate(descriptions)
+        if not (int(df[f"{name}_mask_{num_clause // self.word_bits}"].iat[index]) >> (num_clause % self.word_bits)) & 1
+      ]
+    return blocking
+
+
+# Exit Signals Table Class
+# ---------------------------------------------------------------------------------------------
+class ExitSignalsTable:
+  """
+  Backtest precomputation of the candle-only exit chains (long/short_exit_signals, _main, _williams_r, _dec).
+
+  These functions only depend on the candles and on comparisons of current_profit with constants, so their
+  result is constant between two consecutive profit thresholds. The table parses each function once, evaluates
+  it over whole columns for one representative profit per bucket and stores, per candle, the id of the resulting
+  (bucket -> signal) pattern in a "<function>_precomputed" column. A trade then only needs the profit bucket and
+  one lookup on the candle.
+  """
+
+  class Unsupported(Exception):
+    pass
+
+  functions = {
+    "long": ("long_exit_signals", "long_exit_main", "long_exit_williams_r", "long_exit_dec"),
+    "short": ("short_exit_signals", "short_exit_main", "short_exit_williams_r", "short_exit_dec"),
+  }
+  candle_offsets = {
+    "last_candle": 0,
+    "previous_candle_1": 1,
+    "previous_candle_2": 2,
+    "previous_candle_3": 3,
+    "previous_candle_4": 4,
+    "previous_candle_5": 5,
+  }
+  compare_ops = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+  }
+  arithmetic_ops = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+  }
+
+  def __init__(self, strategy_class, sides):
+    # name -> (thresholds, program)
+    self.programs = {}
+    # name -> signal templates, index 0 is "no exit"
+    self.templates = {}
+    # name -> pattern registry, shared by all the pairs
+    self.pattern_ids = {}
+    self.patterns = {}
+    for side in sides:
+      for name in self.functions[side]:
+        source = textwrap.dedent(inspect.getsource(getattr(strategy_class, name)))
+        func = ast.parse(source).body[0]
+        self.templates[name] = [None]
+        thresholds = set()
+        try:
+          program = self._compile_block(func.body, name, thresholds)
+        except ExitSignalsTable.Unsupported:
+          log.warning(f"{name} can't be precomputed, it keeps running per trade.")
+          continue
+        self.programs[name] = (sorted(thresholds), program)
+        self.pattern_ids[name] = {}
+        self.patterns[name] = []
+
+  def column(self, name) -> str:
+    return f"{name}_precomputed"
+
+  # Compilation to a small tree of tuples
+  # ---------------------------------------------------------------------------------------------
+  def _compile_block(self, statements, name, thresholds) -> list:
+    program = []
+    for statement in statements:
+      if isinstance(statement, ast.If):
+        program.append(
+          (
+            "if",
+            self._compile_expr(statement.test, thresholds),
+            self._compile_block(statement.body, name, thresholds),
+            self._compile_block(statement.orelse, name, thresholds),
+          )
+        )
+      elif isinstance(statement, ast.Return):
+        program.append(("return", self._compile_return(statement.value, name)))
+      elif isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant):
+        continue
+      else:
+        raise ExitSignalsTable.Unsupported()
+    return program
+
+  def _compile_return(self, value, name) -> int:
+    if not (isinstance(value, ast.Tuple) and len(value.elts) == 2 and isinstance(value.elts[0], ast.Constant)):
+      raise ExitSignalsTable.Unsupported()
+    if value.elts[0].value is False:
+      return 0
+    signal = value.elts[1]
+    if not isinstance(signal, ast.JoinedStr):
+      raise ExitSignalsTable.Unsupported()
+    template = ""
+    for part in signal.values:
+      if isinstance(part, ast.Constant):
+        template += part.value.replace("{", "{{").replace("}", "}}")
+      elif (
+        isinstance(part, ast.FormattedValue)
+        and isinstance(part.value, ast.Name)
+        and part.value.id == "mode_name"
+        and part.conversion == -1
+        and part.format_spec is None
+      ):
+        template += "{mode_name}"
+      else:
+        raise ExitSignalsTable.Unsupported()
+    self.templates[name].append(template)
+    return len(self.templates[name]) - 1
+
+  def _compile_expr(self, node, thresholds):
+    if isinstance(node, ast.Constant):
+      return ("const", node.value)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+      return ("const", -node.operand.value)
+    if isinstance(node, ast.Name) and node.id == "current_profit":
+      return ("profit",)
+    if isinstance(node, ast.Subscript):
+      if (
+        isinstance(node.value, ast.Name)
+        and node.value.id in self.candle_offsets
+        and isinstance(node.slice, ast.Constant)
+        and isinstance(node.slice.value, str)
+      ):
+        return ("column", self.candle_offsets[node.value.id], node.slice.value)
+      raise ExitSignalsTable.Unsupported()
+    if isinstance(node, ast.BoolOp):
+      return (
+        "and" if isinstance(node.op, ast.And) else "or",
+        [self._compile_expr(value, thresholds) for value in node.values],
+      )
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+      return ("not", self._compile_expr(node.operand, thresholds))
+    if isinstance(node, ast.BinOp) and type(node.op) in self.arithmetic_ops:
+      if any(isinstance(child, ast.Name) and child.id == "current_profit" for child in ast.walk(node)):
+        raise ExitSignalsTable.Unsupported()
+      return (
+        "binop",
+        ast.unparse(node),
+        self.arithmetic_ops[type(node.op)],
+        self._compile_expr(node.left, thresholds),
+        self._compile_expr(node.right, thresholds),
+      )
+    if isinstance(node, ast.Compare) and all(type(op) in self.compare_ops for op in node.ops):
+      operands = [self._compile_expr(operand, thresholds) for operand in [node.left] + node.comparators]
+      if any(operand[0] == "profit" for operand in operands):
+        if not all(operand[0] in ("profit", "const") for operand in operands):
+          raise ExitSignalsTable.Unsupported()
+        thresholds.update(operand[1] for operand in operands if operand[0] == "const")
+      return ("compare", ast.unparse(node), [self.compare_ops[type(op)] for op in node.ops], operands)
+    if (
+      isinstance(node, ast.Call)
+      and isinstance(node.func, ast.Name)
+      and node.func.id == "isinstance"
+      and len(node.args) == 2
+      and ast.unparse(node.args[1]) == "np.float64"
+    ):
+      column = self._compile_expr(node.args[0], thresholds)
+      if column[0] != "column":
+        raise ExitSignalsTable.Unsupported()
+      return ("is_float64", column)
+    raise ExitSignalsTable.Unsupported()
+
+  # Vectorized evaluation
+  # ---------------------------------------------------------------------------------------------
+  def populate(self, df: DataFrame) -> DataFrame:
+    """
+    Adds the "<function>_precomputed" pattern id columns to the dataframe.
+
+    :param df: The dataframe with all the indicators.
+    :return DataFrame: The dataframe with the precomputed exit columns.
+    """
+    columns = {}
+    memo = {}
+    precomputed = {}
+    with np.errstate(all="ignore"):
+      for name, (thresholds, program) in self.programs.items():
+        codes = np.zeros((len(df), len(thresholds) * 2 + 1), dtype=np.int16)
+        try:
+          for bucket, profit in enumerate(self.bucket_profits(thresholds)):
+            bucket_codes = np.zeros(len(df), dtype=np.int16)
+            self._run(program, np.ones(len(df), dtype=bool), bucket_codes, profit, df, columns, memo)
+            codes[:, bucket] = bucket_codes
+        except ExitSignalsTable.Unsupported:
+          continue
+        # One opaque key per row, np.unique(axis=0) sorts the rows column by column and is several times slower
+        row_keys = codes.view(np.dtype((np.void, codes.dtype.itemsize * codes.shape[1]))).reshape(-1)
+        unique_keys, inverse = np.unique(row_keys, return_inverse=True)
+        unique_patterns = unique_keys.view(codes.dtype).reshape(-1, codes.shape[1])
+        pattern_ids = self.pattern_ids[name]
+        ids = np.empty(len(unique_patterns), dtype=np.int32)
+        for i, pattern in enumerate(map(tuple, unique_patterns.tolist())):
+          if pattern not in pattern_ids:
+            pattern_ids[pattern] = len(self.patterns[name])
+            self.patterns[name].append(pattern)
+          ids[i] = pattern_ids[pattern]
+        precomputed[self.column(name)] = ids[inverse.reshape(-1)]
+    return pd.concat([df, DataFrame(precomputed, index=df.index)], axis=1) if precomputed else df
+
+  @staticmethod
+  def bucket_profits(thresholds) -> list:
+    if not thresholds:
+      return [0.0]
+    profits = [thresholds[0] - 1.0]
+    for i, threshold in enumerate(thresholds):
+      profits.append(threshold)
+      profits.append((threshold + thresholds[i + 1]) / 2.0 if i + 1 < len(thresholds) else threshold + 1.0)
+    return profits
+
+  @staticmethod
+  def bucket(thresholds, profit) -> int:
+    i = bisect.bisect_left(thresholds, profit)
+    return 2 * i + 1 if (i < len(thresholds) and thresholds[i] == profit) else 2 * i
+
+  def _run(self, program, active, codes, profit, df, columns, memo):
+    for statement in program:
+      if not active.any():
+        break
+      if statement[0] == "return":
+        codes[active] = statement[1]
+        active = np.zeros(len(active), dtype=bool)
+        continue
+      _, test, body, orelse = statement
+      test = self._truth(self._eval(test, profit, df, columns, memo))
+      if test is True or test is False:
+        active = self._run(body if test else orelse, active, codes, profit, df, columns, memo)
+      else:
+        active = self._run(body, active & test, codes, profit, df, columns, memo) | self._run(
+          orelse, active & ~test, codes, profit, df, columns, memo
+        )
+    return active
+
+  def _truth(self, value):
+    if isinstance(value, np.ndarray):
+      return value if value.dtype == bool else (value != 0)
+    return bool(value)
+
+  def _eval(self, node, profit, df, columns, memo):
+    kind = node[0]
+    if kind == "const":
+      return node[1]
+    if kind == "profit":
+      return profit
+    if kind == "column":
+      _, offset, column = node
+      values = columns.get((offset, column))
+      if values is None:
+        values = df[column].to_numpy()
+        if values.dtype.kind not in "biuf":
+          raise ExitSignalsTable.Unsupported()
+        if offset > 0:
+          values = self._shift(values, offset)
+        columns[(offset, column)] = values
+      return values
+    if kind == "and":
+      result = True
+      for value in node[1]:
+        value = self._truth(self._eval(value, profit, df, columns, memo))
+        if value is False:
+          return False
+        result = value if result is True else (result & value if value is not True else result)
+      return result
+    if kind == "or":
+      result = False
+      for value in node[1]:
+        value = self._truth(self._eval(value, profit, df, columns, memo))
+        if value is True:
+          return True
+        result = value if result is False else (result | value if value is not False else result)
+      return result
+    if kind == "not":
+      value = self._truth(self._eval(node[1], profit, df, columns, memo))
+      return (not value) if isinstance(value, bool) else ~value
+    if kind == "is_float64":
+      values = self._eval(node[1], profit, df, columns, memo)
+      return values.dtype == np.float64
+    # binop / compare, memoized when they only involve candles
+    key = node[1]
+    if key in memo:
+      return memo[key]
+    if kind == "binop":
+      _, _, op, left, right = node
+      value = op(self._eval(left, profit, df, columns, memo), self._eval(right, profit, df, columns, memo))
+    else:
+      _, _, ops, operands = node
+      values = [self._eval(operand, profit, df, columns, memo) for operand in operands]
+      value = True
+      for op, left, right in zip(ops, values, values[1:]):
+        result = op(left, right)
+        value = result if value is True else value & result
+      if not isinstance(value, np.ndarray):
+        return bool(value)
+    memo[key] = value
+    return value
+
+  @staticmethod
+  def _shift(values, periods):
+    if values.dtype.kind != "f":
+      raise ExitSignalsTable.Unsupported()
+    shifted = np.empty_like(values)
+    shifted[:periods] = np.nan
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+  # Per trade lookup
+  # ---------------------------------------------------------------------------------------------
+  def lookup(self, name, mode_name, current_profit, last_candle):
+    """
+    Returns the precomputed (sell, signal_name) of the exit function, None when it's not available.
+    """
+    if current_profit != current_profit:
+      return None
+    try:
+      pattern_id = last_candle[self.column(name)]
+    except KeyError:
+      return None
+    thresholds = self.programs[name][0]
+    code = self.patterns[name][pattern_id][self.bucket(thresholds, current_profit)]
+    if code == 0:
+      return False, None
+    return True, self.templates[name][code].format(mode_name=mode_name)
+
+
+class ExitSignalsLookup:
+  """
+  Stands in for one of the precomputed exit functions on the strategy instance, falling back to the original
+  method when the candle has no precomputed column (or the profit is NaN).
+  """
+
+  def __init__(self, strategy, name):
+    self.strategy = strategy
+    self.name = name
+
+  def __call__(self, mode_name, current_profit, max_profit, max_loss, last_candle, *args):
+    result = self.strategy.exit_signals_table.lookup(self.name, mode_name, current_profit, last_candle)
+    if result is None:
+      return getattr(type(self.strategy), self.name)(
+        self.strategy, mode_name, current_profit, max_profit, max_loss, last_candle, *args
+      )
+    return result
+
+
+# Startup profile: the run of the module body, its dependencies included (the compile of the file happens before,
+# startup_profile.py measures it)
+import_seconds = time.perf_counter() - import_started
@@ -0,0 +1,44 @@
+# column_usage_report.py - which indicator columns NostalgiaForInfinityX6 computes, reads and never reads
+# Usage: python column_usage_report.py [config.json ...]
+# The long/short_entry_signal_params of the given configs are applied on top of the strategy defaults.
+import os
+import sys
+
+from freqtrade.configuration.load_config import load_config_file
+
+# --- CONFIGURE THE REPORT HERE ---
+STRATEGIES_DIR = "./bot/user_data/strategies"
+DEFAULT_CONFIG_FILES = ["./bot/user_data/config.json"]
+
+sys.path.insert(0, STRATEGIES_DIR)
+from NostalgiaForInfinityX6 import ColumnUsage, NostalgiaForInfinityX6  # noqa: E402
+
+
+def load_signal_params(config_files):
+    """Returns the long and short entry signal params, with the overrides of the config files applied."""
+    long_entry_signal_params = dict(NostalgiaForInfinityX6.long_entry_signal_params)
+    short_entry_signal_params = dict(NostalgiaForInfinityX6.short_entry_signal_params)
+    for config_file in config_files:
+        if not os.path.exists(config_file):
+            print(f"Config {config_file} not found, skipped.")
+            continue
+        config = load_config_file(config_file)
+        for signal_params, key in (
+            (long_entry_signal_params, "long_entry_signal_params"),
+            (short_entry_signal_params, "short_entry_signal_params"),
+        ):
+            for condition_key, enabled in config.get(key, {}).items():
+                if condition_key in signal_params:
+                    signal_params[condition_key] = enabled
+    return long_entry_signal_params, short_entry_signal_params
+
+
+def main():
+    config_files = sys.argv[1:] or DEFAULT_CONFIG_FILES
+    long_entry_signal_params, short_entry_signal_params = load_signal_params(config_files)
+    column_usage = ColumnUsage(NostalgiaForInfinityX6)
+    print(column_usage.report(long_entry_signal_params, short_entry_signal_params))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# startup_profile.py - where the start of a bot running NostalgiaForInfinityX6 goes
+# Reports the compile of the strategy file, its import with and without a bytecode cache, __init__ and the first
+# populate_indicators. Needs the bot data downloaded first, e.g.:
+#   freqtrade download-data -c bot/user_data/config.json -t 5m 15m 1h 4h 1d --timerange 20250101-
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from freqtrade.configuration import Configuration
+from freqtrade.data.dataprovider import DataProvider
+from freqtrade.enums import RunMode
+from freqtrade.resolvers import StrategyResolver
+
+# --- CONFIGURE THE PROFILE HERE ---
+CONFIG_FILE = "./bot/user_data/config.json"
+USER_DATA_DIR = "./bot/user_data"
+STRATEGIES_DIR = "./bot/user_data/strategies"
+STRATEGY = "NostalgiaForInfinityX6"
+PAIR = "ETH/USDT:USDT"
+TIMERANGE = "20250101-"
+
+IMPORT_SNIPPET = (
+    "import sys, time\n"
+    "tik = time.perf_counter()\n"
+    "sys.path.insert(0, sys.argv[1])\n"
+    f"import {STRATEGY}\n"
+    "print(time.perf_counter() - tik)\n"
+)
+
+
+def time_compile():
+    """Returns the seconds needed to compile the strategy file from source."""
+    with open(os.path.join(STRATEGIES_DIR, f"{STRATEGY}.py")) as source_file:
+        source = source_file.read()
+    tik = time.perf_counter()
+    compile(source, f"{STRATEGY}.py", "exec")
+    return time.perf_counter() - tik
+
+
+def time_import(strategies_dir, write_bytecode):
+    """Returns the seconds a fresh interpreter needs to import the strategy from strategies_dir."""
+    # The freqtrade docker image sets PYTHONDONTWRITEBYTECODE, an empty value turns it off
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="" if write_bytecode else "1")
+    env.pop("PYTHONPYCACHEPREFIX", None)
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET, strategies_dir], env=env, capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def time_strategy():
+    """Returns the seconds needed by __init__ (through the resolver) and by the first populate_indicators."""
+    args = {
+        "config": [CONFIG_FILE],
+        "user_data_dir": USER_DATA_DIR,
+        "strategy": STRATEGY,
+        "timerange": TIMERANGE,
+    }
+    config = Configuration(args, RunMode.BACKTEST).get_config()
+    tik = time.perf_counter()
+    strategy = StrategyResolver.load_strategy(config)
+    init_seconds = time.perf_counter() - tik
+    strategy.dp = DataProvider(config, None)
+    df = strategy.dp.get_pair_dataframe(PAIR, strategy.timeframe)
+    tik = time.perf_counter()
+    strategy.populate_indicators(df, {"pair": PAIR})
+    return init_seconds, time.perf_counter() - tik
+
+
+def main():
+    print(f"{'compile from source':<40} {time_compile():>8.3f} s")
+    # A copy of the strategy, so its bytecode cache starts empty
+    with tempfile.TemporaryDirectory() as strategies_dir:
+        shutil.copy(os.path.join(STRATEGIES_DIR, f"{STRATEGY}.py"), strategies_dir)
+        print(f"{'import, no bytecode cache':<40} {time_import(strategies_dir, False):>8.3f} s")
+        time_import(strategies_dir, True)
+        # Checked before the import, the import itself writes the cache when it compiles
+        if os.path.exists(importlib.util.cache_from_source(os.path.join(strategies_dir, f"{STRATEGY}.py"))):
+            print(f"{'import, bytecode cached':<40} {time_import(strategies_dir, True):>8.3f} s")
+        else:
+            print(f"{'import, bytecode cached':<40} {'n/a':>8}   (the bytecode cache could not be written)")
+    init_seconds, populate_seconds = time_strategy()
+    print(f"{'resolver + __init__':<40} {init_seconds:>8.3f} s")
+    print(f"{'first populate_indicators':<40} {populate_seconds:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
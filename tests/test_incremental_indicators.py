@@ -0,0 +1,120 @@
+# test_incremental_indicators.py - parity of IncrementalIndicators with the full base_tf_5m indicators
+# Usage: python -m pytest tests
+#
+# Freqtrade hands the strategy a sliding window of candles, the full path recomputes every indicator over
+# that window, the incremental path only folds in the candles that closed since the last call. The
+# windowed indicators (SMA, BB, MFI, CMF, WILLR, AROON, KST, ROC, OBV, ...) must match up to float
+# rounding. The recursive ones (EMA, RSI) are seeded at the start of the window in the full path and
+# at the start of the first window in the incremental path, the difference decays with the window
+# length and for the longest one (EMA_200 over 1000 candles) stays below 1e-4 relative.
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freqtrade.enums import RunMode
+
+STRATEGIES_DIR = os.path.join(os.path.dirname(__file__), "..", "bot", "user_data", "strategies")
+
+sys.path.insert(0, STRATEGIES_DIR)
+from NostalgiaForInfinityX6 import IncrementalIndicators, NostalgiaForInfinityX6  # noqa: E402
+
+WINDOW = 1000
+STEPS = 300
+# Relative tolerance of the recursive indicators (seeded differently over the sliding window)
+RECURSIVE_RTOL = 1e-4
+RECURSIVE_COLUMNS = {f"EMA_{length}" for length in IncrementalIndicators.ema_lengths} | {
+    "RSI_3",
+    "RSI_4",
+    "RSI_14",
+    "RSI_20",
+    "RSI_3_change_pct",
+    "RSI_14_change_pct",
+}
+# Every other column
+RTOL = 1e-7
+# Absolute tolerance, for the values around 0 (STOCHRSI at the bottom of its range, ...)
+ATOL = 1e-9
+
+
+def make_candles(length, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.004, length)))
+    open_ = np.r_[close[0], close[:-1]]
+    volume = np.abs(rng.normal(1000.0, 300.0, length))
+    # some empty candles, for num_empty_288 and OBV
+    volume[rng.random(length) < 0.02] = 0.0
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2025-01-01", periods=length, freq="5min", tz="UTC"),
+            "open": open_,
+            "high": np.maximum(open_, close) * (1.0 + rng.uniform(0.0, 0.004, length)),
+            "low": np.minimum(open_, close) * (1.0 - rng.uniform(0.0, 0.004, length)),
+            "close": close,
+            "volume": volume,
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def strategy(tmp_path_factory):
+    config = {
+        "runmode": RunMode.DRY_RUN,
+        "dry_run": True,
+        "exchange": {"name": "binance", "pair_whitelist": []},
+        "stake_currency": "USDT",
+        "stake_amount": "unlimited",
+        "max_open_trades": 5,
+        "timeframe": "5m",
+        "user_data_dir": Path(tmp_path_factory.mktemp("user_data")),
+    }
+    return NostalgiaForInfinityX6(config)
+
+
+@pytest.mark.parametrize("step_size", [1, 3])
+def test_extend_matches_full_recompute(strategy, step_size):
+    candles = make_candles(WINDOW + STEPS * step_size)
+    metadata = {"pair": "BTC/USDT:USDT"}
+    state = IncrementalIndicators.from_dataframe(
+        strategy.base_tf_5m_full_indicators(metadata, candles.iloc[:WINDOW].copy())
+    )
+    for step in range(step_size, STEPS * step_size + 1, step_size):
+        window = candles.iloc[step : WINDOW + step].reset_index(drop=True)
+        assert state.extend(window)
+        full = strategy.base_tf_5m_full_indicators(metadata, window.copy())
+        incremental = state.dataframe(window.index)
+        # the candles that closed since the previous call
+        new_rows = slice(WINDOW - step_size, WINDOW)
+        for column in IncrementalIndicators.columns:
+            np.testing.assert_allclose(
+                incremental[column].to_numpy()[new_rows],
+                full[column].to_numpy(dtype=np.float64)[new_rows],
+                rtol=RECURSIVE_RTOL if column in RECURSIVE_COLUMNS else RTOL,
+                atol=ATOL,
+                err_msg=f"{column} at step {step}",
+            )
+        # OBV (and its change) is cumulative from the start of the window, so it must match over all of it
+        for column in ("OBV", "OBV_change_pct"):
+            np.testing.assert_allclose(
+                incremental[column].to_numpy()[1:],
+                full[column].to_numpy(dtype=np.float64)[1:],
+                rtol=RTOL,
+                atol=ATOL,
+                err_msg=f"{column} at step {step}",
+            )
+
+
+def test_extend_rejects_non_continuation(strategy):
+    candles = make_candles(WINDOW + 10)
+    state = IncrementalIndicators.from_dataframe(
+        strategy.base_tf_5m_full_indicators({"pair": "BTC/USDT:USDT"}, candles.iloc[:WINDOW].copy())
+    )
+    # gap in the candles
+    assert not state.extend(candles.iloc[WINDOW + 5 :].reset_index(drop=True))
+    # the last known candle changed
+    changed = candles.iloc[5 : WINDOW + 5].reset_index(drop=True)
+    changed.loc[WINDOW - 6, "close"] *= 1.01
+    assert not state.extend(changed)